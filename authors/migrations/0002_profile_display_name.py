@@ -0,0 +1,35 @@
+# Generated by Django 5.0.2 on 2026-10-18 07:24
+
+from django.db import migrations, models
+
+
+def fill_display_names(apps, schema_editor):
+    using = schema_editor.connection.alias
+    Profile = apps.get_model('authors', 'Profile')
+    profiles = list(Profile.objects.using(using).select_related('author'))
+
+    for profile in profiles:
+        author = profile.author
+
+        if author.first_name:
+            profile.display_name = f'{author.first_name} {author.last_name}'.strip()
+        else:
+            profile.display_name = author.username
+
+    Profile.objects.using(using).bulk_update(profiles, ['display_name'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='display_name',
+            field=models.CharField(blank=True, default='', editable=False, max_length=301),
+        ),
+        migrations.RunPython(fill_display_names, migrations.RunPython.noop),
+    ]
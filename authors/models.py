@@ -3,6 +3,15 @@ from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+def make_display_name(user):
+    if user.first_name:
+        return f'{user.first_name} {user.last_name}'.strip()
+
+    return user.username
+
 class Profile(models.Model):
     author = models.OneToOneField(User, on_delete=models.CASCADE)
     bio = models.TextField(default='', blank=True)
+    # Kept in sync with the user by authors.signals so listings can show
+    # the author without building the name in every query or template.
+    display_name = models.CharField(max_length=301, default='', blank=True, editable=False)
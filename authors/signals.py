@@ -1,12 +1,33 @@
 from django.contrib.auth import get_user_model
 from django.db.models.signals import post_save
 from django.dispatch import receiver
-from authors.models import Profile
+from django.utils import timezone
+from authors.models import Profile, make_display_name
+from recipes.models import Recipe
+from recipes.page_cache import ALL_PAGES, invalidate_pages
 
 User = get_user_model()
 
+DISPLAY_NAME_FIELDS = {'first_name', 'last_name', 'username'}
+
 @receiver(post_save, sender=User)
-def create_profile(sender, instance, created, *args, **kwargs):
+def create_profile(sender, instance, created, update_fields=None, *args, **kwargs):
+    display_name = make_display_name(instance)
+
     if created:
-        profile = Profile.objects.create(author=instance)
-        profile.save()
\ No newline at end of file
+        Profile.objects.create(author=instance, display_name=display_name)
+        return
+
+    # Logins save only last_login, nothing to refresh
+    if update_fields is not None and not DISPLAY_NAME_FIELDS.intersection(update_fields):
+        return
+
+    changed = Profile.objects.filter(author=instance).exclude(
+        display_name=display_name
+    ).update(display_name=display_name)
+
+    if changed:
+        # Touching updated_at expires the cached recipe partials and the
+        # ETags of every page that shows this author's recipes.
+        Recipe.objects.filter(author=instance).update(updated_at=timezone.now())
+        invalidate_pages([ALL_PAGES])
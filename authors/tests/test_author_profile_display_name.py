@@ -0,0 +1,43 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from authors.models import Profile
+from recipes.models import Recipe
+from recipes.tests.test_recipe_base import RecipeMixin
+
+class AuthorProfileDisplayNameTest(TestCase, RecipeMixin):
+    def setUp(self):
+        cache.clear()
+        return super().setUp()
+
+    def test_new_profiles_get_the_display_name(self):
+        author = self.make_author(first_name='Maria', last_name='Silva')
+        no_name = User.objects.create_user(username='no_name', password='123456')
+
+        self.assertEqual(author.profile.display_name, 'Maria Silva')
+        self.assertEqual(no_name.profile.display_name, 'no_name')
+
+    def test_renaming_the_user_updates_the_listing(self):
+        recipe = self.make_recipe(author_data={'first_name': 'Maria'})
+        self.client.get(reverse('recipes:home'))
+
+        author = recipe.author
+        author.first_name = 'Joana'
+        author.save()
+
+        content = self.client.get(reverse('recipes:home')).content.decode('utf-8')
+        self.assertEqual(Profile.objects.get(author=author).display_name, 'Joana name')
+        self.assertIn('Joana name', content)
+        self.assertNotIn('Maria name', content)
+
+    def test_saves_that_do_not_touch_the_name_keep_recipes_untouched(self):
+        recipe = self.make_recipe()
+        author = recipe.author
+
+        self.client.login(username='username', password='123456')
+        author.email = 'other@email.com'
+        author.save()
+
+        self.assertEqual(Recipe.objects.get(pk=recipe.pk).updated_at, recipe.updated_at)
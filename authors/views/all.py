@@ -80,12 +80,15 @@ def logout_view(request):
     logout(request)
     return redirect(reverse('authors:login'))
 
+def get_draft_recipes(user):
+    return Recipe.objects.filter(
+        is_published=False,
+        author=user
+    ).order_by('-id')
+
 @login_required(login_url='authors:login', redirect_field_name='next')
 def dashboard(request):
-    recipes = Recipe.objects.filter(
-        is_published=False,
-        author=request.user
-    )
+    recipes = get_draft_recipes(request.user)
     return render(request, 'authors/pages/dashboard.html', {
         'recipes': recipes,
     })
@@ -0,0 +1,14 @@
+import pytest
+from django.conf import settings
+from django.test import override_settings
+
+
+@pytest.fixture(autouse=True, scope='session')
+def isolated_shared_cache(tmp_path_factory):
+    # Tests clear every cache, so they get their own shared cache directory
+    # instead of wiping the one a dev server on this machine is using.
+    caches = {alias: dict(config) for alias, config in settings.CACHES.items()}
+    caches['shared']['LOCATION'] = str(tmp_path_factory.mktemp('shared_cache'))
+
+    with override_settings(CACHES=caches):
+        yield
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 
@@ -67,12 +68,14 @@ INSTALLED_APPS = [
     'recipes',
     'authors',
     'tag',
-    'debug_toolbar',
 ]
 
 MIDDLEWARE = [
+    'utils.static_files.StaticFilesMiddleware',
+    'utils.compression.CompressionMiddleware',
+    'utils.query_stats.QueryStatsMiddleware',
+    'utils.db_router.ReadReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     "corsheaders.middleware.CorsMiddleware",
     'django.middleware.common.CommonMiddleware',
@@ -83,6 +86,11 @@ MIDDLEWARE = [
     'django.middleware.locale.LocaleMiddleware',
 ]
 
+# debug_toolbar records every query and stack trace, so it only runs in development
+if DEBUG:
+    INSTALLED_APPS += ['debug_toolbar']
+    MIDDLEWARE.insert(5, 'debug_toolbar.middleware.DebugToolbarMiddleware')
+
 ROOT_URLCONF = 'projeto.urls'
 
 TEMPLATES = [
@@ -128,6 +136,47 @@ DATABASES = {
     }
 }
 
+# Read replicas, as a comma separated list of SQLite files kept in sync with
+# `python manage.py sync_replicas`. Views opted in with read_from_replica
+# read from them on safe requests; everything else uses the primary.
+DATABASE_REPLICAS = []
+
+for number, name in enumerate(filter(None, os.environ.get('DATABASE_REPLICAS', '').split(',')), start=1):
+    alias = f'replica{number}'
+    DATABASES[alias] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / name.strip(),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['utils.db_router.ReadReplicaRouter']
+
+# After a write the client is pinned to the primary for this many seconds
+DATABASE_PIN_SECONDS = int(os.environ.get('DATABASE_PIN_SECONDS', 10))
+DATABASE_PIN_COOKIE = 'pin_primary_db'
+
+# Production SQLite profile: WAL lets readers run alongside the writer and
+# the busy timeout makes writers wait for the lock instead of failing with
+# "database is locked". utils.sqlite applies the PRAGMAs to every new
+# connection, and connections are kept open between requests.
+SQLITE_PRODUCTION = os.environ.get('SQLITE_PRODUCTION') == '1'
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': -int(os.environ.get('SQLITE_CACHE_SIZE_KB', 64000)),
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'temp_store': 'MEMORY',
+}
+
+if SQLITE_PRODUCTION:
+    for database in DATABASES.values():
+        if database['ENGINE'] == 'django.db.backends.sqlite3':
+            database['CONN_MAX_AGE'] = int(os.environ.get('DATABASE_CONN_MAX_AGE', 600))
+            database['CONN_HEALTH_CHECKS'] = True
+            database.setdefault('OPTIONS', {})['timeout'] = SQLITE_PRAGMAS['busy_timeout'] / 1000
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -173,8 +222,36 @@ STATICFILES_DIRS = [
 ]
 STATIC_ROOT = BASE_DIR / 'static'
 
+# collectstatic writes content-hashed, gzipped copies that
+# utils.static_files.StaticFilesMiddleware serves from memory.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'utils.static_files.CompressedManifestStaticFilesStorage',
+    },
+}
+STATIC_IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+# Unhashed names can change on the next deploy
+STATIC_MAX_AGE = int(os.environ.get('STATIC_MAX_AGE', 60))
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
+# 'sendfile' streams covers through FileResponse (zero-copy under servers
+# with a sendfile file_wrapper); 'x-accel-redirect' (nginx) and 'x-sendfile'
+# (Apache, lighttpd) hand the transfer to the front server.
+MEDIA_SERVE_MODE = os.environ.get('MEDIA_SERVE_MODE', 'sendfile')
+MEDIA_ACCEL_REDIRECT_PREFIX = os.environ.get('MEDIA_ACCEL_REDIRECT_PREFIX', '/protected-media/')
+MEDIA_MAX_AGE = int(os.environ.get('MEDIA_MAX_AGE', 60 * 60 * 24))
+
+# Recipe covers are turned into resized WebP and JPEG derivatives by a
+# background worker after the upload is committed.
+RECIPE_COVER_WIDTHS = [
+    int(width) for width in os.environ.get('RECIPE_COVER_WIDTHS', '320,480,800').split(',')
+]
+RECIPE_COVER_WORKERS = int(os.environ.get('RECIPE_COVER_WORKERS', 2))
+RECIPE_COVER_PROCESSING = os.environ.get('RECIPE_COVER_PROCESSING', 'background')
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
@@ -195,4 +272,66 @@ INTERNAL_IPS = [
 
 CORS_ALLOWED_ORIGINS = [
     'http://127.0.0.1:5500'
-]
\ No newline at end of file
+]
+
+# Fragments and compressed bodies are keyed by what they render, so each
+# process can keep its own copies. Version stamps must be seen by every
+# worker: the file cache covers one host, point 'shared' at Redis or
+# Memcached when the workers run on several.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'shared': {
+        'BACKEND': os.environ.get(
+            'SHARED_CACHE_BACKEND', 'django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.environ.get(
+            'SHARED_CACHE_LOCATION', os.path.join(tempfile.gettempdir(), 'projeto_shared_cache')
+        ),
+        'OPTIONS': {
+            # Every cached page is an entry; the default 300 would cull
+            # pages and generation stamps long before the timeouts.
+            'MAX_ENTRIES': int(os.environ.get('SHARED_CACHE_MAX_ENTRIES', 50000)),
+        },
+    },
+}
+
+# Category and tag maps are kept per process and reloaded when the stamp
+# in this cache changes.
+TAXONOMY_CACHE_ALIAS = 'shared'
+
+# gzip/deflate for text responses; compressed bodies are cached by ETag
+# so repeat hits skip rendering and compression (a timeout of 0 disables it).
+COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 200))
+COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', 6))
+COMPRESSION_CACHE_ALIAS = 'default'
+COMPRESSION_CACHE_TIMEOUT = int(os.environ.get('COMPRESSION_CACHE_TIMEOUT', 300))
+
+# Rendered home, category and tag pages for anonymous visitors; recipe
+# and taxonomy changes drop only the listings they appear on.
+PAGE_CACHE_ALIAS = 'shared'
+PAGE_CACHE_TIMEOUT = int(os.environ.get('PAGE_CACHE_TIMEOUT', 600))
+
+# Per-request query count, SQL time and duplicate queries, logged as one
+# JSON line per request. QUERY_STATS_HEADER also returns them to
+# INTERNAL_IPS in the X-Query-Stats header.
+QUERY_STATS_ENABLED = os.environ.get('QUERY_STATS_ENABLED', '1') == '1'
+QUERY_STATS_HEADER = os.environ.get('QUERY_STATS_HEADER', '0') == '1'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'utils.query_stats': {
+            'handlers': ['console'],
+            'level': os.environ.get('QUERY_STATS_LOG_LEVEL', 'INFO'),
+            'propagate': False,
+        },
+    },
+}
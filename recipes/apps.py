@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class RecipesConfig(AppConfig):
@@ -6,6 +7,10 @@ class RecipesConfig(AppConfig):
     name = 'recipes'
 
     def ready(self, *args, **kwargs) -> None:
+        import recipes.checks
         import recipes.signals
+        from utils.sqlite import apply_sqlite_pragmas
+
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid='apply_sqlite_pragmas')
         super_ready = super().ready()
         return super_ready
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.utils.dateformat import format as format_date
+
+RECIPE_FRAGMENT_NAME = 'recipe_partial'
+
+# Values the partial can see for is_detail_page: True on the detail view
+# and an unresolved variable ('') everywhere else.
+RECIPE_FRAGMENT_PAGE_FLAGS = (True, '')
+
+
+def recipe_fragment_keys(recipe_id, updated_at):
+    if updated_at is None:
+        return []
+
+    # Must render exactly like the vary_on arguments in recipes/partials/recipe.html
+    updated_at = format_date(updated_at, 'U.u')
+    languages = {settings.LANGUAGE_CODE, *(code for code, _ in settings.LANGUAGES)}
+
+    return [
+        make_template_fragment_key(
+            RECIPE_FRAGMENT_NAME, [recipe_id, updated_at, language, flag]
+        )
+        for language in languages
+        for flag in RECIPE_FRAGMENT_PAGE_FLAGS
+    ]
+
+
+def invalidate_recipe_fragments(recipe_id, updated_at):
+    keys = recipe_fragment_keys(recipe_id, updated_at)
+
+    if keys:
+        cache.delete_many(keys)
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.checks import Error, register
+
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register()
+def check_shared_caches(app_configs, **kwargs):
+    # Generations and stamps bumped by one worker must reach the others
+    aliases = {'TAXONOMY_CACHE_ALIAS': settings.TAXONOMY_CACHE_ALIAS}
+
+    if settings.PAGE_CACHE_TIMEOUT:
+        aliases['PAGE_CACHE_ALIAS'] = settings.PAGE_CACHE_ALIAS
+
+    errors = []
+
+    for setting, alias in aliases.items():
+        backend = settings.CACHES.get(alias, {}).get('BACKEND')
+
+        if backend is None or backend in LOCAL_CACHE_BACKENDS:
+            errors.append(Error(
+                f'{setting} must point at a cache shared by every worker.',
+                hint=f'Configure CACHES[{alias!r}] with a file, Redis or Memcached backend.',
+                id='recipes.E001',
+            ))
+
+    return errors
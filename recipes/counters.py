@@ -0,0 +1,130 @@
+from collections import Counter
+
+from asgiref.sync import sync_to_async
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, router, transaction
+from django.db.models import Count, F
+
+from recipes.models import PublishedRecipeCounter, Recipe
+
+ALL = PublishedRecipeCounter.SCOPE_ALL
+CATEGORY = PublishedRecipeCounter.SCOPE_CATEGORY
+TAG = PublishedRecipeCounter.SCOPE_TAG
+
+
+def recipe_counter_keys(is_published, category_id=None, tag_ids=()):
+    if not is_published:
+        return []
+
+    keys = [(ALL, 0)]
+
+    if category_id:
+        keys.append((CATEGORY, category_id))
+
+    keys += [(TAG, tag_id) for tag_id in tag_ids]
+    return keys
+
+
+def count_published(scope, object_id=0, using=DEFAULT_DB_ALIAS):
+    qs = Recipe.objects.using(using).filter(is_published=True)
+
+    if scope == CATEGORY:
+        qs = qs.filter(category_id=object_id)
+    elif scope == TAG:
+        qs = qs.filter(tags__id=object_id)
+
+    return qs.count()
+
+
+def create_counter(scope, object_id=0, using=None):
+    using = using or router.db_for_write(PublishedRecipeCounter)
+
+    try:
+        with transaction.atomic(using=using):
+            counter, _ = PublishedRecipeCounter.objects.using(using).get_or_create(
+                scope=scope,
+                object_id=object_id,
+                defaults={'count': count_published(scope, object_id, using)},
+            )
+    except IntegrityError:
+        counter = PublishedRecipeCounter.objects.using(using).get(
+            scope=scope, object_id=object_id
+        )
+
+    return counter.count
+
+
+def get_published_count(scope, object_id=0, using=None):
+    # Without an explicit alias the read goes wherever the router sends it,
+    # which may be a replica; a missing row is always created on the primary.
+    count = PublishedRecipeCounter.objects.using(using).filter(
+        scope=scope, object_id=object_id
+    ).values_list('count', flat=True).first()
+
+    if count is None:
+        count = create_counter(scope, object_id, using)
+
+    return count
+
+
+async def aget_published_count(scope, object_id=0, using=None):
+    count = await PublishedRecipeCounter.objects.using(using).filter(
+        scope=scope, object_id=object_id
+    ).values_list('count', flat=True).afirst()
+
+    if count is None:
+        count = await sync_to_async(create_counter)(scope, object_id, using)
+
+    return count
+
+
+def apply_counter_changes(removed_keys, added_keys, using=DEFAULT_DB_ALIAS):
+    deltas = Counter(added_keys)
+    deltas.subtract(Counter(removed_keys))
+
+    with transaction.atomic(using=using):
+        for (scope, object_id), delta in deltas.items():
+            if not delta:
+                continue
+
+            updated = PublishedRecipeCounter.objects.using(using).filter(
+                scope=scope, object_id=object_id
+            ).update(count=F('count') + delta)
+
+            if not updated:
+                # The row is created from a real COUNT(*), which already
+                # includes this change: callers apply it once the rows are
+                # written, in the same transaction.
+                create_counter(scope, object_id, using)
+
+
+def delete_counter(scope, object_id, using=DEFAULT_DB_ALIAS):
+    PublishedRecipeCounter.objects.using(using).filter(
+        scope=scope, object_id=object_id
+    ).delete()
+
+
+def rebuild_counters(using=DEFAULT_DB_ALIAS):
+    published = Recipe.objects.using(using).filter(is_published=True)
+    counters = [PublishedRecipeCounter(scope=ALL, object_id=0, count=published.count())]
+
+    by_category = published.exclude(category=None).values('category_id').annotate(
+        total=Count('id')
+    ).order_by()
+    counters += [
+        PublishedRecipeCounter(scope=CATEGORY, object_id=row['category_id'], count=row['total'])
+        for row in by_category
+    ]
+
+    by_tag = Recipe.tags.through.objects.using(using).filter(
+        recipe__is_published=True
+    ).values('tag_id').annotate(total=Count('recipe_id')).order_by()
+    counters += [
+        PublishedRecipeCounter(scope=TAG, object_id=row['tag_id'], count=row['total'])
+        for row in by_tag
+    ]
+
+    with transaction.atomic(using=using):
+        PublishedRecipeCounter.objects.using(using).all().delete()
+        PublishedRecipeCounter.objects.using(using).bulk_create(counters)
+
+    return len(counters)
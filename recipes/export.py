@@ -0,0 +1,93 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from recipes.models import DeletedRecipe, Recipe
+
+EXPORT_CHUNK_SIZE = 500
+
+
+def parse_since(value):
+    try:
+        since = parse_datetime(value)
+    except ValueError:
+        since = None
+
+    if since is not None and timezone.is_naive(since):
+        since = timezone.make_aware(since)
+
+    return since
+
+
+def get_export_queryset(since=None):
+    if since is None:
+        qs = Recipe.objects.filter(is_published=True)
+    else:
+        # Recipes unpublished since the last pull go out as tombstones
+        qs = Recipe.objects.filter(updated_at__gte=since)
+
+    return qs.select_related('category', 'author').prefetch_related('tags').order_by('id')
+
+
+def get_deleted_queryset(since):
+    return DeletedRecipe.objects.filter(deleted_at__gte=since).order_by('recipe_id')
+
+
+def recipe_to_export_row(recipe):
+    author = recipe.author
+    category = recipe.category
+
+    return {
+        'id': recipe.id,
+        'is_published': True,
+        'title': recipe.title,
+        'slug': recipe.slug,
+        'description': recipe.description,
+        'preparation_time': recipe.preparation_time,
+        'preparation_time_unit': recipe.preparation_time_unit,
+        'servings': recipe.servings,
+        'servings_unit': recipe.servings_unit,
+        'preparation_steps': recipe.preparation_steps,
+        'preparation_step_is_html': recipe.preparation_step_is_html,
+        'created_at': recipe.created_at,
+        'updated_at': recipe.updated_at,
+        'cover': recipe.cover.name or None,
+        'category': {'id': category.id, 'name': category.name} if category else None,
+        'author': {
+            'id': author.id,
+            'username': author.username,
+            'first_name': author.first_name,
+            'last_name': author.last_name,
+        } if author else None,
+        'tags': [
+            {'id': tag.id, 'name': tag.name, 'slug': tag.slug}
+            for tag in recipe.tags.all()
+        ],
+    }
+
+
+def recipe_to_tombstone(recipe_id, updated_at, deleted=False):
+    return {'id': recipe_id, 'is_published': False, 'deleted': deleted, 'updated_at': updated_at}
+
+
+def iter_export_rows(since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    # iterator(chunk_size=...) streams rows from the cursor and runs the tags
+    # prefetch once per chunk, so memory stays flat for any table size.
+    for recipe in get_export_queryset(since).iterator(chunk_size=chunk_size):
+        if recipe.is_published:
+            yield recipe_to_export_row(recipe)
+        else:
+            yield recipe_to_tombstone(recipe.id, recipe.updated_at)
+
+    if since is None:
+        return
+
+    for deleted in get_deleted_queryset(since).iterator(chunk_size=chunk_size):
+        yield recipe_to_tombstone(deleted.recipe_id, deleted.deleted_at, deleted=True)
+
+
+def iter_export_lines(since=None, chunk_size=EXPORT_CHUNK_SIZE):
+    for row in iter_export_rows(since, chunk_size):
+        yield json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
@@ -0,0 +1,97 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image
+
+COVER_FORMATS = {
+    'webp': {'format': 'WEBP', 'quality': 70},
+    'jpeg': {'format': 'JPEG', 'quality': 75, 'optimize': True, 'progressive': True},
+}
+
+
+def cover_derivative_name(name, width, file_format):
+    base, _ = os.path.splitext(name)
+    extension = 'jpg' if file_format == 'jpeg' else file_format
+    return f'{base}-{width}w.{extension}'
+
+
+def cover_derivative_url(name, width, file_format):
+    return default_storage.url(cover_derivative_name(name, width, file_format))
+
+
+def cover_srcset(name, widths, file_format):
+    return ', '.join(
+        f'{cover_derivative_url(name, width, file_format)} {width}w'
+        for width in sorted(widths)
+    )
+
+
+def get_cover_widths(original_width):
+    widths = [width for width in settings.RECIPE_COVER_WIDTHS if width <= original_width]
+    return widths or [original_width]
+
+
+def make_cover_derivatives(name):
+    with default_storage.open(name, 'rb') as original_file:
+        with Image.open(original_file) as image:
+            image.load()
+
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    original_width, original_height = image.size
+    widths = get_cover_widths(original_width)
+    derivatives = {'name': name}
+
+    for file_format, save_options in COVER_FORMATS.items():
+        derivatives[file_format] = []
+
+        for width in widths:
+            height = round((width * original_height) / original_width)
+            resized = image.resize((width, height), Image.LANCZOS)
+            buffer = BytesIO()
+            resized.save(buffer, **save_options)
+
+            derivative_name = cover_derivative_name(name, width, file_format)
+
+            if default_storage.exists(derivative_name):
+                default_storage.delete(derivative_name)
+
+            default_storage.save(derivative_name, ContentFile(buffer.getvalue()))
+            derivatives[file_format].append(width)
+
+    return derivatives
+
+
+def delete_cover_derivatives(derivatives):
+    name = derivatives.get('name')
+
+    if not name:
+        return
+
+    for file_format in COVER_FORMATS:
+        for width in derivatives.get(file_format, []):
+            try:
+                default_storage.delete(cover_derivative_name(name, width, file_format))
+            except FileNotFoundError:
+                ...
+
+
+def delete_cover_files(name, derivatives):
+    if derivatives.get('name') != name:
+        # The derivatives loaded with the recipe can predate the background
+        # job that made them; missing files are ignored by the storage.
+        derivatives = {'name': name}
+        derivatives.update(
+            (file_format, settings.RECIPE_COVER_WIDTHS) for file_format in COVER_FORMATS
+        )
+
+    delete_cover_derivatives(derivatives)
+
+    try:
+        default_storage.delete(name)
+    except FileNotFoundError:
+        ...
@@ -0,0 +1,281 @@
+import string
+from collections import defaultdict
+from random import SystemRandom
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX, make_password
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.utils.text import slugify
+
+from authors.models import Profile, make_display_name
+from authors.validators import AuthorRecipeValidator
+from recipes.counters import apply_counter_changes, recipe_counter_keys
+from recipes.models import Category, Recipe
+from recipes.page_cache import ALL_PAGES, invalidate_pages
+from recipes.search import index_recipes
+from recipes.taxonomy import bump_taxonomy_version
+from tag.models import Tag
+
+User = get_user_model()
+
+IMPORT_BATCH_SIZE = 1000
+
+DEFAULT_IMPORT_SOURCE = 'import'
+TAKEN_USERNAME_ERROR = 'The author username belongs to an account that was not imported.'
+
+RECIPE_FIELDS = (
+    'title', 'description', 'preparation_time', 'preparation_time_unit',
+    'servings', 'servings_unit', 'preparation_steps',
+)
+
+
+def make_slug(value):
+    rand_letters = ''.join(
+        SystemRandom().choices(string.ascii_letters + string.digits, k=5)
+    )
+    return slugify(f'{value}-{rand_letters}')
+
+
+def get_author_key(author):
+    # A stable external id tells apart partner authors that share a name
+    for field_name in ('id', 'username'):
+        if author.get(field_name) not in (None, ''):
+            return slugify(str(author[field_name])).replace('-', '_')
+
+    full_name = f'{author.get("first_name", "")} {author.get("last_name", "")}'
+    return slugify(full_name).replace('-', '_')
+
+
+def get_author_username(author, source=DEFAULT_IMPORT_SOURCE):
+    # Namespaced per source, so imported authors never land on site accounts
+    return f'{slugify(source).replace("-", "_")}__{get_author_key(author)}'[:150]
+
+
+def get_tag_names(row):
+    return [
+        tag['name'] if isinstance(tag, dict) else str(tag)
+        for tag in row.get('tags') or []
+    ]
+
+
+def validate_row(row):
+    errors = defaultdict(list)
+
+    for field_name in RECIPE_FIELDS:
+        value = row.get(field_name)
+
+        if value in (None, ''):
+            errors[field_name].append('This field is required.')
+            continue
+
+        max_length = Recipe._meta.get_field(field_name).max_length
+
+        if max_length and len(str(value)) > max_length:
+            errors[field_name].append(f'Ensure this value has at most {max_length} characters.')
+
+    author = row.get('author') or {}
+
+    if not isinstance(author, dict) or not get_author_key(author):
+        errors['author'].append('Author needs a username or a name.')
+
+    if not isinstance(row.get('is_published', False), bool):
+        errors['is_published'].append('Must be true or false.')
+
+    category = row.get('category')
+    category_name = category.get('name') if isinstance(category, dict) else None
+
+    if category is not None and not isinstance(category_name, str):
+        errors['category'].append('Category needs a name.')
+    elif category_name and len(category_name) > Category._meta.get_field('name').max_length:
+        errors['category'].append('Category name is too long.')
+
+    if errors:
+        raise ValidationError(errors)
+
+    AuthorRecipeValidator(row, ErrorClass=ValidationError)
+
+
+def taxonomy_grew(using):
+    # bulk_create skips the taxonomy_changed signal
+    bump_taxonomy_version(using=using)
+    invalidate_pages([ALL_PAGES], using=using)
+
+
+def get_or_create_categories(names, using):
+    categories = {}
+
+    for category_id, name in Category.objects.using(using).filter(
+        name__in=names
+    ).values_list('id', 'name'):
+        categories.setdefault(name, category_id)
+
+    missing = [Category(name=name) for name in names if name not in categories]
+    Category.objects.using(using).bulk_create(missing)
+    categories.update((category.name, category.id) for category in missing)
+
+    if missing:
+        taxonomy_grew(using)
+
+    return categories
+
+
+def get_imported_users(usernames, using):
+    # Imported authors can't log in; anyone else owns their username
+    return User.objects.using(using).filter(
+        username__in=usernames, password__startswith=UNUSABLE_PASSWORD_PREFIX
+    )
+
+
+def get_taken_usernames(usernames, using):
+    return set(
+        User.objects.using(using).filter(username__in=usernames).exclude(
+            password__startswith=UNUSABLE_PASSWORD_PREFIX
+        ).values_list('username', flat=True)
+    )
+
+
+def get_or_create_authors(authors, using):
+    users = dict(get_imported_users(authors, using).values_list('username', 'id'))
+
+    unusable_password = make_password(None)
+    missing = [
+        User(
+            username=username,
+            first_name=author.get('first_name', '')[:150],
+            last_name=author.get('last_name', '')[:150],
+            password=unusable_password,
+        )
+        for username, author in authors.items()
+        if username not in users
+    ]
+    User.objects.using(using).bulk_create(missing)
+
+    # bulk_create skips the post_save signal that creates profiles
+    Profile.objects.using(using).bulk_create(
+        [Profile(author_id=user.id, display_name=make_display_name(user)) for user in missing]
+    )
+    users.update((user.username, user.id) for user in missing)
+    return users
+
+
+def get_or_create_tags(names, using):
+    slugs = {name: slugify(name) for name in names}
+    tags = dict(
+        Tag.objects.using(using).filter(
+            slug__in=slugs.values()
+        ).values_list('slug', 'id')
+    )
+
+    missing = {}
+
+    for name, slug in slugs.items():
+        if slug and slug not in tags and slug not in missing:
+            missing[slug] = Tag(name=name, slug=slug)
+
+    Tag.objects.using(using).bulk_create(missing.values())
+    tags.update((tag.slug, tag.id) for tag in missing.values())
+
+    if missing:
+        taxonomy_grew(using)
+
+    return {name: tags[slug] for name, slug in slugs.items() if slug in tags}
+
+
+def import_batch(rows, publish=True, using=DEFAULT_DB_ALIAS, source=DEFAULT_IMPORT_SOURCE):
+    with transaction.atomic(using=using):
+        categories = get_or_create_categories(
+            {row['category']['name'] for row in rows if (row.get('category') or {}).get('name')},
+            using,
+        )
+        authors = get_or_create_authors(
+            {get_author_username(row['author'], source): row['author'] for row in rows},
+            using,
+        )
+        tags = get_or_create_tags(
+            {name for row in rows for name in get_tag_names(row)},
+            using,
+        )
+
+        recipes = [
+            Recipe(
+                **{field_name: row[field_name] for field_name in RECIPE_FIELDS},
+                slug=make_slug(row['title']),
+                is_published=row.get('is_published', publish),
+                category_id=categories.get((row.get('category') or {}).get('name')),
+                author_id=authors[get_author_username(row['author'], source)],
+            )
+            for row in rows
+        ]
+        Recipe.objects.using(using).bulk_create(recipes)
+
+        Through = Recipe.tags.through
+        through_rows = []
+        counter_keys = []
+
+        for recipe, row in zip(recipes, rows):
+            tag_ids = sorted({tags[name] for name in get_tag_names(row) if name in tags})
+            through_rows += [Through(recipe_id=recipe.id, tag_id=tag_id) for tag_id in tag_ids]
+            counter_keys += recipe_counter_keys(recipe.is_published, recipe.category_id, tag_ids)
+
+        Through.objects.using(using).bulk_create(through_rows)
+
+        # bulk_create bypasses recipes.signals, so keep the derived data in sync here
+        apply_counter_changes([], counter_keys, using=using)
+        invalidate_pages(counter_keys, using=using)
+        index_recipes(recipes, using=using)
+
+    return len(recipes)
+
+
+def import_rows(
+    rows,
+    batch_size=IMPORT_BATCH_SIZE,
+    publish=True,
+    using=DEFAULT_DB_ALIAS,
+    on_batch=None,
+    source=DEFAULT_IMPORT_SOURCE,
+):
+    imported = 0
+    errors = []
+    batch = []
+
+    def flush():
+        nonlocal imported
+
+        if not batch:
+            return
+
+        taken = get_taken_usernames(
+            {get_author_username(row['author'], source) for _, row in batch}, using
+        )
+        accepted = []
+
+        for line_number, row in batch:
+            if get_author_username(row['author'], source) in taken:
+                errors.append((line_number, {'author': [TAKEN_USERNAME_ERROR]}))
+            else:
+                accepted.append(row)
+
+        if accepted:
+            imported += import_batch(accepted, publish=publish, using=using, source=source)
+
+        batch.clear()
+
+        if on_batch is not None:
+            on_batch(imported, errors)
+
+    for line_number, row in rows:
+        try:
+            validate_row(row)
+        except (ValidationError, TypeError, AttributeError) as e:
+            errors.append((line_number, getattr(e, 'message_dict', str(e))))
+            continue
+
+        batch.append((line_number, row))
+
+        if len(batch) >= batch_size:
+            flush()
+
+    flush()
+    return imported, errors
@@ -0,0 +1,195 @@
+import asyncio
+import platform
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from recipes.management.commands.bench_routes import bench_database
+from recipes.models import Recipe
+from tag.models import Tag
+from utils.benchmark import (
+    InFlight,
+    call_asgi,
+    call_wsgi,
+    compare_to_baseline,
+    run_async_concurrently,
+    run_concurrently,
+    write_results,
+)
+
+
+class ConnectionCounter:
+    def __init__(self):
+        self.opened = 0
+        self.threads = set()
+        self.lock = threading.Lock()
+
+    def __call__(self, sender, connection, **kwargs):
+        with self.lock:
+            self.opened += 1
+            self.threads.add(threading.get_ident())
+
+
+class Command(BaseCommand):
+    help = (
+        'Sends the read-only recipe pages to concurrent slow clients through the '
+        'sync views on a threaded WSGI worker and the async views on one ASGI '
+        'event loop, comparing latency, requests in flight per worker and '
+        'database connections opened.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=1000, help='Minimum number of published recipes.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per route and client count.')
+        parser.add_argument('--clients', type=int, nargs='+', default=[8, 64], help='Concurrent clients.')
+        parser.add_argument('--threads', type=int, default=8, help='Threads in the WSGI worker.')
+        parser.add_argument(
+            '--slow-client-ms', type=float, default=50,
+            help='Time each client takes to read a response.',
+        )
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per route.')
+        parser.add_argument('--routes', nargs='*', help='Only run these route names.')
+        parser.add_argument('--output', default='bench_async.json')
+
+    def get_routes(self):
+        recipe = Recipe.objects.filter(is_published=True).order_by('-id').first()
+        tag = Tag.objects.filter(recipe__is_published=True).first()
+
+        if recipe is None or recipe.category_id is None or tag is None:
+            raise CommandError('The database needs published recipes with a category and tags.')
+
+        query = '?' + urlencode({'q': recipe.title.split()[0]})
+
+        return {
+            'home': (reverse('recipes:home'), reverse('recipes:async_home')),
+            'search': (reverse('recipes:search') + query, reverse('recipes:async_search') + query),
+            'tag': (
+                reverse('recipes:tag', args=(tag.slug,)),
+                reverse('recipes:async_tag', args=(tag.slug,)),
+            ),
+            'category': (
+                reverse('recipes:category', args=(recipe.category_id,)),
+                reverse('recipes:async_category', args=(recipe.category_id,)),
+            ),
+            'detail': (
+                reverse('recipes:recipe', args=(recipe.id,)),
+                reverse('recipes:async_recipe', args=(recipe.id,)),
+            ),
+        }
+
+    def run_wsgi(self, application, path, clients, options):
+        in_flight = InFlight()
+        delay = options['slow_client_ms'] / 1000
+
+        def serve():
+            with in_flight.track():
+                status, _ = call_wsgi(application, 'GET', path)
+
+                # The worker thread stays busy until the client has read it all
+                time.sleep(delay)
+
+            return status == 200
+
+        with ThreadPoolExecutor(max_workers=options['threads']) as worker:
+            for _ in range(options['warmup']):
+                worker.submit(serve).result()
+
+            return self.measure(
+                in_flight,
+                lambda: run_concurrently(
+                    lambda: worker.submit(serve).result(), options['requests'], clients
+                ),
+            )
+
+    def run_asgi(self, application, path, clients, options):
+        in_flight = InFlight()
+        delay = options['slow_client_ms'] / 1000
+
+        async def request_fn():
+            with in_flight.track():
+                status, _ = await call_asgi(application, 'GET', path, send_delay=delay)
+
+            return status == 200
+
+        async def run():
+            for _ in range(options['warmup']):
+                await request_fn()
+
+            return await run_async_concurrently(request_fn, options['requests'], clients)
+
+        return self.measure(in_flight, lambda: asyncio.run(run()))
+
+    def measure(self, in_flight, run):
+        counter = ConnectionCounter()
+        connection_created.connect(counter)
+
+        try:
+            results = run()
+        finally:
+            connection_created.disconnect(counter)
+
+        results.update({
+            'peak_in_flight': in_flight.peak,
+            'db_connections': counter.opened,
+            'db_threads': len(counter.threads),
+        })
+        return results
+
+    def handle(self, *args, **options):
+        with bench_database(options['seed'], self.stdout):
+            routes = self.get_routes()
+
+            if options['routes']:
+                unknown = set(options['routes']) - set(routes)
+
+                if unknown:
+                    raise CommandError(f'Unknown routes: {", ".join(sorted(unknown))}')
+
+                routes = {name: routes[name] for name in options['routes']}
+
+            wsgi_application = get_wsgi_application()
+            asgi_application = get_asgi_application()
+            results = {'wsgi': {}, 'asgi': {}}
+
+            with override_settings(QUERY_STATS_ENABLED=False):
+                for name, (sync_path, async_path) in routes.items():
+                    for clients in options['clients']:
+                        key = f'{name}@{clients}'
+                        results['wsgi'][key] = self.run_wsgi(wsgi_application, sync_path, clients, options)
+                        results['asgi'][key] = self.run_asgi(asgi_application, async_path, clients, options)
+
+                        for server in ('wsgi', 'asgi'):
+                            result = results[server][key]
+                            self.stdout.write(
+                                f'{key:<14} {server}  {result["rps"]:>8} req/s  '
+                                f'p50 {result["p50_ms"]}ms  p99 {result["p99_ms"]}ms  '
+                                f'in flight {result["peak_in_flight"]}  '
+                                f'db connections {result["db_connections"]} '
+                                f'from {result["db_threads"]} threads  '
+                                f'errors {result["errors"]}'
+                            )
+
+        data = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'requests': options['requests'],
+                'clients': options['clients'],
+                'wsgi_threads': options['threads'],
+                'slow_client_ms': options['slow_client_ms'],
+            },
+            'results': results,
+            'asgi_change_percent': compare_to_baseline(results['asgi'], results['wsgi']),
+        }
+
+        write_results(options['output'], data)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
@@ -0,0 +1,100 @@
+import platform
+import time
+
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from recipes.management.commands.bench_routes import bench_database
+from utils.benchmark import call_wsgi, write_results
+
+# Mode name, Accept-Encoding sent and whether the compressed cache is on
+MODES = (
+    ('identity', '', False),
+    ('gzip_uncached', 'gzip', False),
+    ('gzip_cached', 'gzip', True),
+    ('deflate_uncached', 'deflate', False),
+    ('deflate_cached', 'deflate', True),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Measures bytes on the wire and CPU time per request for the home page '
+        'and the v2 recipe list, uncompressed, compressed on every request and '
+        'served from the compressed cache.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=1000, help='Minimum number of published recipes.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per route and mode.')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per route and mode.')
+        parser.add_argument('--output', default='bench_compression.json')
+
+    def measure(self, application, path, accept_encoding, total):
+        headers = {'HTTP_ACCEPT_ENCODING': accept_encoding} if accept_encoding else {}
+        sizes = []
+        cpu_started_at = time.process_time()
+        started_at = time.perf_counter()
+
+        for _ in range(total):
+            status, content = call_wsgi(application, 'GET', path, headers=headers)
+
+            if status == 200:
+                sizes.append(len(content))
+
+        cpu = time.process_time() - cpu_started_at
+        elapsed = time.perf_counter() - started_at
+
+        return {
+            'requests': total,
+            'errors': total - len(sizes),
+            'bytes': round(sum(sizes) / len(sizes)) if sizes else None,
+            'cpu_ms': round(cpu / total * 1000, 3),
+            'wall_ms': round(elapsed / total * 1000, 3),
+        }
+
+    def handle(self, *args, **options):
+        with bench_database(options['seed'], self.stdout):
+            application = get_wsgi_application()
+            routes = {
+                'home': reverse('recipes:home'),
+                'api_v2_list': reverse('recipes:recipes-api-list'),
+            }
+            results = {}
+
+            for name, path in routes.items():
+                results[name] = {}
+
+                for mode, accept_encoding, cached in MODES:
+                    overrides = {} if cached else {'COMPRESSION_CACHE_TIMEOUT': 0}
+
+                    with override_settings(**overrides):
+                        self.measure(application, path, accept_encoding, options['warmup'])
+                        result = self.measure(application, path, accept_encoding, options['requests'])
+
+                    results[name][mode] = result
+                    self.stdout.write(
+                        f'{name:<12} {mode:<17} {result["bytes"]:>8} bytes  '
+                        f'cpu {result["cpu_ms"]:>7}ms  wall {result["wall_ms"]:>7}ms'
+                    )
+
+                identity = results[name]['identity']['bytes']
+
+                for mode in results[name]:
+                    size = results[name][mode]['bytes']
+                    results[name][mode]['ratio'] = round(size / identity, 3) if identity and size else None
+
+        data = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'requests': options['requests'],
+            },
+            'results': results,
+        }
+
+        write_results(options['output'], data)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
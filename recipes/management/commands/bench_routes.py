@@ -0,0 +1,206 @@
+import json
+import os
+import platform
+import secrets
+import tempfile
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from recipes.importer import import_rows
+from recipes.models import Recipe
+from tag.models import Tag
+from utils.benchmark import (
+    compare_to_baseline,
+    load_results,
+    make_seed_rows,
+    run_concurrently,
+    serve_wsgi,
+    write_results,
+)
+
+BENCH_USERNAME = 'bench_user'
+# Only ever created in the throwaway database of a run
+BENCH_PASSWORD = secrets.token_urlsafe(16)
+
+
+def seed_bench_data(minimum, stdout):
+    missing = minimum - Recipe.objects.filter(is_published=True).count()
+
+    if missing > 0:
+        stdout.write(f'Seeding {missing} recipes...')
+        import_rows(make_seed_rows(missing))
+
+    User = get_user_model()
+
+    if not User.objects.filter(username=BENCH_USERNAME).exists():
+        User.objects.create_user(username=BENCH_USERNAME, password=BENCH_PASSWORD)
+
+
+@contextmanager
+def bench_database(minimum, stdout, using=DEFAULT_DB_ALIAS):
+    # Benchmarks seed recipes and an account, so they run against a fresh
+    # test database and process-local caches, never the configured ones.
+    connection = connections[using]
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    original_test_name = test_settings.get('NAME')
+    caches_settings = {
+        alias: {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': f'bench-{alias}'}
+        for alias in settings.CACHES
+    }
+
+    with tempfile.TemporaryDirectory() as directory:
+        # SQLite would default to a shared in-memory database
+        if connection.vendor == 'sqlite':
+            test_settings['NAME'] = os.path.join(directory, 'bench.sqlite3')
+
+        stdout.write('Creating the benchmark database...')
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+
+        try:
+            # Page cache hits would skip the views and databases being compared
+            with override_settings(CACHES=caches_settings, DATABASE_REPLICAS=[], PAGE_CACHE_TIMEOUT=0):
+                seed_bench_data(minimum, stdout)
+                yield
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            test_settings['NAME'] = original_test_name
+
+
+class Command(BaseCommand):
+    help = (
+        'Serves the app on a local port and measures throughput and p50/p95/p99 '
+        'latency for every public route, writing the results to a JSON file.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=1000, help='Minimum number of published recipes.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per route.')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed requests per route.')
+        parser.add_argument('--routes', nargs='*', help='Only run these route names.')
+        parser.add_argument('--output', default='bench_routes.json')
+        parser.add_argument('--baseline', help='Previous results file to compare against.')
+
+    def get_routes(self, base_url):
+        recipe = Recipe.objects.filter(is_published=True).order_by('-id').first()
+        tag = Tag.objects.filter(recipe__is_published=True).first()
+
+        if recipe is None or recipe.category_id is None or tag is None:
+            raise CommandError('The database needs published recipes with a category and tags.')
+
+        search_term = recipe.title.split()[0]
+        credentials = json.dumps({'username': BENCH_USERNAME, 'password': BENCH_PASSWORD})
+        tokens = self.post_json(base_url + reverse('recipes:token_obtain_pair'), credentials)
+
+        return {
+            'home': ('GET', reverse('recipes:home'), None),
+            'search': ('GET', reverse('recipes:search') + '?' + urlencode({'q': search_term}), None),
+            'tag': ('GET', reverse('recipes:tag', args=(tag.slug,)), None),
+            'category': ('GET', reverse('recipes:category', args=(recipe.category_id,)), None),
+            'detail': ('GET', reverse('recipes:recipe', args=(recipe.id,)), None),
+            'api_v1_list': ('GET', reverse('recipes:recipes_api_v1'), None),
+            'api_v1_detail': ('GET', reverse('recipes:recipes_api_v1_details', args=(recipe.id,)), None),
+            'api_v2_list': ('GET', reverse('recipes:recipes-api-list'), None),
+            'api_v2_detail': ('GET', reverse('recipes:recipes-api-detail', args=(recipe.id,)), None),
+            'api_v2_tag': ('GET', reverse('recipes:recipe_api_v2_tag', args=(tag.id,)), None),
+            'token_obtain': ('POST', reverse('recipes:token_obtain_pair'), credentials),
+            'token_refresh': (
+                'POST', reverse('recipes:token_refresh'), json.dumps({'refresh': tokens['refresh']})
+            ),
+            'token_verify': (
+                'POST', reverse('recipes:token_verify'), json.dumps({'token': tokens['access']})
+            ),
+        }
+
+    def post_json(self, url, body):
+        request = urllib.request.Request(
+            url, data=body.encode(), method='POST',
+            headers={'Content-Type': 'application/json'},
+        )
+
+        with urllib.request.urlopen(request, timeout=30) as response:
+            return json.loads(response.read())
+
+    def make_request_fn(self, base_url, method, path, body):
+        def request_fn():
+            request = urllib.request.Request(
+                base_url + path,
+                data=body.encode() if body else None,
+                method=method,
+                headers={'Content-Type': 'application/json'} if body else {},
+            )
+
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+                    return 200 <= response.status < 300
+            except urllib.error.HTTPError:
+                return False
+
+        return request_fn
+
+    def handle(self, *args, **options):
+        if settings.DEBUG:
+            self.stderr.write(self.style.WARNING(
+                'DEBUG is on; debug_toolbar and query logging will skew the numbers.'
+            ))
+
+        with bench_database(options['seed'], self.stdout):
+            results = {}
+
+            with serve_wsgi(get_wsgi_application()) as base_url:
+                routes = self.get_routes(base_url)
+
+                for name, (method, path, body) in routes.items():
+                    if options['routes'] and name not in options['routes']:
+                        continue
+
+                    request_fn = self.make_request_fn(base_url, method, path, body)
+
+                    for _ in range(options['warmup']):
+                        request_fn()
+
+                    results[name] = run_concurrently(
+                        request_fn, options['requests'], options['concurrency']
+                    )
+                    self.stdout.write(
+                        f'{name:<16} {results[name]["rps"]:>9} req/s  '
+                        f'p50 {results[name]["p50_ms"]}ms  p95 {results[name]["p95_ms"]}ms  '
+                        f'p99 {results[name]["p99_ms"]}ms  errors {results[name]["errors"]}'
+                    )
+
+            data = {
+                'meta': {
+                    'created_at': timezone.now().isoformat(),
+                    'python': platform.python_version(),
+                    'database': settings.DATABASES['default']['ENGINE'],
+                    'requests': options['requests'],
+                    'concurrency': options['concurrency'],
+                    'published_recipes': Recipe.objects.filter(is_published=True).count(),
+                },
+                'routes': results,
+            }
+
+        if options['baseline']:
+            data['baseline_change_percent'] = compare_to_baseline(
+                results, load_results(options['baseline'])['routes']
+            )
+
+            for name, changes in data['baseline_change_percent'].items():
+                formatted = '  '.join(f'{metric} {change:+.1f}%' for metric, change in changes.items())
+                self.stdout.write(f'{name:<16} {formatted}')
+
+        write_results(options['output'], data)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
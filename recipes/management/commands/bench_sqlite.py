@@ -0,0 +1,168 @@
+import itertools
+import json
+import os
+import platform
+import sqlite3
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from recipes.management.commands.bench_routes import BENCH_PASSWORD, BENCH_USERNAME, bench_database
+from utils.benchmark import call_wsgi, compare_to_baseline, run_concurrently, write_results
+
+PROFILES = ('default', 'production')
+WORKLOADS = ('list', 'api_list', 'create', 'mixed')
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares read/write throughput of the list and create paths on copies '
+        'of a seeded throwaway SQLite database with and without the SQLITE_PRODUCTION profile.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seed', type=int, default=1000, help='Minimum number of published recipes.')
+        parser.add_argument('--requests', type=int, default=200, help='Requests per workload.')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--warmup', type=int, default=10, help='Untimed requests per workload.')
+        parser.add_argument('--output', default='bench_sqlite.json')
+
+    def copy_database(self, path, profile):
+        source = connections[DEFAULT_DB_ALIAS]
+        source.ensure_connection()
+        target = sqlite3.connect(path)
+
+        try:
+            source.connection.backup(target)
+
+            # The copy keeps the journal mode of the source file
+            if profile == 'default':
+                target.execute('PRAGMA journal_mode = DELETE')
+        finally:
+            target.close()
+
+        source.close()
+
+    def get_token(self, application):
+        status, content = call_wsgi(
+            application, 'POST', reverse('recipes:token_obtain_pair'),
+            json.dumps({'username': BENCH_USERNAME, 'password': BENCH_PASSWORD}).encode(),
+        )
+
+        if status != 200:
+            raise CommandError(f'Could not obtain a token for {BENCH_USERNAME}.')
+
+        return json.loads(content)['access']
+
+    def make_request_fns(self, application, token):
+        numbers = itertools.count()
+        mixed_numbers = itertools.count()
+
+        def list_fn():
+            return call_wsgi(application, 'GET', reverse('recipes:home'))[0] == 200
+
+        def api_list_fn():
+            return call_wsgi(application, 'GET', reverse('recipes:recipes-api-list'))[0] == 200
+
+        def create_fn():
+            number = next(numbers)
+            body = json.dumps({
+                'title': f'Bench SQLite recipe {number}',
+                'description': f'Created by bench_sqlite {number}',
+                'preparation_time': 10,
+                'preparation_time_unit': 'Minutos',
+                'servings': 4,
+                'servings_unit': 'Porções',
+                'preparation_steps': 'Bench SQLite preparation steps',
+            }).encode()
+            status, _ = call_wsgi(
+                application, 'POST', reverse('recipes:recipes-api-list'), body,
+                {'HTTP_AUTHORIZATION': f'Bearer {token}'},
+            )
+            return status == 201
+
+        # One write for every four reads, like a busy read-mostly site
+        def mixed_fn():
+            return create_fn() if next(mixed_numbers) % 5 == 0 else list_fn()
+
+        return {'list': list_fn, 'api_list': api_list_fn, 'create': create_fn, 'mixed': mixed_fn}
+
+    def run_profile(self, profile, options):
+        application = get_wsgi_application()
+        request_fns = self.make_request_fns(application, self.get_token(application))
+        results = {}
+
+        for workload in WORKLOADS:
+            request_fn = request_fns[workload]
+
+            for _ in range(options['warmup']):
+                request_fn()
+
+            results[workload] = run_concurrently(
+                request_fn, options['requests'], options['concurrency']
+            )
+            self.stdout.write(
+                f'{profile:<11} {workload:<9} {results[workload]["rps"]:>9} req/s  '
+                f'p50 {results[workload]["p50_ms"]}ms  p99 {results[workload]["p99_ms"]}ms  '
+                f'errors {results[workload]["errors"]}'
+            )
+
+        return results
+
+    def handle(self, *args, **options):
+        database = connections[DEFAULT_DB_ALIAS].settings_dict
+
+        if connections[DEFAULT_DB_ALIAS].vendor != 'sqlite':
+            raise CommandError('bench_sqlite only runs against a SQLite default database.')
+
+        # The profiles run on copies of the throwaway benchmark database
+        with bench_database(options['seed'], self.stdout):
+            original = {key: database.get(key) for key in ('NAME', 'CONN_MAX_AGE', 'CONN_HEALTH_CHECKS')}
+            results = {}
+
+            with tempfile.TemporaryDirectory() as directory:
+                try:
+                    for profile in PROFILES:
+                        path = os.path.join(directory, f'{profile}.sqlite3')
+                        self.copy_database(path, profile)
+                        production = profile == 'production'
+                        database.update(
+                            NAME=path,
+                            CONN_MAX_AGE=600 if production else 0,
+                            CONN_HEALTH_CHECKS=production,
+                        )
+
+                        with override_settings(SQLITE_PRODUCTION=production, QUERY_STATS_ENABLED=False):
+                            results[profile] = self.run_profile(profile, options)
+
+                        connections.close_all()
+                        database.update(original)
+                finally:
+                    connections.close_all()
+                    database.update(original)
+
+        data = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'sqlite': sqlite3.sqlite_version,
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+            },
+            'profiles': results,
+            'production_change_percent': compare_to_baseline(
+                results['production'], results['default']
+            ),
+        }
+
+        for workload, changes in data['production_change_percent'].items():
+            formatted = '  '.join(f'{metric} {change:+.1f}%' for metric, change in changes.items())
+            self.stdout.write(f'{workload:<9} {formatted}')
+
+        write_results(options['output'], data)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
@@ -0,0 +1,110 @@
+import platform
+import timeit
+
+from django.core.management.base import BaseCommand
+from django.http import HttpRequest
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+from recipes.views.api import RecipeAPIv2Pagination
+from recipes.views.site import PER_PAGE
+from utils.benchmark import write_results
+from utils.url_builders import FAST_URL_ROUTES, build_url, get_absolute_base, get_url_builder
+
+SAMPLE_VALUES = {'recipes:tag': 'bench-arroz-a1B2c'}
+
+
+class Command(BaseCommand):
+    help = (
+        'Times reverse() against the precompiled URL builders for the hot '
+        'routes and estimates the savings for a rendered list page and an '
+        'API list page.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=20000, help='Calls per timing run.')
+        parser.add_argument('--tags-per-recipe', type=int, default=3)
+        parser.add_argument('--output', default='bench_urls.json')
+
+    def time_us(self, fn, number):
+        # Best of three runs, in microseconds per call
+        return round(min(timeit.repeat(fn, repeat=3, number=number)) / number * 1e6, 3)
+
+    def compare(self, name, slow_fn, fast_fn, number):
+        result = {
+            'reverse_us': self.time_us(slow_fn, number),
+            'builder_us': self.time_us(fast_fn, number),
+        }
+        result['saved_us'] = round(result['reverse_us'] - result['builder_us'], 3)
+        result['speedup'] = round(result['reverse_us'] / result['builder_us'], 1)
+
+        self.stdout.write(
+            f'{name:<28} reverse {result["reverse_us"]:>9}us  '
+            f'builder {result["builder_us"]:>7}us  x{result["speedup"]}'
+        )
+        return result
+
+    def handle(self, *args, **options):
+        number = options['number']
+        request = RequestFactory().get('/')
+        routes = {}
+
+        for viewname in FAST_URL_ROUTES:
+            value = SAMPLE_VALUES.get(viewname, 42)
+            routes[viewname] = self.compare(
+                viewname,
+                lambda: reverse(viewname, args=(value,)),
+                lambda: build_url(viewname, value),
+                number,
+            )
+
+        # A card links the recipe three times, its category and its author
+        card_routes = ['recipes:recipe'] * 3 + ['recipes:category', 'authors:profile']
+
+        def site_page_reverse():
+            for recipe_id in range(PER_PAGE):
+                for viewname in card_routes:
+                    reverse(viewname, args=(recipe_id,))
+
+        def site_page_builder():
+            page_request = HttpRequest()
+
+            for recipe_id in range(PER_PAGE):
+                for viewname in card_routes:
+                    build_url(viewname, recipe_id, page_request)
+
+        tag_ids = range(RecipeAPIv2Pagination.page_size * options['tags_per_recipe'])
+
+        def api_page_reverse():
+            for tag_id in tag_ids:
+                request.build_absolute_uri(reverse('recipes:recipe_api_v2_tag', args=(tag_id,)))
+
+        def api_page_builder():
+            base = get_absolute_base(request)
+            builder = get_url_builder('recipes:recipe_api_v2_tag')
+
+            for tag_id in tag_ids:
+                base + builder(tag_id)
+
+        page_number = max(1, number // 100)
+        pages = {
+            'site_list_page': self.compare('site list page', site_page_reverse, site_page_builder, page_number),
+            'api_list_page': self.compare('api list page', api_page_reverse, api_page_builder, page_number),
+        }
+
+        data = {
+            'meta': {
+                'created_at': timezone.now().isoformat(),
+                'python': platform.python_version(),
+                'number': number,
+                'per_page': PER_PAGE,
+                'api_page_size': RecipeAPIv2Pagination.page_size,
+                'tags_per_recipe': options['tags_per_recipe'],
+            },
+            'routes': routes,
+            'pages': pages,
+        }
+
+        write_results(options['output'], data)
+        self.stdout.write(self.style.SUCCESS(f'Results written to {options["output"]}'))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes.export import EXPORT_CHUNK_SIZE, iter_export_lines, parse_since
+
+
+class Command(BaseCommand):
+    help = 'Writes every published recipe as one JSON object per line (NDJSON).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', '-o', help='File to write to. Defaults to stdout.')
+        parser.add_argument(
+            '--since',
+            help=(
+                'Only export recipes changed at or after this ISO 8601 datetime, with '
+                'tombstones for the ones unpublished or deleted since then.'
+            ),
+        )
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        since = None
+
+        if options['since']:
+            since = parse_since(options['since'])
+
+            if since is None:
+                raise CommandError(f'Invalid --since datetime: {options["since"]}')
+
+        lines = iter_export_lines(since=since, chunk_size=options['chunk_size'])
+
+        if not options['output']:
+            for line in lines:
+                self.stdout.write(line, ending='')
+            return
+
+        total = 0
+
+        with open(options['output'], 'w', encoding='utf-8') as output:
+            for line in lines:
+                output.write(line)
+                total += 1
+
+        self.stderr.write(self.style.SUCCESS(f'Exported {total} rows.'))
@@ -0,0 +1,77 @@
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from recipes.importer import DEFAULT_IMPORT_SOURCE, IMPORT_BATCH_SIZE, import_rows
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports recipes from a JSONL file in the shape of _localcode/main.py:make_recipe, '
+        'writing them with bulk_create in chunked transactions. Cover URLs are not downloaded.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='JSONL file to read, or - for stdin.')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument(
+            '--unpublished',
+            action='store_true',
+            help='Import recipes as drafts unless a row sets is_published.',
+        )
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--source',
+            default=DEFAULT_IMPORT_SOURCE,
+            help='Partner the file comes from; author usernames are prefixed with it.',
+        )
+
+    def read_rows(self, lines):
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                self.stderr.write(f'Line {line_number}: invalid JSON ({e})')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1.')
+
+        started_at = time.perf_counter()
+
+        def report(imported, errors):
+            elapsed = time.perf_counter() - started_at
+            self.stdout.write(f'{imported} recipes imported ({imported / elapsed:.0f} rows/s)')
+
+        if options['path'] == '-':
+            lines = sys.stdin
+        else:
+            try:
+                lines = open(options['path'], encoding='utf-8')
+            except OSError as e:
+                raise CommandError(str(e))
+
+        with lines:
+            imported, errors = import_rows(
+                self.read_rows(lines),
+                batch_size=options['batch_size'],
+                publish=not options['unpublished'],
+                using=options['database'],
+                on_batch=report if options['verbosity'] > 1 else None,
+                source=options['source'],
+            )
+
+        for line_number, error in errors:
+            self.stderr.write(f'Line {line_number}: {error}')
+
+        elapsed = time.perf_counter() - started_at
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {imported} recipes in {elapsed:.2f}s '
+            f'({imported / elapsed if elapsed else 0:.0f} rows/s), skipped {len(errors)}.'
+        ))
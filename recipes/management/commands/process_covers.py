@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from recipes.models import Recipe
+from recipes.tasks import process_recipe_cover
+
+
+class Command(BaseCommand):
+    help = 'Generates the resized cover derivatives for recipes that are missing them.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='Regenerate derivatives even for covers that already have them.',
+        )
+
+    def handle(self, *args, **options):
+        recipes = Recipe.objects.exclude(cover='').only('id', 'cover', 'cover_derivatives')
+        processed = 0
+
+        for recipe in recipes.iterator(chunk_size=500):
+            if recipe.has_cover_derivatives() and not options['all']:
+                continue
+
+            if process_recipe_cover(recipe.pk):
+                processed += 1
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} covers.'))
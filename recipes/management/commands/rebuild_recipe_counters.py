@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from recipes.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the published recipe counters from the recipe table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        total = rebuild_counters(using=options['database'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total} counters.'))
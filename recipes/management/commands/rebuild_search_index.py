@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS
+
+from recipes.search import create_search_index, rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index used by the recipe search page.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+
+    def handle(self, *args, **options):
+        using = options['database']
+        create_search_index(using=using)
+        rebuild_search_index(using=using)
+        self.stdout.write(self.style.SUCCESS('Search index rebuilt.'))
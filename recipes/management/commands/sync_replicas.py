@@ -0,0 +1,59 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Copies the primary SQLite database over every read replica in '
+        'DATABASE_REPLICAS, once or every --interval seconds.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=0,
+            help='Keep copying every N seconds until interrupted.',
+        )
+
+    def sync(self, replicas):
+        primary = connections[DEFAULT_DB_ALIAS]
+        primary.ensure_connection()
+
+        for alias in replicas:
+            replica = connections[alias]
+            replica.close()
+            target = sqlite3.connect(replica.settings_dict['NAME'])
+
+            try:
+                # The backup API copies a consistent snapshot page by page
+                # while the primary keeps accepting writes.
+                primary.connection.backup(target)
+            finally:
+                target.close()
+
+    def handle(self, *args, **options):
+        replicas = settings.DATABASE_REPLICAS
+
+        if not replicas:
+            self.stdout.write('No replicas configured, set DATABASE_REPLICAS.')
+            return
+
+        for alias in (DEFAULT_DB_ALIAS, *replicas):
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(
+                    f'{alias} is not SQLite; other engines replicate on the server.'
+                )
+
+        while True:
+            self.sync(replicas)
+            self.stdout.write(self.style.SUCCESS(f'Synced {", ".join(replicas)}.'))
+
+            if not options['interval']:
+                return
+
+            time.sleep(options['interval'])
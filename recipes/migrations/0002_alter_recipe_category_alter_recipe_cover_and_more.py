@@ -0,0 +1,29 @@
+# Generated by Django 5.0.2 on 2024-03-06 23:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='recipe',
+            name='category',
+            field=models.ForeignKey(blank=True, default=None, null=True, on_delete=django.db.models.deletion.SET_NULL, to='recipes.category'),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='cover',
+            field=models.ImageField(blank=True, default='', upload_to='recipes/covers/%Y/%m/%d/'),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='slug',
+            field=models.SlugField(unique=True),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.2 on 2026-10-18 06:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0003_recipe_tags'),
+        ('tag', '0002_remove_tag_content_type_remove_tag_object_id'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='recipe',
+            options={'verbose_name': 'Recipe', 'verbose_name_plural': 'Recipes'},
+        ),
+        migrations.AddField(
+            model_name='recipe',
+            name='cover_derivatives',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='tags',
+            field=models.ManyToManyField(blank=True, default='', to='tag.tag'),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='title',
+            field=models.CharField(max_length=65, verbose_name='Title'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.2 on 2026-10-18 06:59
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_counters(apps, schema_editor):
+    using = schema_editor.connection.alias
+    Recipe = apps.get_model('recipes', 'Recipe')
+    PublishedRecipeCounter = apps.get_model('recipes', 'PublishedRecipeCounter')
+
+    published = Recipe.objects.using(using).filter(is_published=True)
+    counters = [PublishedRecipeCounter(scope='all', object_id=0, count=published.count())]
+
+    for row in published.exclude(category=None).values('category_id').annotate(total=Count('id')).order_by():
+        counters.append(PublishedRecipeCounter(scope='category', object_id=row['category_id'], count=row['total']))
+
+    through = Recipe.tags.through.objects.using(using).filter(recipe__is_published=True)
+
+    for row in through.values('tag_id').annotate(total=Count('recipe_id')).order_by():
+        counters.append(PublishedRecipeCounter(scope='tag', object_id=row['tag_id'], count=row['total']))
+
+    PublishedRecipeCounter.objects.using(using).bulk_create(counters)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0004_recipe_cover_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublishedRecipeCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('all', 'All'), ('category', 'Category'), ('tag', 'Tag')], max_length=16)),
+                ('object_id', models.PositiveBigIntegerField(default=0)),
+                ('count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='publishedrecipecounter',
+            constraint=models.UniqueConstraint(fields=('scope', 'object_id'), name='unique_published_recipe_counter'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.0.2 on 2026-10-18 07:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0005_publishedrecipecounter'),
+        ('tag', '0002_remove_tag_content_type_remove_tag_object_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['-id'], name='recipe_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['updated_at'], name='recipe_published_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(condition=models.Q(('is_published', True)), fields=['category', '-id'], name='recipe_category_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='recipe',
+            index=models.Index(condition=models.Q(('is_published', False)), fields=['author', '-id'], name='recipe_author_draft_idx'),
+        ),
+        # The auto-created tags table only indexes (recipe_id, tag_id) and
+        # tag_id, so the tag listing couldn't read recipe ids in order.
+        migrations.RunSQL(
+            'CREATE INDEX "recipe_tags_tag_recipe_idx" ON "recipes_recipe_tags" ("tag_id", "recipe_id")',
+            'DROP INDEX "recipe_tags_tag_recipe_idx"',
+        ),
+    ]
@@ -1,16 +1,13 @@
-from django.db import models
+from django.db import models, router, transaction
 from django.contrib.auth.models import User
-from django.urls import reverse
 from django.utils.text import slugify
-from django.db.models import Value, F
-from django.db.models.functions import Concat
 from collections import defaultdict
 from tag.models import Tag
+from recipes.images import cover_derivative_url, cover_srcset
+from recipes.tasks import enqueue_cover_processing
+from utils.url_builders import build_url
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
-import os
-from django.conf import settings
-from PIL import Image
 import string
 from random import SystemRandom
 
@@ -22,10 +19,9 @@ class Category(models.Model):
     
 class RecipeManager(models.Manager):
     def get_published(self):
-        return self.filter(is_published=True).annotate(
-                author_full_name=Concat(F('author__first_name'), Value(' ('), F('author__username'), Value(')')
-            )
-        ).order_by('-id').select_related('category', 'author').prefetch_related('tags')
+        return self.filter(is_published=True).order_by('-id').select_related(
+            'category'
+        ).prefetch_related('tags')
 
 class Recipe(models.Model):
     objects = RecipeManager()
@@ -45,31 +41,99 @@ class Recipe(models.Model):
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, default=None)
     author = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     tags = models.ManyToManyField(Tag, blank=True, default='')
+    cover_derivatives = models.JSONField(default=dict, blank=True, editable=False)
+
+    # Fields recipes.signals compares against the stored row on save and
+    # delete, remembered when the instance is loaded so no SELECT is needed.
+    ORIGINAL_VALUE_FIELDS = ('cover', 'cover_derivatives', 'is_published', 'category_id', 'updated_at')
 
     def __str__(self) -> str:
         return self.title
 
     def get_absolute_url(self):
-        return reverse('recipes:recipe', args=(self.id,))
-    
-    @staticmethod
-    def resize_image(image, new_width=800):
-        image_full_path = os.path.join(settings.MEDIA_ROOT, image.name)
-        image_pillow = Image.open(image_full_path)
-        original_width, original_height = image_pillow.size
-
-        if original_width < new_width:
-            image_pillow.close
-            return
-        
-        new_height = round((new_width * original_height) / original_width)
+        return build_url('recipes:recipe', self.id)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.remember_original_values()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None):
+        super().refresh_from_db(using=using, fields=fields)
+        self.remember_original_values(fields)
+
+    def get_original_attnames(self, fields=None):
+        if fields is None:
+            return set(self.ORIGINAL_VALUE_FIELDS)
+
+        attnames = {self._meta.get_field(name).attname for name in fields}
+        return attnames.intersection(self.ORIGINAL_VALUE_FIELDS)
+
+    def remember_original_values(self, fields=None):
+        originals = self.__dict__.setdefault('_original_values', {})
+        deferred = self.get_deferred_fields()
 
-        new_image = image_pillow.resize((new_width, new_height), Image.LANCZOS)
+        for attname in self.get_original_attnames(fields) - deferred:
+            value = getattr(self, attname)
 
-        new_image.save(image_full_path, optimize=True, quality=50)
+            if attname == 'cover':
+                value = value.name or ''
+            elif attname == 'cover_derivatives':
+                value = dict(value or {})
 
+            originals[attname] = value
 
+    def get_original_values(self, using=None):
+        if self.pk is None:
+            return None
+
+        originals = self.__dict__.setdefault('_original_values', {})
+        missing = [name for name in self.ORIGINAL_VALUE_FIELDS if name not in originals]
+
+        # Instances built by hand (or with deferred fields) fall back to one
+        # query for whatever was not loaded.
+        if missing:
+            row = type(self)._base_manager.using(
+                using or router.db_for_write(type(self), instance=self)
+            ).filter(pk=self.pk).values(*missing).first()
+
+            if row is None:
+                return None
+
+            if 'cover' in row:
+                row['cover'] = row['cover'] or ''
+
+            originals.update(row)
+
+        return originals
     
+    def has_cover_derivatives(self):
+        return bool(self.cover) and self.cover_derivatives.get('name') == self.cover.name
+
+    def cover_srcset(self, file_format):
+        if not self.has_cover_derivatives():
+            return ''
+
+        return cover_srcset(self.cover.name, self.cover_derivatives.get(file_format, []), file_format)
+
+    @property
+    def cover_webp_srcset(self):
+        return self.cover_srcset('webp')
+
+    @property
+    def cover_jpeg_srcset(self):
+        return self.cover_srcset('jpeg')
+
+    @property
+    def cover_fallback_url(self):
+        widths = self.cover_derivatives.get('jpeg', []) if self.has_cover_derivatives() else []
+
+        if not widths:
+            return self.cover.url
+
+        return cover_derivative_url(self.cover.name, max(widths), 'jpeg')
+
     def save(self, *args, **kwargs):
         if not self.slug:
             rand_letters = ''.join(
@@ -81,15 +145,18 @@ class Recipe(models.Model):
 
             self.slug = slugify(f'{self.title}-{rand_letters}')
 
-        saved = super().save(*args, **kwargs)
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+
+        # Keeps the published recipe counters maintained by recipes.signals
+        # in the same transaction as the row they count.
+        with transaction.atomic(using=using):
+            saved = super().save(*args, **kwargs)
+
+        self.remember_original_values(kwargs.get('update_fields'))
+
+        if self.cover and not self.has_cover_derivatives():
+            enqueue_cover_processing(self.pk)
 
-        if self.cover:
-            try:
-                self.resize_image(self.cover, 800)
-            except FileNotFoundError:
-                ...
-            
-        
         return saved
     
     # def clean(self, *args, **kwargs):
@@ -112,3 +179,59 @@ class Recipe(models.Model):
     class Meta:
         verbose_name = _('Recipe')
         verbose_name_plural = _('Recipes')
+        # Access paths of the public listings, the API and the dashboard,
+        # checked by recipes/tests/test_recipe_query_plans.py. They are
+        # partial because SQLite can't use an index for a bare boolean
+        # filter like WHERE "is_published".
+        indexes = [
+            models.Index(
+                fields=['-id'], condition=models.Q(is_published=True),
+                name='recipe_published_idx',
+            ),
+            models.Index(
+                fields=['updated_at'], condition=models.Q(is_published=True),
+                name='recipe_published_updated_idx',
+            ),
+            models.Index(
+                fields=['category', '-id'], condition=models.Q(is_published=True),
+                name='recipe_category_published_idx',
+            ),
+            models.Index(
+                fields=['author', '-id'], condition=models.Q(is_published=False),
+                name='recipe_author_draft_idx',
+            ),
+        ]
+
+class PublishedRecipeCounter(models.Model):
+    SCOPE_ALL = 'all'
+    SCOPE_CATEGORY = 'category'
+    SCOPE_TAG = 'tag'
+    SCOPE_CHOICES = (
+        (SCOPE_ALL, 'All'),
+        (SCOPE_CATEGORY, 'Category'),
+        (SCOPE_TAG, 'Tag'),
+    )
+
+    scope = models.CharField(max_length=16, choices=SCOPE_CHOICES)
+    object_id = models.PositiveBigIntegerField(default=0)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f'{self.scope}:{self.object_id} = {self.count}'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope', 'object_id'],
+                name='unique_published_recipe_counter',
+            ),
+        ]
+
+
+class DeletedRecipe(models.Model):
+    # Tombstones for incremental exports, written by recipes.signals
+    recipe_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f'{self.recipe_id} deleted at {self.deleted_at}'
@@ -0,0 +1,147 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from django.utils.translation import get_language
+
+from utils.compression import get_cached_compressed_response
+from utils.conditional import has_pending_messages
+from utils.db_router import read_from_primary
+
+# Every cached page also depends on this scope, so category and tag names
+# (shown in titles and cards) can drop all of them at once.
+ALL_PAGES = ('pages', 0)
+
+
+def get_page_cache():
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def make_generation_key(scope, object_id):
+    return f'page_generation:{scope}:{object_id}'
+
+
+def get_generations(scopes):
+    cache = get_page_cache()
+    keys = [make_generation_key(*scope) for scope in scopes]
+    generations = cache.get_many(keys)
+
+    for key in keys:
+        if key not in generations:
+            # An evicted generation must not bring old pages back
+            cache.add(key, uuid.uuid4().hex, None)
+            generations[key] = cache.get(key)
+
+    return [generations[key] for key in keys]
+
+
+def bump_generations(scopes):
+    get_page_cache().set_many(
+        {make_generation_key(*scope): uuid.uuid4().hex for scope in scopes}, None
+    )
+
+
+def invalidate_pages(scopes, using=None):
+    scopes = set(scopes)
+
+    if not scopes or not settings.PAGE_CACHE_TIMEOUT:
+        return
+
+    bump_generations(scopes)
+
+    # A request that renders before the commit would cache the old rows
+    # under the new generation, so it moves again once they are visible.
+    transaction.on_commit(lambda: bump_generations(scopes), using=using)
+
+
+def make_page_key(request, scope):
+    generations = get_generations([ALL_PAGES, scope])
+    digest = hashlib.md5(
+        f'{request.get_full_path()}|{get_language()}'.encode(), usedforsecurity=False
+    ).hexdigest()
+    return f'page:{":".join(generations)}:{digest}'
+
+
+def is_page_cacheable(request):
+    if not settings.PAGE_CACHE_TIMEOUT or request.method not in ('GET', 'HEAD'):
+        return False
+
+    if request.user.is_authenticated:
+        return False
+
+    return not has_pending_messages(request)
+
+
+def store_page(request, key, response):
+    if response.status_code != 200 or not response.has_header('ETag'):
+        return
+
+    # A page that rendered a CSRF token is only valid for that session
+    if request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+        return
+
+    get_page_cache().set(key, {
+        'content': response.content,
+        'content_type': response['Content-Type'],
+        'etag': response['ETag'],
+        'last_modified': response.get('Last-Modified'),
+    }, settings.PAGE_CACHE_TIMEOUT)
+
+
+def build_page_response(request, page):
+    etag, last_modified = page['etag'], page['last_modified']
+
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=parse_http_date_safe(last_modified) if last_modified else None,
+    )
+
+    if response is None:
+        response = get_cached_compressed_response(request, etag)
+
+    if response is None:
+        response = HttpResponse(page['content'], content_type=page['content_type'])
+
+    response.headers.setdefault('ETag', etag)
+
+    if last_modified:
+        response.headers.setdefault('Last-Modified', last_modified)
+
+    return response
+
+
+class AnonymousPageCacheMixin:
+    # Anonymous visitors all see the same page for a path and language, so
+    # the rendered page is served without running the view at all.
+    def get_page_cache_scope(self):
+        return ALL_PAGES
+
+    def dispatch(self, request, *args, **kwargs):
+        if not is_page_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        key = make_page_key(request, self.get_page_cache_scope())
+        page = get_page_cache().get(key)
+
+        if page is not None:
+            response = build_page_response(request, page)
+            response['X-Page-Cache'] = 'hit'
+            return response
+
+        # The page is stored under the current generation, so it must not
+        # come from a replica that hasn't seen the rows that moved it yet.
+        read_from_primary()
+        response = super().dispatch(request, *args, **kwargs)
+
+        # Not-modified and compressed-cache responses are already final
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.add_post_render_callback(lambda rendered: store_page(request, key, rendered))
+
+        response['X-Page-Cache'] = 'miss'
+        return response
@@ -0,0 +1,130 @@
+import re
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+
+SEARCH_TABLE = 'recipes_recipe_fts'
+SEARCH_FIELDS = ('title', 'description', 'preparation_steps')
+
+# bm25 weights for title, description and preparation_steps
+SEARCH_WEIGHTS = (10.0, 4.0, 1.0)
+
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_index_available(using=DEFAULT_DB_ALIAS):
+    return connections[using].vendor == 'sqlite'
+
+
+def create_search_index(using=DEFAULT_DB_ALIAS):
+    conn = connections[using]
+
+    if not search_index_available(using):
+        return False
+
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+            [SEARCH_TABLE],
+        )
+
+        if cursor.fetchone():
+            return False
+
+        cursor.execute(
+            f'CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5('
+            f'{", ".join(SEARCH_FIELDS)}, '
+            "tokenize = 'unicode61 remove_diacritics 2')"
+        )
+
+    return True
+
+
+def rebuild_search_index(using=DEFAULT_DB_ALIAS):
+    conn = connections[using]
+
+    if not search_index_available(using):
+        return
+
+    fields = ', '.join(SEARCH_FIELDS)
+
+    with conn.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+        cursor.execute(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, {fields}) '
+            f'SELECT id, {fields} FROM recipes_recipe'
+        )
+
+
+def index_recipes(recipes, using=DEFAULT_DB_ALIAS):
+    conn = connections[using]
+
+    if not search_index_available(using):
+        return
+
+    rows = [
+        (recipe.pk, *(getattr(recipe, field) or '' for field in SEARCH_FIELDS))
+        for recipe in recipes
+    ]
+
+    if not rows:
+        return
+
+    placeholders = ', '.join(['%s'] * (len(SEARCH_FIELDS) + 1))
+
+    with conn.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [(row[0],) for row in rows],
+        )
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, {", ".join(SEARCH_FIELDS)}) '
+            f'VALUES ({placeholders})',
+            rows,
+        )
+
+
+def unindex_recipes(recipe_ids, using=DEFAULT_DB_ALIAS):
+    conn = connections[using]
+
+    if not search_index_available(using):
+        return
+
+    with conn.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [(recipe_id,) for recipe_id in recipe_ids],
+        )
+
+
+def make_match_expression(search_term):
+    # Every word becomes a quoted prefix token so user input can never be
+    # parsed as FTS5 query syntax.
+    words = WORD_RE.findall(search_term)
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def search_recipes(queryset, search_term):
+    if not search_index_available(queryset.db):
+        return queryset.filter(
+            Q(title__icontains=search_term) |
+            Q(description__icontains=search_term) |
+            Q(preparation_steps__icontains=search_term)
+        )
+
+    match = make_match_expression(search_term)
+
+    if not match:
+        return queryset.none()
+
+    weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+    table = queryset.model._meta.db_table
+
+    # One join against a single MATCH gives both the rowids and their rank,
+    # instead of running the MATCH again for every row.
+    return queryset.extra(
+        select={'search_rank': f'bm25({SEARCH_TABLE}, {weights})'},
+        tables=[SEARCH_TABLE],
+        where=[f'{SEARCH_TABLE} MATCH %s', f'{SEARCH_TABLE}.rowid = "{table}"."id"'],
+        params=[match],
+    ).order_by('search_rank', '-id')
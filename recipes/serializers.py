@@ -2,6 +2,8 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from tag.models import Tag
 from .models import Recipe
+from .taxonomy import get_taxonomy
+from utils.url_builders import get_absolute_base, get_url_builder
 from authors.validators import AuthorRecipeValidator
 
 class TagSerializer(serializers.ModelSerializer):
@@ -20,18 +22,43 @@ class RecipeSerializer(serializers.ModelSerializer):
 
     public = serializers.BooleanField(source='is_published', read_only=True)
     preparation = serializers.SerializerMethodField(read_only=True)
-    category = serializers.StringRelatedField(read_only=True)
+    category = serializers.SerializerMethodField(read_only=True)
     
     tag_objects = TagSerializer(many=True, source='tags', read_only=True)
-    tag_links = serializers.HyperlinkedRelatedField(
-        many=True,
-        source='tags',
-        view_name='recipes:recipe_api_v2_tag',
-        read_only=True
-    )
+    tag_links = serializers.SerializerMethodField(read_only=True)
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
     def get_preparation(self, recipe):
         return f'{recipe.preparation_time} {recipe.preparation_time_unit}'
+
+    def get_tag_links(self, recipe):
+        # Same output as a HyperlinkedRelatedField, without a reverse() and
+        # build_absolute_uri() per tag.
+        if 'tag_link_builder' not in self.context:
+            request = self.context.get('request')
+            base = get_absolute_base(request) if request else ''
+            builder = get_url_builder('recipes:recipe_api_v2_tag')
+            self.context['tag_link_builder'] = lambda tag_id: base + builder(tag_id)
+
+        build = self.context['tag_link_builder']
+        return [build(tag.pk) for tag in recipe.tags.all()]
+
+    def get_category(self, recipe):
+        if recipe.category_id is None:
+            return None
+
+        # The context is shared by every item of a list, so the taxonomy
+        # version is checked once per response.
+        if 'taxonomy' not in self.context:
+            self.context['taxonomy'] = get_taxonomy()
+
+        return self.context['taxonomy'].get_category_name(recipe.category_id)
     
     def validate(self, attrs):
         if self.instance is not None and  attrs.get('servings') is None:
@@ -52,3 +79,100 @@ class RecipeSerializer(serializers.ModelSerializer):
     
     def update(self, instance, validated_data):
         return super().update(instance, validated_data)
+
+
+class RecipeProjection:
+    # Read-only fast path for lists: the same JSON as RecipeSerializer,
+    # built from values() rows and one query for all of their tags instead
+    # of a model instance and a tree of fields per row.
+    columns = {
+        'id': ('id',),
+        'title': ('title',),
+        'description': ('description',),
+        'author': ('author',),
+        'category': ('category',),
+        'tags': (),
+        'public': ('is_published',),
+        'preparation': ('preparation_time', 'preparation_time_unit'),
+        'tag_objects': (),
+        'tag_links': (),
+        'preparation_time': ('preparation_time',),
+        'preparation_time_unit': ('preparation_time_unit',),
+        'servings': ('servings',),
+        'servings_unit': ('servings_unit',),
+        'preparation_steps': ('preparation_steps',),
+        'cover': ('cover',),
+    }
+    tag_fields = ('tags', 'tag_objects', 'tag_links')
+
+    def __init__(self, context=None, fields=None):
+        self.context = context or {}
+        self.fields = list(fields) if fields is not None else list(self.columns)
+
+    @classmethod
+    def get_columns(cls, fields):
+        # The id is always loaded: tags and cursor pagination need it
+        columns = ['id']
+
+        for field in fields:
+            columns += [column for column in cls.columns[field] if column not in columns]
+
+        return columns
+
+    @classmethod
+    def needs_tags(cls, fields):
+        return any(field in cls.tag_fields for field in fields)
+
+    def project(self, queryset):
+        return queryset.select_related(None).prefetch_related(None).values(
+            *self.get_columns(self.fields)
+        )
+
+    def get_tags(self, recipe_ids):
+        tags = {recipe_id: [] for recipe_id in recipe_ids}
+        rows = Recipe.tags.through.objects.filter(recipe_id__in=recipe_ids).order_by(
+            'recipe_id', 'tag_id'
+        ).values_list('recipe_id', 'tag_id', 'tag__name', 'tag__slug')
+
+        for recipe_id, tag_id, name, slug in rows:
+            tags[recipe_id].append({'id': tag_id, 'name': name, 'slug': slug})
+
+        return tags
+
+    def get_cover_url(self, name):
+        if not name:
+            return None
+
+        url = Recipe._meta.get_field('cover').storage.url(name)
+        request = self.context.get('request')
+        return request.build_absolute_uri(url) if request else url
+
+    def get_getters(self, tags):
+        request = self.context.get('request')
+        base = get_absolute_base(request) if request else ''
+        tag_link = get_url_builder('recipes:recipe_api_v2_tag')
+        getters = {
+            'author': lambda row: row['author'],
+            'public': lambda row: row['is_published'],
+            'preparation': lambda row: f'{row["preparation_time"]} {row["preparation_time_unit"]}',
+            'tags': lambda row: [tag['id'] for tag in tags[row['id']]],
+            'tag_objects': lambda row: tags[row['id']],
+            'tag_links': lambda row: [base + tag_link(tag['id']) for tag in tags[row['id']]],
+            'cover': lambda row: self.get_cover_url(row['cover']),
+        }
+
+        if 'category' in self.fields:
+            taxonomy = get_taxonomy()
+            getters['category'] = lambda row: taxonomy.get_category_name(row['category'])
+
+        return [
+            (field, getters.get(field) or (lambda row, field=field: row[field]))
+            for field in self.fields
+        ]
+
+    def to_representation(self, rows):
+        rows = list(rows)
+        tags = self.get_tags([row['id'] for row in rows]) if self.needs_tags(self.fields) else {}
+        getters = self.get_getters(tags)
+
+        return [{field: getter(row) for field, getter in getters} for row in rows]
@@ -1,29 +1,261 @@
-from django.db.models.signals import pre_delete, pre_save
+from django.db.models.signals import m2m_changed, post_delete, post_migrate, post_save, pre_delete, pre_save
 from django.dispatch import receiver
-from recipes.models import Recipe
-import os
-
-def delete_cover(instance):
-    try:
-        os.remove(instance.cover.path)
-    except (ValueError, FileNotFoundError) as e:
-        print(e)
+from django.utils import timezone
+from recipes.cache import invalidate_recipe_fragments
+from recipes.counters import CATEGORY, TAG, apply_counter_changes, delete_counter, recipe_counter_keys
+from recipes.models import Category, DeletedRecipe, Recipe
+from recipes.page_cache import ALL_PAGES, invalidate_pages
+from recipes.tasks import enqueue_cover_deletion
+from recipes.taxonomy import bump_taxonomy_version
+from tag.models import Tag
+from recipes.search import create_search_index, index_recipes, rebuild_search_index, unindex_recipes
 
 @receiver(pre_delete, sender=Recipe)
-def recipe_cover_delete(sender, instance, *args, **kwargs):
-    old_instance = Recipe.objects.filter(pk=instance.pk).first()
+def recipe_cover_delete(sender, instance, using, *args, **kwargs):
+    original = instance.get_original_values(using=using)
 
-    if old_instance:
-        delete_cover(old_instance)
+    if original:
+        invalidate_recipe_fragments(instance.pk, original['updated_at'])
+        enqueue_cover_deletion(original['cover'], original['cover_derivatives'], using=using)
 
 @receiver(pre_save, sender=Recipe)
-def recipe_cover_update(sender, instance, *args, **kwargs):
-    old_instance = Recipe.objects.filter(pk=instance.pk).first()
+def recipe_cover_update(sender, instance, using, *args, **kwargs):
+    original = instance.get_original_values(using=using)
 
-    if not old_instance:
+    if not original:
         return
+
+    invalidate_recipe_fragments(instance.pk, original['updated_at'])
     
-    is_new_cover = old_instance.cover != instance.cover
+    is_new_cover = original['cover'] != (instance.cover.name or '')
 
     if is_new_cover:
-        delete_cover(old_instance)
\ No newline at end of file
+        enqueue_cover_deletion(original['cover'], original['cover_derivatives'], using=using)
+
+def get_recipe_tag_ids(recipe_id, using):
+    return list(
+        Recipe.tags.through.objects.using(using).filter(
+            recipe_id=recipe_id
+        ).values_list('tag_id', flat=True)
+    )
+
+@receiver(pre_save, sender=Recipe)
+def recipe_counters_before_save(sender, instance, using, *args, **kwargs):
+    instance._counter_keys_before_save = []
+    old_values = instance.get_original_values(using=using)
+
+    if not old_values:
+        return
+
+    # Tags only move between counters when the recipe is (un)published.
+    tag_ids = []
+
+    if old_values['is_published'] != instance.is_published:
+        tag_ids = get_recipe_tag_ids(instance.pk, using)
+
+    instance._counter_keys_before_save = recipe_counter_keys(
+        old_values['is_published'], old_values['category_id'], tag_ids
+    )
+    instance._counter_tag_ids = tag_ids
+
+@receiver(post_save, sender=Recipe)
+def recipe_counters_after_save(sender, instance, using, *args, **kwargs):
+    apply_counter_changes(
+        getattr(instance, '_counter_keys_before_save', []),
+        recipe_counter_keys(
+            instance.is_published,
+            instance.category_id,
+            getattr(instance, '_counter_tag_ids', []),
+        ),
+        using=using,
+    )
+    instance._counter_keys_before_save = []
+    instance._counter_tag_ids = []
+
+@receiver(pre_delete, sender=Recipe)
+def recipe_counters_before_delete(sender, instance, using, *args, **kwargs):
+    old_values = instance.get_original_values(using=using)
+
+    if not old_values or not old_values['is_published']:
+        instance._counter_keys_before_delete = []
+        return
+
+    instance._counter_keys_before_delete = recipe_counter_keys(
+        True, old_values['category_id'], get_recipe_tag_ids(instance.pk, using)
+    )
+
+@receiver(post_delete, sender=Recipe)
+def recipe_counters_after_delete(sender, instance, using, *args, **kwargs):
+    apply_counter_changes(
+        getattr(instance, '_counter_keys_before_delete', []), [], using=using
+    )
+
+def get_tag_counter_keys(through, instance, action, reverse, pk_set):
+    if not reverse:
+        if not instance.is_published:
+            return []
+
+        if action == 'post_add':
+            tag_ids = pk_set
+        elif action == 'pre_remove':
+            tag_ids = through.filter(recipe_id=instance.pk, tag_id__in=pk_set).values_list('tag_id', flat=True)
+        else:
+            tag_ids = through.filter(recipe_id=instance.pk).values_list('tag_id', flat=True)
+
+        return [(TAG, tag_id) for tag_id in tag_ids]
+
+    published = through.filter(tag_id=instance.pk, recipe__is_published=True)
+
+    if action in ('post_add', 'pre_remove'):
+        published = published.filter(recipe_id__in=pk_set)
+
+    return [(TAG, instance.pk)] * published.count()
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tag_counters_changed(sender, instance, action, reverse, pk_set, using, *args, **kwargs):
+    through = sender.objects.using(using)
+
+    if action in ('pre_remove', 'pre_clear'):
+        # Only the pre_* actions still see the rows; the counters move in
+        # post_*, so a counter created from COUNT(*) never counts them twice.
+        instance._removed_tag_counter_keys = get_tag_counter_keys(
+            through, instance, action, reverse, pk_set
+        )
+    elif action == 'post_add':
+        apply_counter_changes(
+            [], get_tag_counter_keys(through, instance, action, reverse, pk_set), using=using
+        )
+    elif action in ('post_remove', 'post_clear'):
+        apply_counter_changes(
+            instance.__dict__.pop('_removed_tag_counter_keys', []), [], using=using
+        )
+
+@receiver(post_delete, sender=Category)
+def category_counter_delete(sender, instance, using, *args, **kwargs):
+    delete_counter(CATEGORY, instance.pk, using=using)
+
+@receiver(post_delete, sender=Tag)
+def tag_counter_delete(sender, instance, using, *args, **kwargs):
+    delete_counter(TAG, instance.pk, using=using)
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def taxonomy_changed(sender, instance, using, *args, **kwargs):
+    bump_taxonomy_version(using=using)
+    invalidate_pages([ALL_PAGES], using=using)
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+@receiver(post_save, sender=Tag)
+@receiver(pre_delete, sender=Tag)
+def taxonomy_recipes_changed(sender, instance, using, created=False, *args, **kwargs):
+    if created:
+        return
+
+    # Cached cards show the category and tag names, and deleting either one
+    # detaches the recipes without saving them.
+    recipes = Recipe.objects.using(using)
+
+    if sender is Category:
+        recipes = recipes.filter(category=instance)
+    else:
+        recipes = recipes.filter(tags=instance)
+
+    recipes.update(updated_at=timezone.now())
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tags_changed(sender, instance, action, reverse, pk_set, using, *args, **kwargs):
+    # Tags are part of the recipe's cards and API rows, so moving updated_at
+    # expires its cached partials, ETags and compressed bodies.
+    if not reverse:
+        if action not in ('post_add', 'post_remove', 'post_clear'):
+            return
+
+        now = timezone.now()
+        Recipe.objects.using(using).filter(pk=instance.pk).update(updated_at=now)
+        instance.updated_at = now
+        instance.remember_original_values(['updated_at'])
+        return
+
+    # tag.recipe_set.clear() only knows the recipes before they are removed
+    if action == 'pre_clear':
+        recipes = Recipe.objects.using(using).filter(tags=instance)
+    elif action in ('post_add', 'post_remove') and pk_set:
+        recipes = Recipe.objects.using(using).filter(pk__in=pk_set)
+    else:
+        return
+
+    recipes.update(updated_at=timezone.now())
+
+@receiver(pre_save, sender=Recipe)
+def recipe_pages_before_save(sender, instance, using, *args, **kwargs):
+    old_values = instance.get_original_values(using=using)
+    instance._page_values_before_save = (
+        (old_values['is_published'], old_values['category_id']) if old_values else (False, None)
+    )
+
+@receiver(post_save, sender=Recipe)
+def recipe_pages_after_save(sender, instance, created, using, *args, **kwargs):
+    was_published, old_category_id = getattr(instance, '_page_values_before_save', (False, None))
+
+    if not was_published and not instance.is_published:
+        return
+
+    # A save never changes the tags, but the recipe shows up on their pages
+    tag_ids = [] if created else get_recipe_tag_ids(instance.pk, using)
+
+    invalidate_pages(
+        recipe_counter_keys(was_published, old_category_id, tag_ids)
+        + recipe_counter_keys(instance.is_published, instance.category_id, tag_ids),
+        using=using,
+    )
+
+@receiver(pre_delete, sender=Recipe)
+def recipe_pages_before_delete(sender, instance, using, *args, **kwargs):
+    # The counter keys are exactly the listings that showed the recipe
+    instance._page_scopes_before_delete = getattr(instance, '_counter_keys_before_delete', [])
+
+@receiver(post_delete, sender=Recipe)
+def recipe_pages_after_delete(sender, instance, using, *args, **kwargs):
+    invalidate_pages(getattr(instance, '_page_scopes_before_delete', []), using=using)
+
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def recipe_tag_pages_changed(sender, instance, action, reverse, pk_set, using, *args, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+
+    if reverse:
+        # tag.recipe_set.add(...): only that tag's pages list the recipes
+        invalidate_pages([(TAG, instance.pk)], using=using)
+        return
+
+    if not instance.is_published:
+        return
+
+    if action == 'pre_clear':
+        pk_set = get_recipe_tag_ids(instance.pk, using)
+
+    invalidate_pages([(TAG, tag_id) for tag_id in pk_set or ()], using=using)
+
+@receiver(post_save, sender=Recipe)
+def recipe_search_index_update(sender, instance, using, *args, **kwargs):
+    index_recipes([instance], using=using)
+
+@receiver(post_delete, sender=Recipe)
+def recipe_tombstone_create(sender, instance, using, *args, **kwargs):
+    # Incremental exports report deletes from these rows
+    DeletedRecipe.objects.using(using).create(recipe_id=instance.pk)
+
+@receiver(post_delete, sender=Recipe)
+def recipe_search_index_delete(sender, instance, using, *args, **kwargs):
+    unindex_recipes([instance.pk], using=using)
+
+@receiver(post_migrate)
+def recipe_search_index_create(sender, using, *args, **kwargs):
+    if sender.name != 'recipes':
+        return
+
+    if create_search_index(using=using):
+        rebuild_search_index(using=using)
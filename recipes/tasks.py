@@ -0,0 +1,124 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.RECIPE_COVER_WORKERS,
+            thread_name_prefix='recipe-covers',
+        )
+
+    return _executor
+
+
+def process_recipe_cover(recipe_id):
+    from recipes.images import make_cover_derivatives
+    from recipes.models import Recipe
+
+    cover = Recipe.objects.filter(pk=recipe_id).values_list('cover', flat=True).first()
+
+    if not cover:
+        return None
+
+    try:
+        derivatives = make_cover_derivatives(cover)
+    except (FileNotFoundError, OSError) as e:
+        logger.warning('Could not process cover %s for recipe %s: %s', cover, recipe_id, e)
+        return None
+
+    # Filtering on the cover name keeps a slow job from overwriting the
+    # derivatives of a cover that was replaced while it was running. The
+    # srcset is part of the cached cards, so updated_at moves with it.
+    updated = Recipe.objects.filter(pk=recipe_id, cover=cover).update(
+        cover_derivatives=derivatives, updated_at=timezone.now()
+    )
+
+    if updated:
+        invalidate_cover_pages(recipe_id)
+
+    return derivatives
+
+
+def invalidate_cover_pages(recipe_id):
+    from recipes.counters import recipe_counter_keys
+    from recipes.models import Recipe
+    from recipes.page_cache import invalidate_pages
+
+    recipe = Recipe.objects.filter(pk=recipe_id).values('is_published', 'category_id').first()
+
+    if recipe is None or not recipe['is_published']:
+        return
+
+    tag_ids = Recipe.tags.through.objects.filter(recipe_id=recipe_id).values_list('tag_id', flat=True)
+    invalidate_pages(recipe_counter_keys(True, recipe['category_id'], tag_ids))
+
+
+def run_in_background(recipe_id):
+    close_old_connections()
+
+    try:
+        process_recipe_cover(recipe_id)
+    except Exception:
+        logger.exception('Cover processing failed for recipe %s', recipe_id)
+    finally:
+        close_old_connections()
+
+
+def enqueue_cover_processing(recipe_id):
+    if settings.RECIPE_COVER_PROCESSING == 'sync':
+        transaction.on_commit(lambda: process_recipe_cover(recipe_id))
+        return
+
+    transaction.on_commit(lambda: get_executor().submit(run_in_background, recipe_id))
+
+
+class CoverDeletion:
+    def __init__(self, name, derivatives, group):
+        self.name = name
+        self.derivatives = derivatives
+        self.group = group
+
+    def __call__(self):
+        from recipes.images import delete_cover_files
+
+        # Callbacks of one commit share a group, so a cover queued twice
+        # (a bulk delete, a cover replaced twice) is only deleted once.
+        self.group['committed'] = True
+
+        if self.name in self.group['deleted']:
+            return
+
+        self.group['deleted'].add(self.name)
+        delete_cover_files(self.name, self.derivatives)
+
+
+def get_cover_deletion_group(connection):
+    group = getattr(connection, 'cover_deletion_group', None)
+
+    if group is None or group['committed']:
+        group = connection.cover_deletion_group = {'committed': False, 'deleted': set()}
+
+    return group
+
+
+def enqueue_cover_deletion(name, derivatives=None, using=None):
+    if not name:
+        return
+
+    connection = transaction.get_connection(using)
+    deletion = CoverDeletion(name, derivatives or {}, get_cover_deletion_group(connection))
+
+    # Runs right away outside a transaction, and is dropped with the
+    # savepoint or transaction that queued it when those roll back.
+    transaction.on_commit(deletion, using=using)
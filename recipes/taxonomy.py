@@ -0,0 +1,118 @@
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from recipes.models import Category
+from tag.models import Tag
+
+TAXONOMY_VERSION_KEY = 'taxonomy_version'
+
+_taxonomy = None
+_lock = threading.Lock()
+
+
+class Taxonomy:
+    def __init__(self, version, categories, tags):
+        self.version = version
+        self.category_names = dict(categories)
+        self.tag_names = {}
+        self.tag_slugs = {}
+        self.tag_ids = {}
+
+        for tag_id, name, slug in tags:
+            self.tag_names[tag_id] = name
+            self.tag_slugs[tag_id] = slug
+            self.tag_ids[slug] = tag_id
+
+    def get_category_name(self, category_id):
+        try:
+            return self.category_names.get(int(category_id))
+        except (TypeError, ValueError):
+            return None
+
+    def get_tag(self, tag_id):
+        if tag_id not in self.tag_names:
+            return None
+
+        return {'id': tag_id, 'name': self.tag_names[tag_id], 'slug': self.tag_slugs[tag_id]}
+
+
+def get_taxonomy_cache():
+    return caches[settings.TAXONOMY_CACHE_ALIAS]
+
+
+def get_taxonomy_version():
+    cache = get_taxonomy_cache()
+    version = cache.get(TAXONOMY_VERSION_KEY)
+
+    if version is None:
+        # An evicted or restarted cache gets a fresh stamp, so no worker
+        # keeps serving the maps it loaded before.
+        cache.add(TAXONOMY_VERSION_KEY, uuid.uuid4().hex, None)
+        version = cache.get(TAXONOMY_VERSION_KEY)
+
+    return version
+
+
+async def aget_taxonomy_version():
+    cache = get_taxonomy_cache()
+    version = await cache.aget(TAXONOMY_VERSION_KEY)
+
+    if version is None:
+        await cache.aadd(TAXONOMY_VERSION_KEY, uuid.uuid4().hex, None)
+        version = await cache.aget(TAXONOMY_VERSION_KEY)
+
+    return version
+
+
+def bump_taxonomy_version(using=None):
+    cache = get_taxonomy_cache()
+    cache.set(TAXONOMY_VERSION_KEY, uuid.uuid4().hex, None)
+
+    # A worker that reloads before the commit would store the old rows
+    # under the new stamp, so the stamp moves again once they are visible.
+    transaction.on_commit(
+        lambda: cache.set(TAXONOMY_VERSION_KEY, uuid.uuid4().hex, None), using=using
+    )
+
+
+def set_taxonomy(version, categories, tags):
+    global _taxonomy
+
+    with _lock:
+        if _taxonomy is None or _taxonomy.version != version:
+            _taxonomy = Taxonomy(version, categories, tags)
+
+        return _taxonomy
+
+
+def get_taxonomy():
+    version = get_taxonomy_version()
+    taxonomy = _taxonomy
+
+    if taxonomy is not None and taxonomy.version == version:
+        return taxonomy
+
+    # A lagging replica would pin its old rows to the fresh stamp
+    return set_taxonomy(
+        version,
+        Category.objects.using(DEFAULT_DB_ALIAS).values_list('id', 'name'),
+        Tag.objects.using(DEFAULT_DB_ALIAS).values_list('id', 'name', 'slug'),
+    )
+
+
+async def aget_taxonomy():
+    version = await aget_taxonomy_version()
+    taxonomy = _taxonomy
+
+    if taxonomy is not None and taxonomy.version == version:
+        return taxonomy
+
+    return set_taxonomy(
+        version,
+        [row async for row in Category.objects.using(DEFAULT_DB_ALIAS).values_list('id', 'name')],
+        [row async for row in Tag.objects.using(DEFAULT_DB_ALIAS).values_list('id', 'name', 'slug')],
+    )
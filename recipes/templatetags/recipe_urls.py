@@ -0,0 +1,10 @@
+from django import template
+
+from utils.url_builders import build_url
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def fast_url(context, viewname, value):
+    return build_url(viewname, value, context.get('request'))
@@ -4,6 +4,7 @@ from django.urls import reverse
 from rest_framework import test
 
 from recipes.tests.test_recipe_base import RecipeMixin
+from tag.models import Tag
 
 
 class RecipeAPIv2TextMixin(RecipeMixin):
@@ -88,6 +89,33 @@ class RecipeAPIv2Test(test.APITestCase, RecipeAPIv2TextMixin):
             9
         )
 
+    def test_recipe_api_list_links_tags_with_absolute_urls(self):
+        recipe = self.make_recipe()
+        tag = Tag.objects.create(name='Linked tag')
+        recipe.tags.add(tag)
+
+        response = self.get_recipe_api_list()
+
+        self.assertEqual(
+            response.data['results'][0]['tag_links'],
+            ['http://testserver' + reverse('recipes:recipe_api_v2_tag', args=(tag.pk,))],
+        )
+
+    @patch('recipes.views.api.RecipeAPIv2CursorPagination.page_size', new=2)
+    def test_recipe_api_list_cursor_pagination_walks_all_recipes(self):
+        recipes = self.make_recipe_in_batch(qtd=5)
+        expected_ids = sorted((recipe.id for recipe in recipes), reverse=True)
+        seen_ids = []
+        api_url = reverse('recipes:recipes-api-list') + '?pagination=cursor'
+
+        while api_url:
+            response = self.client.get(api_url)
+            self.assertNotIn('count', response.data)
+            seen_ids += [recipe['id'] for recipe in response.data.get('results')]
+            api_url = response.data.get('next')
+
+        self.assertEqual(expected_ids, seen_ids)
+
     def test_recipe_api_list_user_must_send_jwt_token_to_create_recipe(self):
         api_url = self.get_recipe_reverse_url()
         response = self.client.post(api_url)
@@ -0,0 +1,106 @@
+from django.urls import reverse
+from rest_framework import test
+
+from recipes.models import Recipe
+from recipes.taxonomy import get_taxonomy
+from tag.models import Tag
+from .test_recipe_base import RecipeMixin
+
+
+class RecipeAPIv2BatchTest(test.APITestCase, RecipeMixin):
+    def setUp(self):
+        self.recipes = self.make_recipe_in_batch(4)
+        self.recipes[0].tags.add(Tag.objects.create(name='Batch tag'))
+        Recipe.objects.filter(pk=self.recipes[3].pk).update(is_published=False)
+        get_taxonomy()
+        return super().setUp()
+
+    def get_ids_url(self, ids, extra=''):
+        return reverse('recipes:recipes-api-list') + f'?ids={ids}{extra}'
+
+    def test_returns_recipes_in_request_order(self):
+        first, second, third = (recipe.pk for recipe in self.recipes[:3])
+        response = self.client.get(self.get_ids_url(f'{third},{first},{second}'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([recipe['id'] for recipe in response.data['results']], [third, first, second])
+        self.assertEqual(response.data['missing'], [])
+
+    def test_matches_the_detail_endpoint(self):
+        pk = self.recipes[0].pk
+        detail = self.client.get(reverse('recipes:recipes-api-detail', args=(pk,)))
+        batch = self.client.get(self.get_ids_url(pk))
+
+        self.assertEqual(batch.json()['results'], [detail.json()])
+
+    def test_reports_missing_and_unpublished_ids(self):
+        pk = self.recipes[0].pk
+        response = self.client.get(self.get_ids_url(f'{pk},{self.recipes[3].pk},9999'))
+
+        self.assertEqual([recipe['id'] for recipe in response.data['results']], [pk])
+        self.assertEqual(response.data['missing'], [self.recipes[3].pk, 9999])
+
+    def test_runs_one_query_plus_one_for_tags(self):
+        ids = ','.join(str(recipe.pk) for recipe in self.recipes)
+
+        with self.assertNumQueries(2):
+            self.client.get(self.get_ids_url(ids))
+
+    def test_sparse_fields_without_tags_run_one_query(self):
+        ids = ','.join(str(recipe.pk) for recipe in self.recipes)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.get_ids_url(ids, '&fields=id,title'))
+
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+
+    def test_repeated_ids_come_back_once(self):
+        pk = self.recipes[0].pk
+        response = self.client.get(self.get_ids_url(f'{pk},{pk}'))
+
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_invalid_ids_return_400(self):
+        for ids in ('', '1,abc', '-1'):
+            with self.subTest(ids=ids):
+                response = self.client.get(self.get_ids_url(ids))
+
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('ids', response.data)
+
+    def test_query_string_is_limited(self):
+        ids = ','.join(str(pk) for pk in range(1, 102))
+        response = self.client.get(self.get_ids_url(ids))
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_post_body_accepts_larger_sets_anonymously(self):
+        ids = [recipe.pk for recipe in reversed(self.recipes[:3])] + list(range(1000, 1200))
+        response = self.client.post(
+            reverse('recipes:recipes-api-batch'), {'ids': ids}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [recipe['id'] for recipe in response.data['results']],
+            [recipe.pk for recipe in reversed(self.recipes[:3])],
+        )
+        self.assertEqual(len(response.data['missing']), 200)
+
+    def test_post_body_must_hold_ids(self):
+        response = self.client.post(reverse('recipes:recipes-api-batch'), [1, 2], format='json')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_rejects_ids_too_large_for_the_database(self):
+        too_large = str(2 ** 63)
+        get = self.client.get(self.get_ids_url(f'{self.recipes[0].pk},{too_large}'))
+        post = self.client.post(
+            reverse('recipes:recipes-api-batch'),
+            {'ids': [self.recipes[0].pk, int(too_large)]},
+            format='json',
+        )
+
+        for response in (get, post):
+            self.assertEqual(response.status_code, 400)
+            self.assertIn(too_large, str(response.data['ids']))
@@ -0,0 +1,65 @@
+import json
+
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework import test
+from rest_framework.renderers import JSONRenderer
+
+from recipes.models import Recipe
+from recipes.serializers import RecipeProjection, RecipeSerializer
+from tag.models import Tag
+from .test_recipe_base import RecipeMixin
+
+
+class RecipeAPIv2ProjectionTest(test.APITestCase, RecipeMixin):
+    def setUp(self):
+        self.recipes = self.make_recipe_in_batch(4)
+        tags = [Tag.objects.create(name=f'Projection tag {i}') for i in range(3)]
+
+        self.recipes[0].tags.add(*tags)
+        self.recipes[1].tags.add(tags[1])
+
+        # Covers are stored names; the URL doesn't need the file to exist
+        Recipe.objects.filter(pk=self.recipes[2].pk).update(cover='recipes/covers/projection.jpg')
+        Recipe.objects.filter(pk=self.recipes[3].pk).update(category=None)
+        return super().setUp()
+
+    def serialize(self, queryset):
+        request = RequestFactory().get('/')
+        data = RecipeSerializer(queryset, many=True, context={'request': request}).data
+        return json.loads(JSONRenderer().render(data))
+
+    def test_projection_matches_the_serializer(self):
+        queryset = Recipe.objects.get_published()
+        request = RequestFactory().get('/')
+        projection = RecipeProjection(context={'request': request})
+
+        projected = json.loads(
+            JSONRenderer().render(projection.to_representation(projection.project(queryset)))
+        )
+
+        self.assertEqual(projected, self.serialize(queryset))
+
+    def test_list_endpoint_returns_the_serializer_output(self):
+        response = self.client.get(reverse('recipes:recipes-api-list'))
+
+        self.assertEqual(
+            response.json()['results'],
+            self.serialize(Recipe.objects.get_published()[:10]),
+        )
+
+    def test_cursor_pages_return_the_serializer_output(self):
+        response = self.client.get(reverse('recipes:recipes-api-list') + '?pagination=cursor')
+
+        self.assertEqual(
+            response.json()['results'],
+            self.serialize(Recipe.objects.get_published()[:10]),
+        )
+
+    def test_projection_runs_two_queries_for_a_page(self):
+        queryset = Recipe.objects.get_published()
+        projection = RecipeProjection()
+        projection.to_representation([])
+
+        with self.assertNumQueries(2):
+            projection.to_representation(projection.project(queryset))
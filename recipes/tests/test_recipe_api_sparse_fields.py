@@ -0,0 +1,73 @@
+from django.urls import reverse
+from rest_framework import test
+
+from recipes.taxonomy import get_taxonomy
+from tag.models import Tag
+from utils.query_stats import QueryBudgetMixin
+from .test_recipe_base import RecipeMixin
+
+
+class RecipeAPIv2SparseFieldsTest(test.APITestCase, RecipeMixin, QueryBudgetMixin):
+    def setUp(self):
+        self.recipe = self.make_recipe()
+        self.recipe.tags.add(Tag.objects.create(name='Sparse tag'))
+        get_taxonomy()
+        return super().setUp()
+
+    def test_list_returns_only_the_requested_fields(self):
+        url = reverse('recipes:recipes-api-list') + '?fields=id,title,cover,preparation'
+        response = self.client.get(url)
+
+        self.assertEqual(
+            response.data['results'],
+            [{
+                'id': self.recipe.pk,
+                'title': self.recipe.title,
+                'preparation': '10 Minutos',
+                'cover': None,
+            }],
+        )
+
+    def test_list_without_tag_fields_skips_the_tags_query(self):
+        url = reverse('recipes:recipes-api-list') + '?fields=id,title'
+
+        with self.assertNumQueries(3):
+            # Validators, page count and the page itself
+            self.client.get(url)
+
+    def test_list_with_tag_fields_loads_tags(self):
+        url = reverse('recipes:recipes-api-list') + '?fields=id,tag_objects'
+        response = self.client.get(url)
+
+        self.assertEqual(response.data['results'][0]['tag_objects'][0]['name'], 'Sparse tag')
+
+    def test_exclude_drops_fields(self):
+        url = reverse('recipes:recipes-api-list') + '?exclude=preparation_steps,tag_objects'
+        result = self.client.get(url).data['results'][0]
+
+        self.assertNotIn('preparation_steps', result)
+        self.assertNotIn('tag_objects', result)
+        self.assertIn('tag_links', result)
+
+    def test_detail_returns_only_the_requested_fields(self):
+        url = reverse('recipes:recipes-api-detail', args=(self.recipe.pk,)) + '?fields=id,category'
+
+        with self.assertNumQueries(2):
+            # Validators and the recipe; no tags prefetch
+            response = self.client.get(url)
+
+        self.assertEqual(response.data, {'id': self.recipe.pk, 'category': 'Category'})
+
+    def test_detail_defers_unrequested_columns(self):
+        url = reverse('recipes:recipes-api-detail', args=(self.recipe.pk,)) + '?fields=title'
+
+        with self.assertQueryBudget(2) as stats:
+            self.client.get(url)
+
+        self.assertNotIn('preparation_steps', stats[-1]['sql'])
+
+    def test_unknown_fields_return_400(self):
+        response = self.client.get(reverse('recipes:recipes-api-list') + '?fields=id,secret')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('secret', str(response.data['fields']))
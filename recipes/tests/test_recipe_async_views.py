@@ -0,0 +1,100 @@
+from django.test import override_settings
+from django.urls import resolve, reverse
+
+from recipes.views import AsyncRecipeDetail, AsyncRecipeListViewHome
+from tag.models import Tag
+from utils.db_router import view_reads_from_replica
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeAsyncViewsTest(RecipeTestBase):
+    def setUp(self):
+        self.recipe = self.make_recipe(title='Async recipe title')
+        return super().setUp()
+
+    def test_views_are_async(self):
+        self.assertTrue(AsyncRecipeListViewHome.view_is_async)
+        self.assertTrue(AsyncRecipeDetail.view_is_async)
+
+    def test_async_views_read_from_replicas(self):
+        urls = [
+            reverse('recipes:async_home'),
+            reverse('recipes:async_search'),
+            reverse('recipes:async_recipe', args=(1,)),
+        ]
+
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertTrue(view_reads_from_replica(resolve(url).func, 'GET'))
+
+    async def test_home_renders_the_sync_template(self):
+        response = await self.async_client.get(reverse('recipes:async_home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'recipes/pages/home.html')
+        self.assertIn('Async recipe title', response.content.decode())
+        self.assertIn('ETag', response.headers)
+
+    async def test_home_returns_304_for_a_matching_etag(self):
+        url = reverse('recipes:async_home')
+        etag = (await self.async_client.get(url)).headers['ETag']
+
+        response = await self.async_client.get(url, headers={'If-None-Match': etag})
+
+        self.assertEqual(response.status_code, 304)
+
+    async def test_category_lists_its_recipes(self):
+        url = reverse('recipes:async_category', args=(self.recipe.category_id,))
+        response = await self.async_client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Async recipe title', response.content.decode())
+
+    async def test_empty_category_returns_404(self):
+        response = await self.async_client.get(reverse('recipes:async_category', args=(1000,)))
+
+        self.assertEqual(response.status_code, 404)
+
+    async def test_search_finds_recipes(self):
+        url = reverse('recipes:async_search') + '?q=async'
+        response = await self.async_client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Async recipe title', response.content.decode())
+
+    async def test_search_without_a_term_returns_404(self):
+        response = await self.async_client.get(reverse('recipes:async_search'))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_tag_lists_its_recipes(self):
+        tag = Tag.objects.create(name='Async tag')
+        self.recipe.tags.add(tag)
+
+        response = self.client.get(reverse('recipes:async_tag', args=(tag.slug,)))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Async recipe title', response.content.decode())
+        self.assertIn('Async tag - Tag |', response.content.decode())
+
+    async def test_detail_renders_a_published_recipe(self):
+        url = reverse('recipes:async_recipe', args=(self.recipe.pk,))
+        response = await self.async_client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'recipes/pages/recipe-view.html')
+        self.assertTrue(response.context['is_detail_page'])
+
+    def test_detail_hides_unpublished_recipes(self):
+        self.recipe.is_published = False
+        self.recipe.save()
+
+        response = self.client.get(reverse('recipes:async_recipe', args=(self.recipe.pk,)))
+
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(QUERY_STATS_HEADER=True)
+    async def test_query_stats_count_async_queries(self):
+        response = await self.async_client.get(reverse('recipes:async_home'))
+
+        self.assertNotIn('count=0;', response.headers['X-Query-Stats'])
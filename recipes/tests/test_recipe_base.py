@@ -1,3 +1,4 @@
+from django.core.cache import caches
 from django.test import TestCase
 from recipes.models import Category, Recipe, User
 
@@ -72,4 +73,7 @@ class RecipeMixin:
 
 class RecipeTestBase(TestCase, RecipeMixin):
     def setUp(self) -> None:
+        # Cached pages outlive the rolled back rows of the previous test
+        for cache in caches.all():
+            cache.clear()
         return super().setUp()
\ No newline at end of file
@@ -0,0 +1,111 @@
+import gzip
+import json
+import zlib
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+
+from recipes.taxonomy import get_taxonomy
+from .test_recipe_base import RecipeTestBase
+
+
+# The page cache would answer repeat hits before the compressed cache
+@override_settings(PAGE_CACHE_TIMEOUT=0)
+class RecipeCompressionTest(RecipeTestBase):
+    def setUp(self):
+        cache.clear()
+        self.make_recipe_in_batch(3)
+        get_taxonomy()
+        return super().setUp()
+
+    def test_home_is_gzipped_when_accepted(self):
+        plain = self.client.get(reverse('recipes:home'))
+        response = self.client.get(reverse('recipes:home'), HTTP_ACCEPT_ENCODING='gzip, deflate')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertTrue(response['ETag'].startswith('W/"'))
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content))
+
+    def test_api_list_is_deflated_when_preferred(self):
+        response = self.client.get(
+            reverse('recipes:recipes-api-list'), HTTP_ACCEPT_ENCODING='gzip;q=0.5, deflate'
+        )
+
+        self.assertEqual(response['Content-Encoding'], 'deflate')
+        self.assertEqual(len(json.loads(zlib.decompress(response.content))['results']), 3)
+
+    def test_identity_clients_get_plain_bodies(self):
+        response = self.client.get(reverse('recipes:home'))
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    @override_settings(COMPRESSION_MIN_SIZE=10 ** 7)
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get(reverse('recipes:home'), HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_repeat_hits_skip_rendering_and_compression(self):
+        url = reverse('recipes:home')
+        first = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+
+        with self.assertNumQueries(2):
+            # Only the published counter and the validators run
+            second = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertFalse(second.templates)
+
+    def test_conditional_requests_match_the_weak_etag(self):
+        url = reverse('recipes:recipes-api-list')
+        first = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        response = self.client.get(
+            url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=first['ETag']
+        )
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_changes_miss_the_compressed_cache(self):
+        url = reverse('recipes:home')
+        self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.make_recipe(
+            title='Fresh compressed recipe', slug='fresh-compressed',
+            author_data={'username': 'fresh'},
+        )
+
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertIn(b'Fresh compressed recipe', gzip.decompress(response.content))
+
+    @override_settings(COMPRESSION_CACHE_TIMEOUT=0)
+    def test_cache_can_be_disabled(self):
+        url = reverse('recipes:home')
+        self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertTrue(response.templates)
+
+    def test_pages_with_a_csrf_token_are_not_cached(self):
+        self.make_author(username='compressed', password='Password-1')
+        self.client.login(username='compressed', password='Password-1')
+        url = reverse('recipes:home')
+        self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertTrue(response.templates)
+
+    def test_async_home_serves_the_compressed_cache(self):
+        url = reverse('recipes:async_home')
+        first = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        second = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(first['Content-Encoding'], 'gzip')
+        self.assertTrue(first.templates)
+        self.assertFalse(second.templates)
+        self.assertEqual(second.content, first.content)
@@ -0,0 +1,130 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import test
+from tag.models import Tag
+
+from .test_recipe_base import RecipeMixin, RecipeTestBase
+
+
+class RecipeConditionalGetTest(RecipeTestBase):
+    def test_list_pages_send_validators(self):
+        self.make_recipe()
+
+        response = self.client.get(reverse('recipes:home'))
+
+        self.assertIn('ETag', response.headers)
+        self.assertIn('Last-Modified', response.headers)
+
+    @override_settings(PAGE_CACHE_TIMEOUT=0)
+    def test_list_page_returns_304_before_rendering(self):
+        self.make_recipe()
+        etag = self.client.get(reverse('recipes:home')).headers['ETag']
+
+        with self.assertNumQueries(2):
+            # MAX(updated_at) and the published counter
+            response = self.client.get(reverse('recipes:home'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+    def test_list_page_validator_changes_when_a_recipe_changes(self):
+        recipe = self.make_recipe()
+        etag = self.client.get(reverse('recipes:home')).headers['ETag']
+
+        recipe.title = 'Changed title'
+        recipe.save()
+        response = self.client.get(reverse('recipes:home'), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers['ETag'], etag)
+
+    def test_list_page_validator_changes_with_page_number(self):
+        self.make_recipe()
+
+        first = self.client.get(reverse('recipes:home'))
+        second = self.client.get(reverse('recipes:home') + '?page=2')
+
+        self.assertNotEqual(first.headers['ETag'], second.headers['ETag'])
+
+    def test_detail_page_returns_304_when_not_modified(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe', args=(recipe.pk,))
+        response = self.client.get(url)
+
+        not_modified = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response.headers['Last-Modified']
+        )
+
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_detail_page_validator_changes_when_tags_change(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe', args=(recipe.pk,))
+        etag = self.client.get(url).headers['ETag']
+
+        recipe.tags.add(Tag.objects.create(name='New tag'))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'New tag')
+
+    def test_detail_page_of_unknown_recipe_is_still_404(self):
+        response = self.client.get(
+            reverse('recipes:recipe', args=(1000,)), HTTP_IF_NONE_MATCH='*'
+        )
+
+        self.assertEqual(response.status_code, 404)
+
+
+class RecipeAPIv2ConditionalGetTest(test.APITestCase, RecipeMixin):
+    def test_api_list_returns_304_when_not_modified(self):
+        self.make_recipe()
+        url = reverse('recipes:recipes-api-list')
+        etag = self.client.get(url).headers['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_api_detail_validator_changes_when_a_tag_lists_the_recipe(self):
+        recipe = self.make_recipe()
+        tag = Tag.objects.create(name='New tag')
+        url = reverse('recipes:recipes-api-detail', args=(recipe.pk,))
+        etag = self.client.get(url).headers['ETag']
+
+        tag.recipe_set.add(recipe)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['tags'], [tag.pk])
+
+    def test_api_list_validator_changes_when_a_recipe_is_deleted(self):
+        recipes = self.make_recipe_in_batch(2)
+        url = reverse('recipes:recipes-api-list')
+        etag = self.client.get(url).headers['ETag']
+
+        recipes[0].delete()
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_api_detail_returns_304_when_not_modified(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipes-api-detail', args=(recipe.pk,))
+        etag = self.client.get(url).headers['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_api_detail_validator_changes_when_a_tag_lists_the_recipe(self):
+        recipe = self.make_recipe()
+        tag = Tag.objects.create(name='New tag')
+        url = reverse('recipes:recipes-api-detail', args=(recipe.pk,))
+        etag = self.client.get(url).headers['ETag']
+
+        tag.recipe_set.add(recipe)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['tags'], [tag.pk])
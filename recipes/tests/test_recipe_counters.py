@@ -0,0 +1,122 @@
+from django.urls import reverse
+
+from recipes.counters import ALL, CATEGORY, TAG, get_published_count, rebuild_counters
+from recipes.models import PublishedRecipeCounter
+from tag.models import Tag
+from .test_recipe_base import RecipeTestBase
+
+
+class PublishedRecipeCounterTest(RecipeTestBase):
+    def get_counts(self):
+        return dict(
+            ((counter.scope, counter.object_id), counter.count)
+            for counter in PublishedRecipeCounter.objects.all()
+        )
+
+    def assertCountersAreExact(self):
+        incremental = {key: count for key, count in self.get_counts().items() if count}
+        rebuild_counters()
+        rebuilt = {key: count for key, count in self.get_counts().items() if count}
+        self.assertEqual(incremental, rebuilt)
+
+    def test_removing_tags_without_counter_rows_counts_them_once(self):
+        recipes = self.make_recipe_in_batch(3)
+        tag = Tag.objects.create(name='Tag')
+        recipes[0].tags.add(tag)
+        tag.recipe_set.add(recipes[1], recipes[2])
+        PublishedRecipeCounter.objects.all().delete()
+
+        recipes[0].tags.remove(tag)
+
+        self.assertEqual(get_published_count(TAG, tag.pk), 2)
+
+        PublishedRecipeCounter.objects.all().delete()
+        tag.recipe_set.clear()
+
+        self.assertEqual(get_published_count(TAG, tag.pk), 0)
+
+    def test_publishing_and_unpublishing_updates_counters(self):
+        recipe = self.make_recipe()
+        recipe.tags.add(Tag.objects.create(name='Tag'))
+
+        self.assertEqual(get_published_count(ALL), 1)
+        self.assertEqual(get_published_count(CATEGORY, recipe.category_id), 1)
+
+        recipe.is_published = False
+        recipe.save()
+
+        self.assertEqual(get_published_count(ALL), 0)
+        self.assertEqual(get_published_count(CATEGORY, recipe.category_id), 0)
+        self.assertEqual(get_published_count(TAG, recipe.tags.get().pk), 0)
+        self.assertCountersAreExact()
+
+    def test_moving_a_recipe_to_another_category_moves_its_count(self):
+        recipe = self.make_recipe()
+        old_category = recipe.category
+        recipe.category = self.make_category(name='Other')
+        recipe.save()
+
+        self.assertEqual(get_published_count(CATEGORY, old_category.pk), 0)
+        self.assertEqual(get_published_count(CATEGORY, recipe.category_id), 1)
+        self.assertCountersAreExact()
+
+    def test_tag_changes_update_tag_counters(self):
+        recipes = self.make_recipe_in_batch(3)
+        tag = Tag.objects.create(name='Tag')
+        other_tag = Tag.objects.create(name='Other tag')
+
+        recipes[0].tags.add(tag, other_tag)
+        recipes[0].tags.add(tag)
+        tag.recipe_set.add(recipes[1], recipes[2])
+
+        self.assertEqual(get_published_count(TAG, tag.pk), 3)
+        self.assertEqual(get_published_count(TAG, other_tag.pk), 1)
+
+        recipes[0].tags.remove(tag)
+        tag.recipe_set.remove(recipes[1])
+        recipes[0].tags.clear()
+
+        self.assertEqual(get_published_count(TAG, tag.pk), 1)
+        self.assertEqual(get_published_count(TAG, other_tag.pk), 0)
+        self.assertCountersAreExact()
+
+    def test_unpublished_recipes_do_not_change_tag_counters(self):
+        recipe = self.make_recipe(is_published=False)
+        tag = Tag.objects.create(name='Tag')
+        recipe.tags.add(tag)
+
+        self.assertEqual(get_published_count(TAG, tag.pk), 0)
+
+    def test_deleting_recipes_updates_counters(self):
+        recipes = self.make_recipe_in_batch(2)
+        tag = Tag.objects.create(name='Tag')
+        recipes[0].tags.add(tag)
+
+        recipes[0].delete()
+
+        self.assertEqual(get_published_count(ALL), 1)
+        self.assertEqual(get_published_count(TAG, tag.pk), 0)
+        self.assertCountersAreExact()
+
+    def test_list_pages_read_totals_from_counters(self):
+        self.make_recipe_in_batch(3)
+
+        with self.assertNumQueries(4):
+            # validators, counter, recipes with authors and profiles, tags prefetch
+            response = self.client.get(reverse('recipes:home'))
+
+        self.assertEqual(response.context['recipes'].paginator.count, 3)
+
+    def test_category_and_tag_listings_show_counts(self):
+        recipes = self.make_recipe_in_batch(2)
+        tag = Tag.objects.create(name='Tag')
+        recipes[1].tags.add(tag)
+        self.make_recipe(
+            slug='hidden', author_data={'username': 'hidden'}, is_published=False
+        )
+
+        categories = self.client.get(reverse('recipes:recipe_api_v2_categories')).data
+        tags = self.client.get(reverse('recipes:recipe_api_v2_tags')).data
+
+        self.assertEqual([category['recipe_count'] for category in categories], [1, 1])
+        self.assertEqual(tags, [{'id': tag.pk, 'name': 'Tag', 'slug': tag.slug, 'recipe_count': 1}])
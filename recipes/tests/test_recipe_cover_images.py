@@ -0,0 +1,210 @@
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+
+from recipes.models import Recipe
+from recipes.tasks import enqueue_cover_deletion, process_recipe_cover
+from .test_recipe_base import RecipeTestBase
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def make_image_file(name='cover.png', size=(1000, 500)):
+    buffer = BytesIO()
+    Image.new('RGB', size, color='orange').save(buffer, format='PNG')
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type='image/png')
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    RECIPE_COVER_WIDTHS=[320, 800],
+    RECIPE_COVER_PROCESSING='sync',
+    PAGE_CACHE_TIMEOUT=0,
+)
+class RecipeCoverImagesTest(RecipeTestBase):
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def make_recipe_with_cover(self, size=(1000, 500), **kwargs):
+        recipe = self.make_recipe(**kwargs)
+        recipe.cover = make_image_file(size=size)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            recipe.save()
+
+        recipe.refresh_from_db()
+        return recipe
+
+    def test_saving_a_cover_does_not_resize_it_inside_the_request(self):
+        recipe = self.make_recipe()
+        recipe.cover = make_image_file()
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            recipe.save()
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(Image.open(recipe.cover.path).size, (1000, 500))
+        self.assertFalse(recipe.has_cover_derivatives())
+
+    def test_cover_processing_creates_webp_and_jpeg_widths(self):
+        recipe = self.make_recipe_with_cover()
+
+        self.assertTrue(recipe.has_cover_derivatives())
+        self.assertEqual(recipe.cover_derivatives['webp'], [320, 800])
+        self.assertEqual(recipe.cover_derivatives['jpeg'], [320, 800])
+
+        base, _ = os.path.splitext(recipe.cover.path)
+
+        with Image.open(f'{base}-320w.webp') as image:
+            self.assertEqual(image.size, (320, 160))
+
+        with Image.open(f'{base}-800w.jpg') as image:
+            self.assertEqual(image.size, (800, 400))
+
+    def test_cover_processing_never_upscales(self):
+        recipe = self.make_recipe_with_cover(size=(500, 250))
+
+        self.assertEqual(recipe.cover_derivatives['jpeg'], [320])
+
+    def test_cover_srcset_lists_every_width(self):
+        recipe = self.make_recipe_with_cover()
+        base, _ = os.path.splitext(recipe.cover.url)
+
+        self.assertEqual(
+            recipe.cover_webp_srcset,
+            f'{base}-320w.webp 320w, {base}-800w.webp 800w',
+        )
+        self.assertEqual(recipe.cover_fallback_url, f'{base}-800w.jpg')
+
+    def test_recipe_partial_renders_srcset(self):
+        recipe = self.make_recipe_with_cover()
+
+        response = self.client.get('/')
+        content = response.content.decode('utf-8')
+
+        self.assertIn('type="image/webp"', content)
+        self.assertIn(recipe.cover_jpeg_srcset, content)
+
+    def test_cover_processing_refreshes_cached_cards(self):
+        recipe = self.make_recipe()
+        recipe.cover = make_image_file()
+
+        with self.captureOnCommitCallbacks(execute=False):
+            recipe.save()
+
+        self.assertNotIn('type="image/webp"', self.client.get('/').content.decode('utf-8'))
+
+        process_recipe_cover(recipe.pk)
+
+        self.assertIn('type="image/webp"', self.client.get('/').content.decode('utf-8'))
+
+    @override_settings(PAGE_CACHE_TIMEOUT=600)
+    def test_cover_processing_invalidates_cached_pages(self):
+        recipe = self.make_recipe()
+        recipe.cover = make_image_file()
+
+        with self.captureOnCommitCallbacks(execute=False):
+            recipe.save()
+
+        self.client.get('/')
+        process_recipe_cover(recipe.pk)
+        response = self.client.get('/')
+
+        self.assertEqual(response.headers['X-Page-Cache'], 'miss')
+        self.assertIn('type="image/webp"', response.content.decode('utf-8'))
+
+    def test_stale_derivatives_are_not_used_for_a_new_cover(self):
+        recipe = self.make_recipe_with_cover()
+        Recipe.objects.filter(pk=recipe.pk).update(cover='recipes/covers/other.png')
+        recipe.refresh_from_db()
+
+        self.assertFalse(recipe.has_cover_derivatives())
+        self.assertEqual(recipe.cover_webp_srcset, '')
+
+    def test_process_recipe_cover_ignores_recipes_without_cover(self):
+        recipe = self.make_recipe()
+
+        self.assertIsNone(process_recipe_cover(recipe.pk))
+
+    def test_saving_a_loaded_recipe_does_not_select_it_again(self):
+        recipe = Recipe.objects.get(pk=self.make_recipe().pk)
+        recipe.title = 'Changed title'
+
+        with CaptureQueriesContext(connection) as context:
+            recipe.save()
+
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT') and 'FROM "recipes_recipe"' in query['sql']
+        ]
+        self.assertEqual(selects, [])
+
+    def test_replaced_cover_is_deleted_only_after_commit(self):
+        recipe = self.make_recipe_with_cover()
+        old_path = recipe.cover.path
+        old_base, _ = os.path.splitext(old_path)
+        recipe.cover = make_image_file('new-cover.png')
+
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            recipe.save()
+
+        self.assertTrue(os.path.exists(old_path))
+
+        for callback in callbacks:
+            callback()
+
+        self.assertFalse(os.path.exists(old_path))
+        self.assertFalse(os.path.exists(f'{old_base}-320w.webp'))
+        self.assertTrue(os.path.exists(recipe.cover.path))
+
+    def test_rolled_back_delete_keeps_the_cover(self):
+        recipe = self.make_recipe_with_cover()
+        cover_path = recipe.cover.path
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    recipe.delete()
+                    raise IntegrityError
+            except IntegrityError:
+                ...
+
+        self.assertEqual(callbacks, [])
+        self.assertTrue(os.path.exists(cover_path))
+
+    def test_bulk_delete_removes_covers_only_after_commit(self):
+        recipes = [
+            self.make_recipe_with_cover(slug=f'r{i}', author_data={'username': f'u{i}'})
+            for i in range(3)
+        ]
+        cover_paths = [recipe.cover.path for recipe in recipes]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Recipe.objects.filter(pk__in=[recipe.pk for recipe in recipes]).delete()
+
+            for cover_path in cover_paths:
+                self.assertTrue(os.path.exists(cover_path))
+
+        for cover_path in cover_paths:
+            self.assertFalse(os.path.exists(cover_path))
+
+    def test_cover_queued_twice_is_deleted_once(self):
+        recipe = self.make_recipe_with_cover()
+
+        with patch('recipes.images.delete_cover_files') as delete_cover_files:
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                enqueue_cover_deletion(recipe.cover.name)
+                enqueue_cover_deletion(recipe.cover.name)
+
+        self.assertEqual(len(callbacks), 2)
+        delete_cover_files.assert_called_once_with(recipe.cover.name, {})
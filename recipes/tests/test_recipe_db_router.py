@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import resolve, reverse
+
+from recipes.models import Category, Recipe
+from utils.db_router import ReadReplicaMiddleware, read_from_replica, view_reads_from_replica
+from .test_recipe_base import RecipeTestBase
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class RecipeDBRouterTest(RecipeTestBase):
+    def get_response(self, view, method='get', cookies=None):
+        request = getattr(RequestFactory(), method)('/')
+        request.COOKIES.update(cookies or {})
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = ReadReplicaMiddleware(get_response)
+        return middleware(request)
+
+    def make_view(self, write=False):
+        @read_from_replica
+        def view(request):
+            databases = [router.db_for_read(Recipe)]
+
+            if write:
+                databases.append(router.db_for_write(Category))
+                databases.append(router.db_for_read(Recipe))
+
+            return HttpResponse(','.join(databases))
+
+        return view
+
+    def test_public_read_views_opt_in_to_replicas(self):
+        urls = [
+            reverse('recipes:home'),
+            reverse('recipes:search'),
+            reverse('recipes:recipe', args=(1,)),
+            reverse('recipes:recipes-api-list'),
+            reverse('recipes:recipes-api-detail', args=(1,)),
+            reverse('recipes:recipe_api_v2_tag', args=(1,)),
+        ]
+
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertTrue(view_reads_from_replica(resolve(url).func, 'GET'))
+
+    def test_writes_and_private_views_stay_on_the_primary(self):
+        api_list = resolve(reverse('recipes:recipes-api-list')).func
+
+        self.assertFalse(view_reads_from_replica(api_list, 'POST'))
+        self.assertFalse(view_reads_from_replica(resolve(reverse('authors:dashboard')).func, 'GET'))
+
+    def test_safe_requests_read_from_a_replica(self):
+        response = self.get_response(self.make_view())
+
+        self.assertEqual(response.content, b'replica1')
+        self.assertNotIn(settings.DATABASE_PIN_COOKIE, response.cookies)
+
+    def test_unsafe_requests_read_from_the_primary(self):
+        response = self.get_response(self.make_view(), method='post')
+
+        self.assertEqual(response.content, b'default')
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        response = self.get_response(self.make_view(write=True))
+
+        self.assertEqual(response.content, b'replica1,default,default')
+        self.assertEqual(
+            response.cookies[settings.DATABASE_PIN_COOKIE]['max-age'],
+            settings.DATABASE_PIN_SECONDS,
+        )
+
+        response = self.get_response(
+            self.make_view(), cookies={settings.DATABASE_PIN_COOKIE: '1'}
+        )
+        self.assertEqual(response.content, b'default')
+
+    async def test_async_requests_read_from_a_replica(self):
+        view = self.make_view()
+
+        async def get_response(request):
+            await middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = ReadReplicaMiddleware(get_response)
+        response = await middleware(RequestFactory().get('/'))
+
+        self.assertEqual(response.content, b'replica1')
+
+    def test_reads_outside_a_request_use_the_primary(self):
+        self.assertEqual(router.db_for_read(Recipe), 'default')
+
+    @override_settings(DATABASE_REPLICAS=['default'])
+    def test_anonymous_pages_do_not_pin_the_client(self):
+        self.make_recipe()
+
+        response = self.client.get(reverse('recipes:home'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(settings.DATABASE_PIN_COOKIE, response.cookies)
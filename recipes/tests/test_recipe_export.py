@@ -0,0 +1,88 @@
+import json
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from recipes.models import Recipe
+from tag.models import Tag
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeExportTest(RecipeTestBase):
+    def get_export_rows(self, query=''):
+        response = self.client.get(reverse('recipes:recipe_api_v2_export') + query)
+        content = b''.join(response.streaming_content).decode('utf-8')
+        return response, [json.loads(line) for line in content.splitlines()]
+
+    def test_export_streams_one_json_object_per_published_recipe(self):
+        recipes = self.make_recipe_in_batch(3)
+        recipes[0].is_published = False
+        recipes[0].save()
+
+        response, rows = self.get_export_rows()
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertEqual([row['id'] for row in rows], [recipes[1].id, recipes[2].id])
+
+    def test_export_rows_include_tags_category_and_author(self):
+        recipe = self.make_recipe()
+        tag = Tag.objects.create(name='Tag')
+        recipe.tags.add(tag)
+
+        _, rows = self.get_export_rows()
+
+        self.assertEqual(rows[0]['tags'], [{'id': tag.id, 'name': 'Tag', 'slug': tag.slug}])
+        self.assertEqual(rows[0]['category'], {'id': recipe.category.id, 'name': 'Category'})
+        self.assertEqual(rows[0]['author']['username'], 'username')
+
+    def test_export_since_only_returns_recently_updated_recipes(self):
+        old, new = self.make_recipe_in_batch(2)
+        Recipe.objects.filter(pk=old.pk).update(
+            updated_at=timezone.now() - timedelta(days=10)
+        )
+        since = (timezone.now() - timedelta(days=1)).isoformat()
+
+        _, rows = self.get_export_rows('?since=' + since.replace('+', '%2B'))
+
+        self.assertEqual([row['id'] for row in rows], [new.id])
+
+    def test_export_since_sends_tombstones_for_unpublished_and_deleted_recipes(self):
+        since = timezone.now().isoformat().replace('+', '%2B')
+        unpublished, deleted, kept = self.make_recipe_in_batch(3)
+        unpublished.is_published = False
+        unpublished.save()
+        deleted_id = deleted.id
+        deleted.delete()
+
+        _, rows = self.get_export_rows('?since=' + since)
+
+        self.assertEqual(
+            [(row['id'], row['is_published'], row.get('deleted')) for row in rows],
+            [(unpublished.id, False, False), (kept.id, True, None), (deleted_id, False, True)],
+        )
+        self.assertNotIn('title', rows[0])
+
+    def test_full_export_has_no_tombstones(self):
+        recipes = self.make_recipe_in_batch(2)
+        recipes[0].delete()
+
+        _, rows = self.get_export_rows()
+
+        self.assertEqual([row['id'] for row in rows], [recipes[1].id])
+
+    def test_export_rejects_invalid_since(self):
+        response = self.client.get(reverse('recipes:recipe_api_v2_export') + '?since=yesterday')
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_command_writes_ndjson(self):
+        self.make_recipe_in_batch(2)
+        out = StringIO()
+
+        call_command('export_recipes', stdout=out)
+
+        self.assertEqual(len(out.getvalue().splitlines()), 2)
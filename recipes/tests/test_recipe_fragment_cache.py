@@ -0,0 +1,99 @@
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import translation
+
+from recipes.cache import recipe_fragment_keys
+from tag.models import Tag
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeFragmentCacheTest(RecipeTestBase):
+    def setUp(self):
+        cache.clear()
+        return super().setUp()
+
+    def test_recipe_partial_is_stored_in_the_cache(self):
+        recipe = self.make_recipe()
+
+        self.client.get(reverse('recipes:home'))
+
+        cached = cache.get_many(recipe_fragment_keys(recipe.pk, recipe.updated_at))
+        self.assertEqual(len(cached), 1)
+        self.assertIn(recipe.title, list(cached.values())[0])
+
+    def test_list_and_detail_pages_use_different_fragments(self):
+        recipe = self.make_recipe()
+
+        self.client.get(reverse('recipes:home'))
+        self.client.get(reverse('recipes:recipe', args=(recipe.pk,)))
+
+        cached = cache.get_many(recipe_fragment_keys(recipe.pk, recipe.updated_at))
+        self.assertEqual(len(cached), 2)
+
+    @override_settings(PAGE_CACHE_TIMEOUT=0)
+    def test_warm_list_page_skips_profile_lookups(self):
+        self.make_recipe_in_batch(3)
+        self.client.get(reverse('recipes:home'))
+
+        with self.assertNumQueries(4):
+            # validators, counter, recipes with authors and profiles, tags prefetch; nothing per card
+            self.client.get(reverse('recipes:home'))
+
+    def test_editing_a_recipe_invalidates_its_fragments(self):
+        recipe = self.make_recipe(title='Old recipe title')
+        self.client.get(reverse('recipes:home'))
+        old_keys = recipe_fragment_keys(recipe.pk, recipe.updated_at)
+
+        recipe.title = 'New recipe title'
+        recipe.save()
+
+        self.assertEqual(cache.get_many(old_keys), {})
+        content = self.client.get(reverse('recipes:home')).content.decode('utf-8')
+        self.assertIn('New recipe title', content)
+        self.assertNotIn('Old recipe title', content)
+
+    def test_changing_tags_invalidates_the_detail_fragment(self):
+        recipe = self.make_recipe()
+        url = reverse('recipes:recipe', args=(recipe.pk,))
+        self.client.get(url)
+
+        recipe.tags.add(Tag.objects.create(name='Fresh tag name'))
+
+        self.assertIn('Fresh tag name', self.client.get(url).content.decode('utf-8'))
+
+    def test_renaming_a_category_refreshes_cached_cards(self):
+        recipe = self.make_recipe(category_data={'name': 'Old category name'})
+        self.client.get(reverse('recipes:home'))
+
+        recipe.category.name = 'New category name'
+        recipe.category.save()
+        content = self.client.get(reverse('recipes:home')).content.decode('utf-8')
+
+        self.assertIn('New category name', content)
+        self.assertNotIn('Old category name', content)
+
+    def test_renaming_a_tag_refreshes_the_detail_fragment(self):
+        recipe = self.make_recipe()
+        tag = Tag.objects.create(name='Old tag name')
+        recipe.tags.add(tag)
+        url = reverse('recipes:recipe', args=(recipe.pk,))
+        self.client.get(url)
+
+        tag.name = 'New tag name'
+        tag.save()
+        content = self.client.get(url).content.decode('utf-8')
+
+        self.assertIn('New tag name', content)
+        self.assertNotIn('Old tag name', content)
+
+    def test_fragments_are_kept_per_language(self):
+        self.make_recipe()
+
+        with translation.override('pt-br'):
+            portuguese = self.client.get(reverse('recipes:home'), HTTP_ACCEPT_LANGUAGE='pt-br')
+
+        english = self.client.get(reverse('recipes:home'), HTTP_ACCEPT_LANGUAGE='en')
+
+        self.assertIn('Preparo', portuguese.content.decode('utf-8'))
+        self.assertIn('Preparation', english.content.decode('utf-8'))
@@ -68,3 +68,44 @@ class RecipeHomeViewsTest(RecipeTestBase):
             
        
     
+
+    def test_recipe_home_cursor_pagination_walks_all_recipes(self):
+        recipes = self.make_recipe_in_batch(7)
+        expected_ids = sorted((recipe.id for recipe in recipes), reverse=True)
+        seen_ids = []
+        url = reverse('recipes:home') + '?cursor='
+
+        with patch('recipes.views.site.PER_PAGE', new=3):
+            while url:
+                response = self.client.get(url)
+                page = response.context['recipes']
+                seen_ids += [recipe.id for recipe in page]
+                next_cursor = response.context['pagination_range']['next_cursor']
+                url = f'{reverse("recipes:home")}?cursor={next_cursor}' if next_cursor else None
+
+            self.assertEqual(expected_ids, seen_ids)
+
+    def test_recipe_home_cursor_pagination_can_go_back(self):
+        self.make_recipe_in_batch(6)
+
+        with patch('recipes.views.site.PER_PAGE', new=3):
+            first = self.client.get(reverse('recipes:home') + '?cursor=')
+            next_cursor = first.context['pagination_range']['next_cursor']
+            second = self.client.get(reverse('recipes:home') + f'?cursor={next_cursor}')
+            previous_cursor = second.context['pagination_range']['previous_cursor']
+            back = self.client.get(reverse('recipes:home') + f'?cursor={previous_cursor}')
+
+            self.assertEqual(
+                [recipe.id for recipe in first.context['recipes']],
+                [recipe.id for recipe in back.context['recipes']],
+            )
+            self.assertIsNone(back.context['pagination_range']['previous_cursor'])
+
+    def test_recipe_home_cursor_pagination_skips_count(self):
+        self.make_recipe_in_batch(3)
+
+        with patch('recipes.views.site.PER_PAGE', new=2):
+            response = self.client.get(reverse('recipes:home') + '?cursor=')
+
+        self.assertIsNone(response.context['recipes'].count)
+        self.assertTrue(response.context['recipes'].has_next())
@@ -0,0 +1,153 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from authors.models import Profile
+from recipes.counters import ALL, CATEGORY, TAG, get_published_count
+from recipes.models import Category, Recipe
+from tag.models import Tag
+from .test_recipe_base import RecipeTestBase
+
+
+def make_row(title='Imported recipe title', **kwargs):
+    row = {
+        'title': title,
+        'description': 'Imported recipe description',
+        'preparation_time': 10,
+        'preparation_time_unit': 'Minutos',
+        'servings': 4,
+        'servings_unit': 'Porção',
+        'preparation_steps': 'Mix everything together.',
+        'created_at': '2024-01-01T10:00:00',
+        'author': {'first_name': 'Ana', 'last_name': 'Souza'},
+        'category': {'name': 'Massas'},
+        'cover': {'url': 'https://loremflickr.com/800/500/food,cook'},
+    }
+    row.update(kwargs)
+    return row
+
+
+class RecipeImportCommandTest(RecipeTestBase):
+    def run_import(self, rows, *args):
+        with tempfile.NamedTemporaryFile('w', suffix='.jsonl', delete=False) as file:
+            for row in rows:
+                file.write(json.dumps(row) + '\n')
+
+        out, err = StringIO(), StringIO()
+        self.addCleanup(os.remove, file.name)
+        call_command('import_recipes', file.name, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_import_creates_recipes_authors_categories_and_tags(self):
+        rows = [
+            make_row(title=f'Imported recipe {i}', tags=['Quick', {'name': 'Vegan'}])
+            for i in range(5)
+        ]
+
+        out, _ = self.run_import(rows, '--batch-size', '2')
+
+        self.assertIn('Imported 5 recipes', out)
+        self.assertIn('rows/s', out)
+        self.assertEqual(Recipe.objects.filter(is_published=True).count(), 5)
+        self.assertEqual(Category.objects.filter(name='Massas').count(), 1)
+        self.assertEqual(Tag.objects.count(), 2)
+        self.assertEqual(Recipe.tags.through.objects.count(), 10)
+
+        recipe = Recipe.objects.first()
+        self.assertEqual(recipe.author.username, 'import__ana_souza')
+        self.assertTrue(Profile.objects.filter(author=recipe.author).exists())
+        self.assertFalse(recipe.author.has_usable_password())
+
+    def test_import_reuses_existing_rows(self):
+        category = self.make_category(name='Massas')
+        tag = Tag.objects.create(name='Quick', slug='quick')
+
+        self.run_import([make_row(tags=['Quick'])])
+
+        recipe = Recipe.objects.get()
+        self.assertEqual(recipe.category, category)
+        self.assertEqual(list(recipe.tags.all()), [tag])
+
+    def test_import_never_attaches_recipes_to_site_accounts(self):
+        site_author = self.make_author(first_name='Ana', last_name='Souza', username='ana_souza')
+
+        self.run_import([make_row()])
+
+        self.assertEqual(Recipe.objects.filter(author=site_author).count(), 0)
+        self.assertEqual(Recipe.objects.get().author.username, 'import__ana_souza')
+
+    def test_import_rejects_rows_whose_username_is_taken(self):
+        self.make_author(username='import__ana_souza')
+
+        out, err = self.run_import([make_row(), make_row(author={'username': 'joao'})])
+
+        self.assertIn('Imported 1 recipes', out)
+        self.assertIn('Line 1', err)
+        self.assertIn('was not imported', err)
+
+    def test_import_keeps_authors_apart_by_source_and_external_id(self):
+        self.run_import([make_row()], '--source', 'partner-a')
+        self.run_import([
+            make_row(),
+            make_row(author={'id': 7, 'first_name': 'Ana', 'last_name': 'Souza'}),
+            make_row(author={'id': 8, 'first_name': 'Ana', 'last_name': 'Souza'}),
+        ], '--source', 'partner-b')
+
+        self.assertEqual(
+            sorted(Recipe.objects.values_list('author__username', flat=True)),
+            ['partner_a__ana_souza', 'partner_b__7', 'partner_b__8', 'partner_b__ana_souza'],
+        )
+
+    def test_import_skips_invalid_rows_and_reports_them(self):
+        rows = [
+            make_row(),
+            make_row(title='abc'),
+            make_row(title='Another good title', servings=-1),
+            {'title': 'Missing everything'},
+        ]
+
+        out, err = self.run_import(rows)
+
+        self.assertIn('Imported 1 recipes', out)
+        self.assertIn('skipped 3', out)
+        self.assertIn('Line 2', err)
+        self.assertIn('Must have at least 5 chars.', err)
+
+    def test_import_reports_malformed_publish_flags_and_categories(self):
+        rows = [
+            make_row(is_published='yes'),
+            make_row(title='Another good title', category='Massas'),
+            make_row(title='Yet another good title', category={'name': 1}),
+            make_row(title='A last good title', author='Ana Souza'),
+            make_row(title='The imported good title'),
+        ]
+
+        out, err = self.run_import(rows)
+
+        self.assertIn('Imported 1 recipes', out)
+        self.assertIn('skipped 4', out)
+        self.assertIn('Must be true or false.', err)
+        self.assertEqual(err.count('Category needs a name.'), 2)
+        self.assertIn('Author needs a username or a name.', err)
+
+    def test_import_keeps_counters_and_search_index_in_sync(self):
+        self.run_import([make_row(tags=['Quick']), make_row(title='Searchable lasagna')])
+
+        category = Category.objects.get(name='Massas')
+        tag = Tag.objects.get(slug='quick')
+        self.assertEqual(get_published_count(ALL), 2)
+        self.assertEqual(get_published_count(CATEGORY, category.pk), 2)
+        self.assertEqual(get_published_count(TAG, tag.pk), 1)
+
+        response = self.client.get(reverse('recipes:search') + '?q=lasagna')
+        self.assertEqual(len(response.context['recipes']), 1)
+
+    def test_import_can_create_drafts(self):
+        self.run_import([make_row()], '--unpublished')
+
+        self.assertFalse(Recipe.objects.get().is_published)
+        self.assertEqual(get_published_count(ALL), 0)
@@ -0,0 +1,147 @@
+import json
+
+from django.test import override_settings
+from django.urls import reverse
+
+from recipes.checks import check_shared_caches
+from recipes.importer import import_rows
+from utils.benchmark import make_seed_rows
+from tag.models import Tag
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipePageCacheTest(RecipeTestBase):
+    def setUp(self):
+        super().setUp()
+        self.recipe = self.make_recipe(category_data={'name': 'Cached category'})
+        self.other = self.make_recipe(
+            category_data={'name': 'Other category'},
+            author_data={'username': 'other'},
+            slug='other',
+        )
+        self.tag = Tag.objects.create(name='Cached tag')
+        self.recipe.tags.add(self.tag)
+
+        self.home_url = reverse('recipes:home')
+        self.category_url = reverse('recipes:category', args=(self.recipe.category_id,))
+        self.other_category_url = reverse('recipes:category', args=(self.other.category_id,))
+        self.tag_url = reverse('recipes:tag', args=(self.tag.slug,))
+
+    def warm(self, *urls):
+        for url in urls:
+            self.client.get(url)
+
+    def cache_status(self, url, **headers):
+        return self.client.get(url, **headers)['X-Page-Cache']
+
+    def test_repeat_anonymous_hits_skip_the_view(self):
+        with self.assertLogs('utils.query_stats') as logs:
+            first = self.client.get(self.home_url)
+
+            with self.assertNumQueries(0):
+                second = self.client.get(self.home_url)
+
+        self.assertEqual(first['X-Page-Cache'], 'miss')
+        self.assertEqual(second['X-Page-Cache'], 'hit')
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(second['ETag'], first['ETag'])
+        self.assertEqual(
+            [json.loads(line.split(':', 2)[2])['page_cache'] for line in logs.output],
+            ['miss', 'hit'],
+        )
+
+    def test_hits_answer_conditional_requests(self):
+        etag = self.client.get(self.home_url)['ETag']
+        response = self.client.get(self.home_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['X-Page-Cache'], 'hit')
+
+    def test_pages_and_languages_are_cached_separately(self):
+        self.warm(self.home_url)
+
+        self.assertEqual(self.cache_status(self.home_url + '?page=2'), 'miss')
+        self.assertEqual(self.cache_status(self.home_url, HTTP_ACCEPT_LANGUAGE='en'), 'miss')
+        self.assertEqual(self.cache_status(self.home_url), 'hit')
+
+    def test_authenticated_users_bypass_the_cache(self):
+        self.make_author(username='logged', password='Password-1')
+        self.client.login(username='logged', password='Password-1')
+        self.warm(self.home_url)
+
+        response = self.client.get(self.home_url)
+
+        self.assertFalse(response.has_header('X-Page-Cache'))
+        self.assertTrue(response.templates)
+
+    def test_editing_a_recipe_drops_only_its_listings(self):
+        self.warm(self.home_url, self.category_url, self.other_category_url, self.tag_url)
+        self.recipe.title = 'Edited cached recipe'
+        self.recipe.save()
+
+        self.assertEqual(self.cache_status(self.home_url), 'miss')
+        self.assertEqual(self.cache_status(self.category_url), 'miss')
+        self.assertEqual(self.cache_status(self.tag_url), 'miss')
+        self.assertEqual(self.cache_status(self.other_category_url), 'hit')
+        self.assertIn('Edited cached recipe', self.client.get(self.home_url).content.decode())
+
+    def test_unpublishing_drops_the_listings_it_left(self):
+        self.warm(self.home_url, self.category_url)
+        self.recipe.is_published = False
+        self.recipe.save()
+
+        self.assertEqual(self.cache_status(self.home_url), 'miss')
+        self.assertEqual(self.client.get(self.category_url).status_code, 404)
+
+    def test_moving_a_recipe_drops_both_categories(self):
+        self.warm(self.category_url, self.other_category_url)
+        self.recipe.category = self.other.category
+        self.recipe.save()
+
+        self.assertEqual(self.cache_status(self.other_category_url), 'miss')
+
+    def test_retagging_drops_only_tag_pages(self):
+        new_tag = Tag.objects.create(name='New cached tag')
+        new_tag_url = reverse('recipes:tag', args=(new_tag.slug,))
+        self.warm(self.home_url, self.tag_url, new_tag_url)
+
+        self.recipe.tags.remove(self.tag)
+        self.recipe.tags.add(new_tag)
+
+        self.assertEqual(self.cache_status(self.tag_url), 'miss')
+        self.assertEqual(self.cache_status(new_tag_url), 'miss')
+        self.assertEqual(self.cache_status(self.home_url), 'hit')
+
+    def test_renaming_a_category_drops_every_page(self):
+        self.warm(self.home_url, self.tag_url)
+        category = self.recipe.category
+        category.name = 'Renamed cached category'
+        category.save()
+
+        self.assertEqual(self.cache_status(self.home_url), 'miss')
+        self.assertEqual(self.cache_status(self.tag_url), 'miss')
+
+    def test_imports_drop_the_pages(self):
+        self.warm(self.home_url)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            import_rows(make_seed_rows(1))
+
+        self.assertEqual(self.cache_status(self.home_url), 'miss')
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_misses_render_from_the_primary(self):
+        # replica1 has no connection, so a routed read would fail
+        response = self.client.get(self.home_url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Page-Cache'], 'miss')
+
+    def test_page_cache_requires_a_shared_cache(self):
+        self.assertEqual(check_shared_caches(None), [])
+
+        with override_settings(PAGE_CACHE_ALIAS='default'):
+            errors = check_shared_caches(None)
+
+        self.assertEqual([error.id for error in errors], ['recipes.E001'])
+        self.assertIn('PAGE_CACHE_ALIAS', errors[0].msg)
@@ -0,0 +1,91 @@
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import test
+
+from recipes.taxonomy import get_taxonomy
+from tag.models import Tag
+from utils.query_stats import QueryBudgetMixin
+from .test_recipe_base import RecipeMixin
+
+
+class RecipeQueryBudgetTest(test.APITestCase, RecipeMixin, QueryBudgetMixin):
+    def setUp(self):
+        self.recipes = self.make_recipe_in_batch(5)
+        self.tag = Tag.objects.create(name='Budget tag')
+        self.recipe = self.recipes[0]
+
+        for recipe in self.recipes:
+            recipe.tags.add(self.tag, Tag.objects.create(name=f'Tag {recipe.pk}'))
+
+        # Loaded once per process, not per request
+        get_taxonomy()
+        return super().setUp()
+
+    def assertViewBudget(self, url, max_queries):
+        with self.assertQueryBudget(max_queries):
+            response = self.client.get(url)
+
+            if getattr(response, 'streaming', False):
+                b''.join(response.streaming_content)
+
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_home_view_query_budget(self):
+        self.assertViewBudget(reverse('recipes:home'), 4)
+
+    def test_category_view_query_budget(self):
+        self.assertViewBudget(reverse('recipes:category', args=(self.recipe.category_id,)), 4)
+
+    def test_tag_view_query_budget(self):
+        self.assertViewBudget(reverse('recipes:tag', args=(self.tag.slug,)), 4)
+
+    def test_search_view_query_budget(self):
+        self.assertViewBudget(reverse('recipes:search') + '?q=recipe', 4)
+
+    def test_detail_view_query_budget(self):
+        self.assertViewBudget(reverse('recipes:recipe', args=(self.recipe.pk,)), 3)
+
+    def test_theory_view_query_budget(self):
+        self.assertViewBudget(reverse('recipes:theory'), 3)
+
+    def test_api_v1_list_query_budget(self):
+        self.assertViewBudget(reverse('recipes:recipes_api_v1'), 3)
+
+    def test_api_v1_detail_query_budget(self):
+        self.assertViewBudget(reverse('recipes:recipes_api_v1_details', args=(self.recipe.pk,)), 3)
+
+    def test_api_v2_list_query_budget(self):
+        self.assertViewBudget(reverse('recipes:recipes-api-list'), 4)
+
+    def test_api_v2_detail_query_budget(self):
+        self.assertViewBudget(reverse('recipes:recipes-api-detail', args=(self.recipe.pk,)), 3)
+
+    def test_api_v2_tag_query_budget(self):
+        self.assertViewBudget(reverse('recipes:recipe_api_v2_tag', args=(self.tag.pk,)), 0)
+
+    def test_api_v2_category_and_tag_lists_query_budget(self):
+        self.assertViewBudget(reverse('recipes:recipe_api_v2_categories'), 1)
+        self.assertViewBudget(reverse('recipes:recipe_api_v2_tags'), 1)
+
+    def test_api_v2_export_query_budget(self):
+        self.assertViewBudget(reverse('recipes:recipe_api_v2_export'), 2)
+
+    @override_settings(QUERY_STATS_HEADER=True)
+    def test_query_stats_header_is_sent_to_internal_ips(self):
+        response = self.client.get(reverse('recipes:home'))
+
+        self.assertRegex(
+            response['X-Query-Stats'], r'^count=\d+; time_ms=[\d.]+; duplicates=0$'
+        )
+
+    @override_settings(QUERY_STATS_HEADER=True)
+    def test_query_stats_header_is_not_sent_to_other_clients(self):
+        response = self.client.get(reverse('recipes:home'), REMOTE_ADDR='203.0.113.7')
+
+        self.assertNotIn('X-Query-Stats', response.headers)
+
+    def test_query_stats_header_is_off_by_default(self):
+        response = self.client.get(reverse('recipes:home'))
+
+        self.assertNotIn('X-Query-Stats', response.headers)
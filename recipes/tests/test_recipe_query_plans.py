@@ -0,0 +1,92 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import RequestFactory
+from rest_framework.request import Request
+
+from authors.views.all import get_draft_recipes
+from recipes.views.api import RecipeAPIv2ViewSet
+from recipes.views.site import (
+    PER_PAGE,
+    RecipeDetail,
+    RecipeListViewCategory,
+    RecipeListViewHome,
+    RecipeListViewSearch,
+    RecipeListViewTag,
+)
+from tag.models import Tag
+from .test_recipe_base import RecipeTestBase
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite specific')
+class RecipeQueryPlanTest(RecipeTestBase):
+    def setUp(self):
+        self.recipes = self.make_recipe_in_batch(5)
+        self.recipe = self.recipes[0]
+        self.tag = Tag.objects.create(name='Plan tag')
+        self.recipe.tags.add(self.tag)
+        return super().setUp()
+
+    def get_plan(self, queryset):
+        # Lines look like "5 0 0 SCAN recipes_recipe USING INDEX ..."
+        return [line.split(' ', 3)[-1] for line in queryset.explain().splitlines()]
+
+    def assertUsesIndexes(self, queryset, allow_sort=False):
+        plan = self.get_plan(queryset)
+        details = '\n'.join(plan)
+
+        for step in plan:
+            self.assertNotRegex(step, r'^SCAN \S+$', f'Full table scan:\n{details}')
+
+            if not allow_sort:
+                self.assertNotIn('TEMP B-TREE', step, f'Temporary sort:\n{details}')
+
+    def get_site_queryset(self, view_class, url='/', **kwargs):
+        view = view_class()
+        view.setup(RequestFactory().get(url), **kwargs)
+        return view.get_queryset()
+
+    def get_api_queryset(self, url='/'):
+        view = RecipeAPIv2ViewSet()
+        view.request = Request(RequestFactory().get(url))
+        return view.get_queryset()
+
+    def test_site_list_querysets_use_indexes(self):
+        querysets = {
+            'home': self.get_site_queryset(RecipeListViewHome),
+            'category': self.get_site_queryset(
+                RecipeListViewCategory, category_id=self.recipe.category_id
+            ),
+            'tag': self.get_site_queryset(RecipeListViewTag, slug=self.tag.slug),
+        }
+
+        for name, queryset in querysets.items():
+            with self.subTest(name=name):
+                self.assertUsesIndexes(queryset[:PER_PAGE])
+                self.assertUsesIndexes(queryset.filter(id__lt=self.recipe.pk)[:PER_PAGE])
+
+    def test_search_queryset_uses_indexes(self):
+        queryset = self.get_site_queryset(RecipeListViewSearch, '/?q=recipe')
+
+        # Results are sorted by relevance, which no index can provide
+        self.assertUsesIndexes(queryset[:PER_PAGE], allow_sort=True)
+
+    def test_detail_queryset_uses_the_primary_key(self):
+        queryset = self.get_site_queryset(RecipeDetail, pk=self.recipe.pk)
+
+        # get() drops the ordering, like DetailView.get_object does
+        self.assertUsesIndexes(queryset.filter(pk=self.recipe.pk).order_by())
+
+    def test_api_querysets_use_indexes(self):
+        self.assertUsesIndexes(self.get_api_queryset()[:10])
+        self.assertUsesIndexes(
+            self.get_api_queryset(f'/?category_id={self.recipe.category_id}')[:10]
+        )
+        self.assertUsesIndexes(self.get_api_queryset().filter(pk=self.recipe.pk).order_by())
+
+    def test_dashboard_queryset_uses_indexes(self):
+        self.assertUsesIndexes(get_draft_recipes(self.recipe.author))
+
+    def test_check_fails_on_a_full_scan(self):
+        with self.assertRaises(AssertionError):
+            self.assertUsesIndexes(self.get_site_queryset(RecipeListViewHome).order_by('title'))
@@ -1,5 +1,9 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse, resolve
 from recipes import views
+from recipes.models import Recipe
+from recipes.search import search_recipes
 from .test_recipe_base import RecipeTestBase
 from unittest import skip
 
@@ -52,3 +56,75 @@ class RecipeSearchViewsTest(RecipeTestBase):
         self.assertIn(recipe1, response_both.context['recipes'])
         self.assertIn(recipe2, response_both.context['recipes'])
 
+
+    def test_recipe_search_can_find_recipe_by_preparation_steps(self):
+        recipe = self.make_recipe(preparation_steps='Bake with plenty of cinnamon')
+
+        response = self.client.get(reverse('recipes:search') + '?q=cinnamon')
+
+        self.assertIn(recipe, response.context['recipes'])
+
+    def test_recipe_search_ranks_title_matches_first(self):
+        in_description = self.make_recipe(
+            slug='in-description',
+            title='Chocolate cake',
+            description='Goes well with banana',
+            author_data={'username': 'one'},
+        )
+        in_title = self.make_recipe(
+            slug='in-title',
+            title='Banana bread',
+            description='A classic loaf',
+            author_data={'username': 'two'},
+        )
+
+        response = self.client.get(reverse('recipes:search') + '?q=banana')
+        recipes = list(response.context['recipes'])
+
+        self.assertEqual([in_title, in_description], recipes)
+
+    def test_recipe_search_runs_the_match_once_per_query(self):
+        self.make_recipe_in_batch(3)
+        qs = search_recipes(Recipe.objects.filter(is_published=True), 'recipe')
+
+        self.assertEqual(str(qs.query).count(' MATCH '), 1)
+        self.assertEqual(len(qs), 3)
+
+    def test_recipe_search_page_counts_with_the_validator_aggregate(self):
+        self.make_recipe_in_batch(8)
+
+        for url in (reverse('recipes:search'), reverse('recipes:async_search')):
+            with self.subTest(url=url), CaptureQueriesContext(connection) as context:
+                response = self.client.get(url + '?q=recipe&page=2')
+
+            matches = [query for query in context.captured_queries if ' MATCH ' in query['sql']]
+            self.assertEqual(len(matches), 2)
+            self.assertEqual(response.context['recipes'].paginator.count, 8)
+
+    def test_recipe_search_does_not_show_not_published_recipes(self):
+        self.make_recipe(title='Hidden recipe title', is_published=False)
+
+        response = self.client.get(reverse('recipes:search') + '?q=hidden')
+
+        self.assertEqual(len(response.context['recipes']), 0)
+
+    def test_recipe_search_ignores_search_syntax_in_term(self):
+        recipe = self.make_recipe(title='Quick pasta recipe')
+
+        response = self.client.get(reverse('recipes:search') + '?q="pasta" (*')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(recipe, response.context['recipes'])
+
+    def test_recipe_search_index_follows_recipe_updates_and_deletes(self):
+        recipe = self.make_recipe(title='Original title')
+        recipe.title = 'Renamed dish'
+        recipe.save()
+        search_url = reverse('recipes:search')
+
+        self.assertEqual(len(self.client.get(f'{search_url}?q=original').context['recipes']), 0)
+        self.assertIn(recipe, self.client.get(f'{search_url}?q=renamed').context['recipes'])
+
+        recipe.delete()
+
+        self.assertEqual(len(self.client.get(f'{search_url}?q=renamed').context['recipes']), 0)
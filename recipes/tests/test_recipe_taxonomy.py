@@ -0,0 +1,94 @@
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+
+from recipes.taxonomy import TAXONOMY_VERSION_KEY, get_taxonomy, get_taxonomy_cache
+from utils.db_router import ReadReplicaMiddleware, read_from_replica
+from tag.models import Tag
+from .test_recipe_base import RecipeTestBase
+
+
+class RecipeTaxonomyTest(RecipeTestBase):
+    def setUp(self):
+        self.recipe = self.make_recipe(category_data={'name': 'Taxonomy category'})
+        self.tag = Tag.objects.create(name='Taxonomy tag')
+        self.recipe.tags.add(self.tag)
+        return super().setUp()
+
+    def test_maps_are_loaded_once(self):
+        taxonomy = get_taxonomy()
+
+        self.assertEqual(taxonomy.get_category_name(self.recipe.category_id), 'Taxonomy category')
+        self.assertEqual(taxonomy.tag_ids[self.tag.slug], self.tag.pk)
+        self.assertEqual(
+            taxonomy.get_tag(self.tag.pk),
+            {'id': self.tag.pk, 'name': 'Taxonomy tag', 'slug': self.tag.slug},
+        )
+
+        with self.assertNumQueries(0):
+            self.assertIs(get_taxonomy(), taxonomy)
+
+    def test_saving_a_category_reloads_the_maps(self):
+        get_taxonomy()
+        category = self.recipe.category
+        category.name = 'Renamed category'
+        category.save()
+
+        self.assertEqual(get_taxonomy().get_category_name(category.pk), 'Renamed category')
+
+    def test_a_stamp_bumped_by_another_worker_reloads_the_maps(self):
+        taxonomy = get_taxonomy()
+        get_taxonomy_cache().set(TAXONOMY_VERSION_KEY, 'bumped elsewhere', None)
+
+        self.assertIsNot(get_taxonomy(), taxonomy)
+
+    @override_settings(DATABASE_REPLICAS=['replica1'])
+    def test_maps_are_loaded_from_the_primary(self):
+        @read_from_replica
+        def view(request):
+            # replica1 has no connection, so any routed read would fail
+            return HttpResponse(get_taxonomy().get_category_name(self.recipe.category_id))
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        middleware = ReadReplicaMiddleware(get_response)
+        response = middleware(RequestFactory().get('/'))
+
+        self.assertEqual(response.content, b'Taxonomy category')
+
+    def test_deleted_tags_leave_the_maps(self):
+        get_taxonomy()
+        self.tag.delete()
+
+        self.assertNotIn(self.tag.slug, get_taxonomy().tag_ids)
+
+    def test_category_title_comes_from_the_taxonomy(self):
+        response = self.client.get(reverse('recipes:category', args=(self.recipe.category_id,)))
+
+        self.assertIn('<title>Taxonomy category  - ', response.content.decode())
+
+    def test_category_without_published_recipes_returns_404(self):
+        self.recipe.is_published = False
+        self.recipe.save()
+
+        response = self.client.get(reverse('recipes:category', args=(self.recipe.category_id,)))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_missing_category_returns_404(self):
+        response = self.client.get(reverse('recipes:category', args=(1000,)))
+
+        self.assertEqual(response.status_code, 404)
+
+    def test_tag_page_uses_the_taxonomy(self):
+        response = self.client.get(reverse('recipes:tag', args=(self.tag.slug,)))
+
+        self.assertIn('Taxonomy tag - Tag |', response.content.decode())
+        self.assertEqual(len(response.context['recipes']), 1)
+
+    def test_api_serializes_the_category_name(self):
+        response = self.client.get(reverse('recipes:recipes-api-detail', args=(self.recipe.pk,)))
+
+        self.assertEqual(response.data['category'], 'Taxonomy category')
@@ -20,6 +20,15 @@ urlpatterns = [
     path('recipes/tags/<slug:slug>', views.RecipeListViewTag.as_view(), name='tag'),
     path('recipes/category/<int:category_id>/', views.RecipeListViewCategory.as_view(), name="category"),
     path('recipes/<int:pk>/', views.RecipeDetail.as_view(), name="recipe"),
+    path('recipes/async/', views.AsyncRecipeListViewHome.as_view(), name='async_home'),
+    path('recipes/async/search/', views.AsyncRecipeListViewSearch.as_view(), name='async_search'),
+    path('recipes/async/tags/<slug:slug>', views.AsyncRecipeListViewTag.as_view(), name='async_tag'),
+    path(
+        'recipes/async/category/<int:category_id>/',
+        views.AsyncRecipeListViewCategory.as_view(),
+        name='async_category'
+    ),
+    path('recipes/async/<int:pk>/', views.AsyncRecipeDetail.as_view(), name='async_recipe'),
     path('recipes/api/v1', views.RecipeListViewHomeApi.as_view(), name="recipes_api_v1"),
     path(
         'recipes/api/v1/<int:pk>/', 
@@ -28,6 +37,9 @@ urlpatterns = [
     ),
     path('recipes/theory/', views.theory, name='theory',),
     path('recipes/api/v2/tag/<int:pk>', views.tag_api_detail, name='recipe_api_v2_tag'),
+    path('recipes/api/v2/categories/', views.category_api_list, name='recipe_api_v2_categories'),
+    path('recipes/api/v2/tags/', views.tag_api_list, name='recipe_api_v2_tags'),
+    path('recipes/api/v2/export/', views.recipe_api_v2_export, name='recipe_api_v2_export'),
 
     path('recipes/api/token/', TokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('recipes/api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
@@ -1,2 +1,3 @@
 from .site import *
+from .site_async import *
 from .api import *
\ No newline at end of file
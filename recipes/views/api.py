@@ -1,28 +1,54 @@
-from rest_framework.decorators import api_view
+from rest_framework.decorators import action, api_view
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
-from ..models import Recipe
-from ..serializers import RecipeSerializer
-from tag.models import Tag
-from ..serializers import TagSerializer
-from rest_framework.pagination import PageNumberPagination
+from ..models import PublishedRecipeCounter, Recipe
+from ..serializers import RecipeProjection, RecipeSerializer
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.viewsets import ModelViewSet
 from ..permisions import IsOwner
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
+from rest_framework.permissions import AllowAny, IsAuthenticatedOrReadOnly
 from django.shortcuts import get_object_or_404
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from ..export import iter_export_lines, parse_since
+from ..taxonomy import get_taxonomy
+from utils.compression import get_cached_compressed_response
+from utils.db_router import read_from_replica
+from utils.sparse_fields import parse_sparse_fields, split_names
+from utils.conditional import (
+    get_not_modified_response,
+    get_object_validators,
+    get_queryset_validators,
+    get_request_parts,
+    set_validators,
+)
 
 # http_method_names=['get', 'post']
 
 class RecipeAPIv2Pagination(PageNumberPagination):
     page_size = 10
 
+class RecipeAPIv2CursorPagination(CursorPagination):
+    page_size = 10
+    ordering = '-id'
+
 class RecipeAPIv2ViewSet(ModelViewSet):
-    queryset = Recipe.objects.get_published()
+    # Category names come from the taxonomy map, not a join
+    queryset = Recipe.objects.get_published().select_related(None)
     serializer_class = RecipeSerializer
+    projection_class = RecipeProjection
     pagination_class = RecipeAPIv2Pagination
+    cursor_pagination_class = RecipeAPIv2CursorPagination
     permission_classes = [IsAuthenticatedOrReadOnly,]
     http_method_names = ['get', 'options', 'head', 'patch', 'post', 'delete']
+    read_from_replica = ('list', 'retrieve')
+    sparse_field_actions = ('list', 'retrieve', 'batch')
+    # ?ids= has to fit in a URL, the POST body is for larger sets
+    max_query_ids = 100
+    max_batch_ids = 1000
+    max_id = 2 ** 63 - 1
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -31,8 +57,57 @@ class RecipeAPIv2ViewSet(ModelViewSet):
         if category_id is not '' and category_id.isnumeric():
             qs = qs.filter(category_id=category_id)
 
+        if getattr(self, 'action', None) in self.sparse_field_actions:
+            qs = self.apply_sparse_fields(qs)
+
         return qs
+
+    def get_sparse_fields(self):
+        if not hasattr(self, '_sparse_fields'):
+            try:
+                self._sparse_fields = parse_sparse_fields(
+                    self.request.query_params, self.serializer_class.Meta.fields
+                )
+            except ValueError as error:
+                raise ValidationError({'fields': str(error)})
+
+        return self._sparse_fields
+
+    def apply_sparse_fields(self, qs):
+        fields = self.get_sparse_fields()
+
+        if fields is None:
+            return qs
+
+        # Load only the columns behind the requested fields
+        qs = qs.only(*self.projection_class.get_columns(fields))
+
+        if not self.projection_class.needs_tags(fields):
+            qs = qs.prefetch_related(None)
+
+        return qs
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in self.sparse_field_actions:
+            kwargs.setdefault('fields', self.get_sparse_fields())
+
+        return super().get_serializer(*args, **kwargs)
     
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            use_cursor = params.get('pagination') == 'cursor' or 'cursor' in params
+
+            if use_cursor and self.cursor_pagination_class is not None:
+                self._paginator = self.cursor_pagination_class()
+            elif self.pagination_class is not None:
+                self._paginator = self.pagination_class()
+            else:
+                self._paginator = None
+
+        return self._paginator
+
     def get_object(self):
         pk = self.kwargs.get('pk', '')
         obj = get_object_or_404(self.get_queryset(), pk=pk)
@@ -47,8 +122,99 @@ class RecipeAPIv2ViewSet(ModelViewSet):
         
         return super().get_permissions()
     
+    def get_batch_ids(self, values, max_ids):
+        if isinstance(values, str):
+            values = split_names(values)
+
+        if not isinstance(values, list) or not values:
+            raise ValidationError({'ids': 'Send at least one id.'})
+
+        # Ids past a signed 64-bit integer can't exist and overflow the database driver
+        invalid = [
+            str(value) for value in values
+            if not str(value).isdecimal() or int(str(value)) > self.max_id
+        ]
+
+        if invalid:
+            raise ValidationError({'ids': f'Invalid ids: {", ".join(invalid)}'})
+
+        # Repeated ids come back once, where they were first asked for
+        ids = list(dict.fromkeys(int(value) for value in values))
+
+        if len(ids) > max_ids:
+            raise ValidationError({'ids': f'Send at most {max_ids} ids.'})
+
+        return ids
+
+    def get_batch_response(self, ids):
+        projection = self.projection_class(
+            context=self.get_serializer_context(), fields=self.get_sparse_fields()
+        )
+        queryset = self.filter_queryset(self.get_queryset()).filter(pk__in=ids)
+        rows = {row['id']: row for row in projection.project(queryset)}
+
+        return Response({
+            'results': projection.to_representation(rows[pk] for pk in ids if pk in rows),
+            'missing': [pk for pk in ids if pk not in rows],
+        })
+
+    @action(
+            methods=['post'],
+            detail=False,
+            permission_classes=[AllowAny],
+    )
+    def batch(self, request, *args, **kwargs):
+        data = request.data if isinstance(request.data, dict) else {}
+        return self.get_batch_response(self.get_batch_ids(data.get('ids'), self.max_batch_ids))
+
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        if 'ids' in request.query_params:
+            return self.get_batch_response(
+                self.get_batch_ids(request.query_params['ids'], self.max_query_ids)
+            )
+
+        parts = get_request_parts(request, vary_on_user=False)
+        etag, last_modified = get_queryset_validators(self.get_queryset(), *parts)
+        not_modified = get_not_modified_response(request, etag, last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
+        cached = get_cached_compressed_response(request, etag)
+
+        if cached is not None:
+            return set_validators(cached, etag, last_modified)
+
+        projection = self.projection_class(
+            context=self.get_serializer_context(), fields=self.get_sparse_fields()
+        )
+        queryset = projection.project(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+
+        if page is not None:
+            response = self.get_paginated_response(projection.to_representation(page))
+        else:
+            response = Response(projection.to_representation(queryset))
+
+        return set_validators(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        parts = get_request_parts(request, vary_on_user=False)
+        etag, last_modified = get_object_validators(
+            self.get_queryset(), self.kwargs.get('pk', ''), *parts
+        )
+        not_modified = get_not_modified_response(request, etag, last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
+        cached = get_cached_compressed_response(request, etag)
+
+        if cached is not None:
+            return set_validators(cached, etag, last_modified)
+
+        response = super().retrieve(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -173,11 +339,74 @@ class RecipeAPIv2ViewSet(ModelViewSet):
     #         "detail": "Eita"
     #     }, status=status.HTTP_404_NOT_FOUND)
 
+@require_GET
+def recipe_api_v2_export(request):
+    since = None
+
+    if request.GET.get('since'):
+        since = parse_since(request.GET['since'])
+
+        if since is None:
+            return JsonResponse(
+                {'detail': 'Invalid since datetime, use ISO 8601.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    response = StreamingHttpResponse(
+        iter_export_lines(since=since),
+        content_type='application/x-ndjson; charset=utf-8',
+    )
+    response['Content-Disposition'] = 'inline; filename="recipes.ndjson"'
+    return response
+
+def published_counts(scope):
+    return dict(
+        PublishedRecipeCounter.objects.filter(
+            scope=scope, count__gt=0
+        ).values_list('object_id', 'count')
+    )
+
 @api_view()
-def tag_api_detail(request, pk):
-    tag = get_object_or_404(
-        Tag.objects.all(),
-        pk=pk
+def category_api_list(request):
+    counts = published_counts(PublishedRecipeCounter.SCOPE_CATEGORY)
+    names = get_taxonomy().category_names
+    categories = sorted(
+        (category_id for category_id in counts if category_id in names),
+        key=lambda category_id: names[category_id],
     )
-    serializer = TagSerializer(instance=tag, many=False)
-    return Response(serializer.data)
\ No newline at end of file
+
+    return Response([
+        {
+            'id': category_id,
+            'name': names[category_id],
+            'recipe_count': counts[category_id],
+        }
+        for category_id in categories
+    ])
+
+@api_view()
+def tag_api_list(request):
+    counts = published_counts(PublishedRecipeCounter.SCOPE_TAG)
+    taxonomy = get_taxonomy()
+    tags = sorted(
+        (tag_id for tag_id in counts if tag_id in taxonomy.tag_names),
+        key=lambda tag_id: taxonomy.tag_names[tag_id],
+    )
+
+    return Response([
+        {
+            **taxonomy.get_tag(tag_id),
+            'recipe_count': counts[tag_id],
+        }
+        for tag_id in tags
+    ])
+
+@read_from_replica
+@api_view()
+def tag_api_detail(request, pk):
+    tag = get_taxonomy().get_tag(pk)
+
+    if tag is None:
+        raise Http404()
+
+    return Response(tag)
@@ -1,8 +1,6 @@
 import os
 
-from django.db.models import F, Q, Value
 from django.db.models.aggregates import Count
-from django.db.models.functions import Concat
 from django.forms.models import model_to_dict
 from django.http import Http404, JsonResponse
 from django.http.response import HttpResponse as HttpResponse
@@ -11,14 +9,28 @@ from django.utils import translation
 from django.utils.translation import gettext as _
 from django.views.generic import DetailView, ListView
 
+from recipes.counters import ALL, CATEGORY, TAG, get_published_count
 from recipes.models import Recipe
-from tag.models import Tag
-from utils.pagination import make_pagination
+from recipes.page_cache import AnonymousPageCacheMixin
+from recipes.search import search_recipes
+from recipes.taxonomy import get_taxonomy
+from utils.conditional import (
+    ConditionalGetMixin,
+    count_queryset_validators,
+    get_object_validators,
+    get_queryset_validators,
+    get_request_parts,
+)
+from utils.db_router import read_from_replica
+from utils.pagination import make_cursor_pagination, make_pagination
 
 PER_PAGE = int(os.environ.get('PER_PAGE', 6))
+PAGINATION_MODE = os.environ.get('PAGINATION_MODE', 'page')
+CURSOR_PAGINATION_COUNT = os.environ.get('CURSOR_PAGINATION_COUNT') == '1'
 
+@read_from_replica
 def theory(request, *args, **kwargs):
-    recipes = Recipe.objects.get_published()[:5]
+    recipes = Recipe.objects.get_published().select_related('author__profile')[:5]
     number_of_recipes = recipes.aggregate(number=Count('id'))
 
     context = {
@@ -32,12 +44,53 @@ def theory(request, *args, **kwargs):
         context
     )
 
-class RecipeListViewBase(ListView):
+class RecipeListViewBase(ConditionalGetMixin, ListView):
     model = Recipe
     paginate_by = None
     context_object_name = 'recipes'
     ordering = ['-id']
     template_name = 'recipes/pages/home.html'
+    pagination_mode = PAGINATION_MODE
+    allow_cursor_pagination = True
+    read_from_replica = True
+
+    def uses_cursor_pagination(self):
+        if not self.allow_cursor_pagination:
+            return False
+
+        return self.pagination_mode == 'cursor' or 'cursor' in self.request.GET
+
+    def get_published_count(self):
+        return get_published_count(ALL)
+
+    def get_total(self):
+        if not hasattr(self, '_total'):
+            self._total = self.get_published_count()
+
+        return self._total
+
+    def get_validators(self):
+        parts = get_request_parts(self.request, self.conditional_get_vary_on_user)
+
+        if self.get_total() is None:
+            etag, last_modified, self._total = count_queryset_validators(self.get_queryset(), *parts)
+            return etag, last_modified
+
+        return get_queryset_validators(self.get_queryset(), *parts, count=self.get_total())
+
+    def paginate(self, queryset):
+        if self.uses_cursor_pagination():
+            return make_cursor_pagination(
+                self.request,
+                queryset,
+                PER_PAGE,
+                with_count=CURSOR_PAGINATION_COUNT,
+                count=self.get_total() if CURSOR_PAGINATION_COUNT else None,
+            )
+
+        return make_pagination(
+            self.request, queryset, PER_PAGE, count=self.get_total()
+        )
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -46,15 +99,15 @@ class RecipeListViewBase(ListView):
             is_published=True,
         ).order_by('-id')
 
-        qs = qs.select_related('author', 'category')
-        qs = qs.prefetch_related('tags', 'author__profile')
+        qs = qs.select_related('author__profile', 'category')
+        qs = qs.prefetch_related('tags')
 
         return qs
     
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(*args, **kwargs)
 
-        page_obj, pagination_range = make_pagination(self.request, ctx.get('recipes'), PER_PAGE)
+        page_obj, pagination_range = self.paginate(ctx.get('recipes'))
 
         html_language = translation.get_language()
 
@@ -68,30 +121,54 @@ class RecipeListViewBase(ListView):
 
         return ctx
     
-class RecipeListViewHome(RecipeListViewBase):
+class RecipeListViewHome(AnonymousPageCacheMixin, RecipeListViewBase):
     template_name = 'recipes/pages/home.html'
 
+    def get_page_cache_scope(self):
+        return (ALL, 0)
+
 class RecipeListViewHomeApi(RecipeListViewBase):
     # template_name = 'recipes/pages/home.html'
 
     def render_to_response(self, context, **response_kwargs):
         recipes = self.get_context_data()['recipes']
-        recipes_list = recipes.object_list.values()
+
+        if self.uses_cursor_pagination():
+            recipes_list = Recipe.objects.filter(
+                pk__in=[recipe.pk for recipe in recipes]
+            ).order_by('-id').values()
+        else:
+            recipes_list = recipes.object_list.values()
 
         return JsonResponse(
             list(recipes_list),
             safe=False
         )
 
-class RecipeListViewCategory(RecipeListViewBase):
+class RecipeListViewCategory(AnonymousPageCacheMixin, RecipeListViewBase):
     template_name = 'recipes/pages/category.html'
 
+    def get_page_cache_scope(self):
+        return (CATEGORY, self.kwargs.get('category_id'))
+
+    def get_category_name(self):
+        return get_taxonomy().get_category_name(self.kwargs.get('category_id'))
+
+    def get_published_count(self):
+        return get_published_count(CATEGORY, self.kwargs.get('category_id'))
+
+    def get_validators(self):
+        if self.get_category_name() is None or not self.get_total():
+            raise Http404()
+
+        return super().get_validators()
+
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(*args, **kwargs)
         category_translation = _('Category')
 
         ctx.update({
-            'title': f'{ctx.get("recipes")[0].category.name}  - {category_translation} |'
+            'title': f'{self.get_category_name()}  - {category_translation} |'
         })
 
         return ctx
@@ -109,6 +186,10 @@ class RecipeListViewCategory(RecipeListViewBase):
 
 class RecipeListViewSearch(RecipeListViewBase):
     template_name = 'recipes/pages/search.html'
+    allow_cursor_pagination = False
+
+    def get_published_count(self):
+        return None
 
     def get_queryset(self,*args, **kwargs):
         search_term = self.request.GET.get('q', '')
@@ -118,16 +199,7 @@ class RecipeListViewSearch(RecipeListViewBase):
 
         qs =  super().get_queryset(*args, **kwargs)
 
-        qs = qs.filter(
-            Q(
-                Q(title__icontains=search_term) |
-                Q(description__icontains=search_term)
-            ),
-            is_published=True
-        )
-
-        if not qs:
-            raise Http404()
+        qs = search_recipes(qs, search_term)
 
         return qs
     
@@ -143,20 +215,28 @@ class RecipeListViewSearch(RecipeListViewBase):
 
         return ctx
 
-class RecipeDetail(DetailView):
+class RecipeDetail(ConditionalGetMixin, DetailView):
     model = Recipe
     context_object_name = 'recipe'
     template_name = 'recipes/pages/recipe-view.html'
+    read_from_replica = True
 
     def get_queryset(self, *args, **kwargs):
         qs = super().get_queryset(*args, **kwargs)
 
-        qs.filter(
+        qs = qs.filter(
             is_published=True
         )
 
+        qs = qs.select_related('author__profile', 'category')
+        qs = qs.prefetch_related('tags')
+
         return qs
 
+    def get_validators(self):
+        parts = get_request_parts(self.request, self.conditional_get_vary_on_user)
+        return get_object_validators(self.get_queryset(), self.kwargs.get('pk'), *parts)
+
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(*args, **kwargs)
 
@@ -174,6 +254,7 @@ class RecipeDetailApi(RecipeDetail):
         recipe_dict['created_at'] = str(recipe.created_at)
         recipe_dict['updated_at'] = str(recipe.updated_at)
         recipe_dict['author'] = str(recipe.author.username)
+        recipe_dict['tags'] = [tag.id for tag in recipe_dict.get('tags', [])]
 
         if recipe_dict.get('cover'):
             recipe_dict['cover'] = self.request.build_absolute_uri() + recipe_dict['cover'].url[1:]
@@ -188,20 +269,36 @@ class RecipeDetailApi(RecipeDetail):
             safe=False
         )
 
-class RecipeListViewTag(RecipeListViewBase):
+class RecipeListViewTag(AnonymousPageCacheMixin, RecipeListViewBase):
     template_name = 'recipes/pages/tag.html'
 
+    def get_page_cache_scope(self):
+        return (TAG, self.get_tag_id() or 0)
+
+    def get_tag_id(self):
+        return get_taxonomy().tag_ids.get(self.kwargs.get('slug', ''))
+
+    def get_published_count(self):
+        tag_id = self.get_tag_id()
+        return get_published_count(TAG, tag_id) if tag_id else 0
+
     def get_queryset(self,*args, **kwargs):
 
         qs =  super().get_queryset(*args, **kwargs)
+        tag_id = self.get_tag_id()
 
-        qs = qs.filter(tags__slug=self.kwargs.get('slug', ''))
+        if tag_id is None:
+            return qs.none()
 
-        return qs
+        # An IN over the (tag_id, recipe_id) index comes back in id order,
+        # a join with the tags table would need a temporary sort.
+        return qs.filter(
+            id__in=Recipe.tags.through.objects.filter(tag_id=tag_id).values('recipe_id')
+        )
     
     def get_context_data(self, *args, **kwargs):
         ctx = super().get_context_data(*args, **kwargs)
-        page_title = Tag.objects.filter(slug=self.kwargs.get('slug', '')).first()
+        page_title = get_taxonomy().tag_names.get(self.get_tag_id())
 
         if not page_title:
             page_title = 'No recipe found'
@@ -212,4 +309,4 @@ class RecipeListViewTag(RecipeListViewBase):
             'page_title': page_title,
         })
 
-        return ctx
\ No newline at end of file
+        return ctx
@@ -0,0 +1,193 @@
+from django.http import Http404
+from django.shortcuts import render
+from django.utils import translation
+from django.utils.translation import gettext as _
+from django.views import View
+
+from recipes.counters import ALL, CATEGORY, TAG, aget_published_count
+from recipes.models import Recipe
+from recipes.search import search_recipes
+from recipes.taxonomy import aget_taxonomy
+from recipes.views.site import PER_PAGE
+from utils.compression import aget_cached_compressed_response
+from utils.conditional import (
+    acount_queryset_validators,
+    aget_object_validators,
+    aget_queryset_validators,
+    get_not_modified_response,
+    get_request_parts,
+    set_validators,
+)
+from utils.pagination import amake_pagination
+
+
+def get_published_recipes():
+    qs = Recipe.objects.filter(is_published=True).order_by('-id')
+    qs = qs.select_related('author__profile', 'category')
+    return qs.prefetch_related('tags')
+
+
+class AsyncRecipeListViewBase(View):
+    # Same templates and context as the sync views, but every query is
+    # awaited and the page is loaded before rendering, so a slow client
+    # never holds a worker thread or a database connection.
+    template_name = 'recipes/pages/home.html'
+    read_from_replica = True
+
+    async def get_queryset(self):
+        return get_published_recipes()
+
+    async def get_total(self):
+        return await aget_published_count(ALL)
+
+    def get_context_data(self, page_obj):
+        return {}
+
+    async def get(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        queryset = await self.get_queryset()
+        total = await self.get_total()
+
+        if total is None:
+            etag, last_modified, total = await acount_queryset_validators(
+                queryset, *get_request_parts(request)
+            )
+        else:
+            etag, last_modified = await aget_queryset_validators(
+                queryset, *get_request_parts(request), count=total
+            )
+        not_modified = get_not_modified_response(request, etag, last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
+        cached = await aget_cached_compressed_response(request, etag)
+
+        if cached is not None:
+            return set_validators(cached, etag, last_modified)
+
+        page_obj, pagination_range = await amake_pagination(
+            request, queryset, PER_PAGE, count=total
+        )
+        context = {
+            'recipes': page_obj,
+            'pagination_range': pagination_range,
+            'html_language': translation.get_language(),
+            **self.get_context_data(page_obj),
+        }
+
+        response = render(request, self.template_name, context)
+        return set_validators(response, etag, last_modified)
+
+
+class AsyncRecipeListViewHome(AsyncRecipeListViewBase):
+    template_name = 'recipes/pages/home.html'
+
+
+class AsyncRecipeListViewCategory(AsyncRecipeListViewBase):
+    template_name = 'recipes/pages/category.html'
+
+    async def get_queryset(self):
+        taxonomy = await aget_taxonomy()
+        self.category_name = taxonomy.get_category_name(self.kwargs.get('category_id'))
+
+        if self.category_name is None:
+            raise Http404()
+
+        return get_published_recipes().filter(category__id=self.kwargs.get('category_id'))
+
+    async def get_total(self):
+        total = await aget_published_count(CATEGORY, self.kwargs.get('category_id'))
+
+        if not total:
+            raise Http404()
+
+        return total
+
+    def get_context_data(self, page_obj):
+        category_translation = _('Category')
+        return {'title': f'{self.category_name}  - {category_translation} |'}
+
+
+class AsyncRecipeListViewSearch(AsyncRecipeListViewBase):
+    template_name = 'recipes/pages/search.html'
+
+    async def get_queryset(self):
+        search_term = self.request.GET.get('q', '')
+
+        if not search_term:
+            raise Http404()
+
+        return search_recipes(get_published_recipes(), search_term)
+
+    async def get_total(self):
+        return None
+
+    def get_context_data(self, page_obj):
+        search_term = self.request.GET.get('q', '')
+
+        return {
+            'page_title': f'Search for "{search_term}" |',
+            'search_term': search_term,
+            'additional_url_query': f'&q={search_term}'
+        }
+
+
+class AsyncRecipeListViewTag(AsyncRecipeListViewBase):
+    template_name = 'recipes/pages/tag.html'
+
+    async def get_queryset(self):
+        taxonomy = await aget_taxonomy()
+        self.tag_id = taxonomy.tag_ids.get(self.kwargs.get('slug', ''))
+        self.tag_name = taxonomy.tag_names.get(self.tag_id)
+        qs = get_published_recipes()
+
+        if self.tag_id is None:
+            return qs.none()
+
+        return qs.filter(
+            id__in=Recipe.tags.through.objects.filter(tag_id=self.tag_id).values('recipe_id')
+        )
+
+    async def get_total(self):
+        return await aget_published_count(TAG, self.tag_id) if self.tag_id else 0
+
+    def get_context_data(self, page_obj):
+        return {'page_title': f'{self.tag_name or "No recipe found"} - Tag |'}
+
+
+class AsyncRecipeDetail(View):
+    template_name = 'recipes/pages/recipe-view.html'
+    read_from_replica = True
+
+    async def get(self, request, pk):
+        request.user = await request.auser()
+        queryset = get_published_recipes().order_by()
+
+        etag, last_modified = await aget_object_validators(
+            queryset, pk, *get_request_parts(request)
+        )
+
+        if etag is None:
+            raise Http404()
+
+        not_modified = get_not_modified_response(request, etag, last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
+        cached = await aget_cached_compressed_response(request, etag)
+
+        if cached is not None:
+            return set_validators(cached, etag, last_modified)
+
+        try:
+            recipe = await queryset.aget(pk=pk)
+        except Recipe.DoesNotExist:
+            raise Http404()
+
+        response = render(request, self.template_name, {
+            'recipe': recipe,
+            'is_detail_page': True,
+        })
+        return set_validators(response, etag, last_modified)
@@ -0,0 +1,268 @@
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+from wsgiref.util import setup_testing_defaults
+
+SEED_WORDS = (
+    'arroz', 'feijao', 'frango', 'bolo', 'chocolate', 'massa', 'molho', 'queijo',
+    'tomate', 'cebola', 'alho', 'carne', 'peixe', 'salada', 'sopa', 'torta',
+    'banana', 'laranja', 'milho', 'batata', 'cenoura', 'abobora', 'coco', 'leite',
+)
+
+
+def percentile(values, percent):
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    rank = math.ceil(percent / 100 * len(ordered)) - 1
+    return ordered[max(0, min(rank, len(ordered) - 1))]
+
+
+def summarize(latencies, errors=0, elapsed=None):
+    total = len(latencies) + errors
+    milliseconds = [latency * 1000 for latency in latencies]
+
+    return {
+        'requests': total,
+        'errors': errors,
+        'rps': round(total / elapsed, 2) if elapsed else None,
+        'mean_ms': round(sum(milliseconds) / len(milliseconds), 3) if milliseconds else None,
+        'p50_ms': round(percentile(milliseconds, 50), 3) if milliseconds else None,
+        'p95_ms': round(percentile(milliseconds, 95), 3) if milliseconds else None,
+        'p99_ms': round(percentile(milliseconds, 99), 3) if milliseconds else None,
+    }
+
+
+def run_concurrently(request_fn, total, concurrency):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+
+    def worker(_):
+        nonlocal errors
+        started_at = time.perf_counter()
+
+        try:
+            ok = request_fn()
+        except Exception:
+            ok = False
+
+        latency = time.perf_counter() - started_at
+
+        with lock:
+            if ok:
+                latencies.append(latency)
+            else:
+                errors += 1
+
+    started_at = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(total)))
+
+    return summarize(latencies, errors, time.perf_counter() - started_at)
+
+
+async def run_async_concurrently(request_fn, total, concurrency):
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+
+    # Each client coroutine sends its requests one after another, like a
+    # keep-alive connection; all of them share a single event loop.
+    async def client():
+        nonlocal errors
+
+        for _ in remaining:
+            started_at = time.perf_counter()
+
+            try:
+                ok = await request_fn()
+            except Exception:
+                ok = False
+
+            if ok:
+                latencies.append(time.perf_counter() - started_at)
+            else:
+                errors += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started_at)
+
+
+def compare_to_baseline(results, baseline):
+    comparison = {}
+
+    for name, current in results.items():
+        previous = baseline.get(name)
+
+        if not previous:
+            continue
+
+        comparison[name] = {}
+
+        for metric in ('rps', 'p50_ms', 'p95_ms', 'p99_ms'):
+            before, after = previous.get(metric), current.get(metric)
+
+            if before and after is not None:
+                comparison[name][metric] = round((after - before) / before * 100, 1)
+
+    return comparison
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as file:
+        return json.load(file)
+
+
+def write_results(path, data):
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+        file.write('\n')
+
+
+def make_seed_rows(total, seed=0):
+    rand = random.Random(seed)
+
+    def sentence(words):
+        return ' '.join(rand.choice(SEED_WORDS) for _ in range(words)).capitalize()
+
+    for i in range(total):
+        yield i + 1, {
+            'title': f'{sentence(4)} {i}',
+            'description': sentence(12),
+            'preparation_time': rand.randint(10, 99),
+            'preparation_time_unit': 'Minutos',
+            'servings': rand.randint(1, 12),
+            'servings_unit': 'Porções',
+            'preparation_steps': sentence(300),
+            'author': {'username': f'bench_author_{i % 50}'},
+            'category': {'name': f'Bench category {i % 10}'},
+            'tags': [f'bench-{rand.choice(SEED_WORDS)}' for _ in range(2)],
+        }
+
+
+def call_wsgi(application, method, path, body=b'', headers=None):
+    path, _, query_string = path.partition('?')
+    environ = {
+        'REQUEST_METHOD': method,
+        'PATH_INFO': path,
+        'QUERY_STRING': query_string,
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.input': BytesIO(body),
+    }
+    environ.update(headers or {})
+    setup_testing_defaults(environ)
+
+    status = []
+    chunks = application(environ, lambda value, response_headers, exc_info=None: status.append(value))
+
+    try:
+        content = b''.join(chunks)
+    finally:
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+    return int(status[0].split()[0]), content
+
+
+async def call_asgi(application, method, path, body=b'', headers=None, send_delay=0):
+    path, _, query_string = path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query_string.encode(),
+        'root_path': '',
+        'headers': [
+            (b'host', b'testserver'),
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            *((name.lower().encode(), value.encode()) for name, value in (headers or {}).items()),
+        ],
+        'client': ('127.0.0.1', 0),
+        'server': ('testserver', 80),
+    }
+    messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    status = []
+    chunks = []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+
+        # The client never disconnects; Django cancels this once it responds
+        await asyncio.Future()
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            status.append(message['status'])
+        elif message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+
+            # A slow client drains the socket slowly
+            if send_delay:
+                await asyncio.sleep(send_delay)
+
+    await application(scope, receive, send)
+    return status[0], b''.join(chunks)
+
+
+class InFlight:
+    def __init__(self):
+        self.current = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def track(self):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.current -= 1
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        ...
+
+
+class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+@contextmanager
+def serve_wsgi(application, host='127.0.0.1', port=0):
+    server = make_server(
+        host, port, application,
+        server_class=ThreadingWSGIServer,
+        handler_class=QuietHandler,
+    )
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        yield f'http://{host}:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
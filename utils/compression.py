@@ -0,0 +1,209 @@
+import hashlib
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+COMPRESSIBLE_TYPES = (
+    'text/',
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+)
+
+# Preferred first when the client weighs them equally
+ENCODINGS = ('gzip', 'deflate')
+
+# gzip adds a random file name, like GZipMiddleware, to blunt BREACH
+MAX_RANDOM_BYTES = 100
+
+
+def parse_accept_encoding(header):
+    weights = {}
+
+    for item in header.split(','):
+        name, _, params = item.strip().partition(';')
+        name = name.strip().lower()
+
+        if not name:
+            continue
+
+        weight = 1.0
+        params = params.strip()
+
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+
+        weights[name] = weight
+
+    return weights
+
+
+def choose_encoding(request):
+    weights = parse_accept_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    default = weights.get('*', 0.0)
+    best, best_weight = None, 0.0
+
+    for encoding in ENCODINGS:
+        weight = weights.get(encoding, default)
+
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+
+    return best
+
+
+def compress(content, encoding):
+    if encoding == 'gzip':
+        return compress_string(content, max_random_bytes=MAX_RANDOM_BYTES)
+
+    return zlib.compress(content, settings.COMPRESSION_LEVEL)
+
+
+def is_compressible(response):
+    if response.streaming or response.has_header('Content-Encoding'):
+        return False
+
+    content_type = response.get('Content-Type', '').lower()
+
+    if not content_type.startswith(COMPRESSIBLE_TYPES):
+        return False
+
+    return len(response.content) >= settings.COMPRESSION_MIN_SIZE
+
+
+def weaken_etag(response):
+    # The compressed body is not byte-identical to the uncompressed one
+    etag = response.get('ETag')
+
+    if etag and etag.startswith('"'):
+        response.headers['ETag'] = f'W/{etag}'
+
+
+def set_compressed_content(response, content, encoding):
+    response.content = content
+    response.headers['Content-Encoding'] = encoding
+    response.headers['Content-Length'] = str(len(content))
+    weaken_etag(response)
+    return response
+
+
+def get_compressed_cache():
+    return caches[settings.COMPRESSION_CACHE_ALIAS]
+
+
+def make_compressed_key(request, etag, encoding):
+    # The ETag already covers the path, language and user; the Accept
+    # header picks between the JSON and browsable API renderings.
+    digest = hashlib.md5(
+        f'{etag}|{encoding}|{request.META.get("HTTP_ACCEPT", "")}'.encode(),
+        usedforsecurity=False,
+    ).hexdigest()
+    return f'compressed:{digest}'
+
+
+def can_use_compressed_cache(request):
+    # utils.conditional serves these bodies, so it's imported late
+    from utils.conditional import has_pending_messages
+
+    if not settings.COMPRESSION_CACHE_TIMEOUT or request.method not in ('GET', 'HEAD'):
+        return False
+
+    return not has_pending_messages(request)
+
+
+def build_cached_response(request, etag, cached):
+    content_type, content = cached
+    response = HttpResponse(content_type=content_type)
+    response.compressed_from_cache = True
+    patch_vary_headers(response, ('Accept-Encoding',))
+    response.headers['ETag'] = etag
+    return set_compressed_content(response, content, choose_encoding(request))
+
+
+def get_cached_compressed_response(request, etag):
+    encoding = choose_encoding(request)
+
+    if etag is None or encoding is None or not can_use_compressed_cache(request):
+        return None
+
+    cached = get_compressed_cache().get(make_compressed_key(request, etag, encoding))
+    return None if cached is None else build_cached_response(request, etag, cached)
+
+
+async def aget_cached_compressed_response(request, etag):
+    encoding = choose_encoding(request)
+
+    if etag is None or encoding is None or not can_use_compressed_cache(request):
+        return None
+
+    cached = await get_compressed_cache().aget(make_compressed_key(request, etag, encoding))
+    return None if cached is None else build_cached_response(request, etag, cached)
+
+
+def should_store(request, response):
+    if response.status_code != 200 or not response.has_header('ETag'):
+        return False
+
+    if response.cookies or not can_use_compressed_cache(request):
+        return False
+
+    # A page that rendered a CSRF token is only valid for that session
+    return not request.META.get('CSRF_COOKIE_NEEDS_UPDATE')
+
+
+class CompressionMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        return self.process_response(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self.process_response(request, await self.get_response(request))
+
+    def process_response(self, request, response):
+        if getattr(response, 'compressed_from_cache', False):
+            return response
+
+        if not is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request)
+
+        if encoding is None:
+            return response
+
+        etag = response.get('ETag')
+        content_type = response['Content-Type']
+        content = compress(response.content, encoding)
+
+        if len(content) >= len(response.content):
+            return response
+
+        if should_store(request, response):
+            get_compressed_cache().set(
+                make_compressed_key(request, etag, encoding),
+                (content_type, content),
+                settings.COMPRESSION_CACHE_TIMEOUT,
+            )
+
+        return set_compressed_content(response, content, encoding)
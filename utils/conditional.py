@@ -0,0 +1,142 @@
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
+
+from utils.compression import get_cached_compressed_response
+
+
+def make_etag(*parts):
+    digest = hashlib.md5(
+        '|'.join(str(part) for part in parts).encode(), usedforsecurity=False
+    ).hexdigest()
+    return quote_etag(digest)
+
+
+def get_validator_aggregates(count=None):
+    aggregates = {'last_modified': Max('updated_at')}
+
+    # Callers that already know the row count (e.g. from a counter table)
+    # pass it in so only MAX(updated_at) has to run.
+    if count is None:
+        aggregates['total'] = Count('id')
+
+    return aggregates
+
+
+def make_queryset_validators(stats, parts, count=None):
+    last_modified = stats['last_modified']
+    total = stats.get('total', count)
+    etag = make_etag(*parts, total, last_modified.isoformat() if last_modified else '')
+    return etag, last_modified
+
+
+def make_object_validators(last_modified, pk, parts):
+    if last_modified is None:
+        return None, None
+
+    return make_etag(*parts, pk, last_modified.isoformat()), last_modified
+
+
+def get_queryset_validators(queryset, *parts, count=None):
+    stats = queryset.order_by().aggregate(**get_validator_aggregates(count))
+    return make_queryset_validators(stats, parts, count)
+
+
+async def aget_queryset_validators(queryset, *parts, count=None):
+    stats = await queryset.order_by().aaggregate(**get_validator_aggregates(count))
+    return make_queryset_validators(stats, parts, count)
+
+
+def count_queryset_validators(queryset, *parts):
+    # Without a counter the validator aggregate also counts the rows, so
+    # the caller can hand the total to the paginator instead of counting again.
+    stats = queryset.order_by().aggregate(**get_validator_aggregates())
+    return *make_queryset_validators(stats, parts), stats['total']
+
+
+async def acount_queryset_validators(queryset, *parts):
+    stats = await queryset.order_by().aaggregate(**get_validator_aggregates())
+    return *make_queryset_validators(stats, parts), stats['total']
+
+
+def get_object_validators(queryset, pk, *parts):
+    last_modified = queryset.order_by().filter(pk=pk).values_list(
+        'updated_at', flat=True
+    ).first()
+    return make_object_validators(last_modified, pk, parts)
+
+
+async def aget_object_validators(queryset, pk, *parts):
+    last_modified = await queryset.order_by().filter(pk=pk).values_list(
+        'updated_at', flat=True
+    ).afirst()
+    return make_object_validators(last_modified, pk, parts)
+
+
+def get_request_parts(request, vary_on_user=True):
+    parts = [request.get_full_path(), get_language()]
+
+    if vary_on_user:
+        parts.append(getattr(request.user, 'pk', None))
+
+    return parts
+
+
+def has_pending_messages(request):
+    storage = getattr(request, '_messages', None)
+    return storage is not None and len(storage) > 0
+
+
+def get_not_modified_response(request, etag, last_modified):
+    if etag is None or request.method not in ('GET', 'HEAD'):
+        return None
+
+    if has_pending_messages(request):
+        return None
+
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=timegm(last_modified.utctimetuple()) if last_modified else None,
+    )
+
+
+def set_validators(response, etag, last_modified):
+    if etag is None or response.status_code != 200:
+        return response
+
+    response.headers.setdefault('ETag', etag)
+
+    if last_modified is not None:
+        response.headers.setdefault(
+            'Last-Modified', http_date(timegm(last_modified.utctimetuple()))
+        )
+
+    return response
+
+
+class ConditionalGetMixin:
+    conditional_get_vary_on_user = True
+
+    def get_validators(self):
+        parts = get_request_parts(self.request, self.conditional_get_vary_on_user)
+        return get_queryset_validators(self.get_queryset(), *parts)
+
+    def get(self, request, *args, **kwargs):
+        etag, last_modified = self.get_validators()
+        not_modified = get_not_modified_response(request, etag, last_modified)
+
+        if not_modified is not None:
+            return not_modified
+
+        cached = get_cached_compressed_response(request, etag)
+
+        if cached is not None:
+            return set_validators(cached, etag, last_modified)
+
+        response = super().get(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
@@ -0,0 +1,159 @@
+import random
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_routing_state = ContextVar('db_routing_state', default=None)
+
+
+class RoutingState:
+    def __init__(self):
+        self.replica = None
+        self.wrote = False
+
+
+def get_replica_aliases():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def read_from_replica(view_func):
+    view_func.read_from_replica = True
+    return view_func
+
+
+def view_reads_from_replica(view_func, method):
+    view_class = getattr(view_func, 'view_class', None) or getattr(view_func, 'cls', None)
+    setting = getattr(view_func, 'read_from_replica', None)
+
+    if setting is None:
+        setting = getattr(view_class, 'read_from_replica', False)
+
+    # DRF viewsets list the actions that may read from a replica
+    actions = getattr(view_func, 'actions', None)
+
+    if actions is not None and not isinstance(setting, bool):
+        return actions.get(method.lower()) in setting
+
+    return bool(setting)
+
+
+def is_pinned_to_primary(request):
+    return settings.DATABASE_PIN_COOKIE in request.COOKIES
+
+
+def read_from_primary():
+    # For reads that outlive the request (cached pages), where replica lag
+    # would be stored along with them.
+    state = _routing_state.get()
+
+    if state is not None:
+        state.replica = None
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+
+        if state is None or state.wrote or state.replica is None:
+            return DEFAULT_DB_ALIAS
+
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+
+        if state is not None:
+            state.wrote = True
+
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replica_aliases()}
+
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_replica_aliases():
+            return False
+
+        return None
+
+
+class ReadReplicaMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            # Django runs a sync process_view in a thread under ASGI
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        state = RoutingState()
+        token = _routing_state.set(state)
+
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+
+        return self.pin_to_primary(response, state)
+
+    async def __acall__(self, request):
+        state = RoutingState()
+        token = _routing_state.set(state)
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            _routing_state.reset(token)
+
+        return self.pin_to_primary(response, state)
+
+    def pin_to_primary(self, response, state):
+        # Read-your-writes: after a write the client reads from the primary
+        # until the replicas have had time to catch up.
+        if state.wrote and get_replica_aliases():
+            response.set_cookie(
+                settings.DATABASE_PIN_COOKIE,
+                '1',
+                max_age=settings.DATABASE_PIN_SECONDS,
+                httponly=True,
+                samesite='Lax',
+            )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self.choose_replica(request, view_func)
+        return None
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self.choose_replica(request, view_func)
+        return None
+
+    def choose_replica(self, request, view_func):
+        state = _routing_state.get()
+        replicas = get_replica_aliases()
+
+        if state is None or not replicas or request.method not in SAFE_METHODS:
+            return
+
+        if is_pinned_to_primary(request) or not view_reads_from_replica(view_func, request.method):
+            return
+
+        # One replica per request keeps counts and pages consistent
+        state.replica = random.choice(replicas)
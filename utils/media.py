@@ -0,0 +1,165 @@
+import mimetypes
+import os
+import stat as stat_module
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+
+class RangeFile:
+    # Caps reads at the end of the range and keeps fileno(), so servers
+    # with a sendfile() file_wrapper (gunicorn) copy the bytes in the
+    # kernel, starting at the current offset and stopping at Content-Length.
+    def __init__(self, file, start, length):
+        self.file = file
+        self.remaining = length
+        file.seek(start)
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    # Returns (start, end) for a single satisfiable byte range, None when
+    # the header should be ignored and False when it can't be satisfied.
+    unit, _, ranges = header.partition('=')
+
+    if unit.strip().lower() != 'bytes' or ',' in ranges:
+        return None
+
+    first, dash, last = ranges.strip().partition('-')
+
+    if not dash:
+        return None
+
+    try:
+        if first == '':
+            length = int(last)
+
+            if length <= 0:
+                return False
+
+            return max(0, size - length), size - 1
+
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        return None
+
+    if start >= size:
+        return False
+
+    if end < start:
+        return None
+
+    return start, min(end, size - 1)
+
+
+def if_range_matches(request, etag, last_modified):
+    value = request.META.get('HTTP_IF_RANGE')
+
+    if value is None:
+        return True
+
+    if value.startswith('"'):
+        return value == etag
+
+    return parse_http_date_safe(value) == last_modified
+
+
+def make_stat_etag(stat):
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def set_media_headers(response, content_type, etag, last_modified):
+    if response.status_code in (200, 206):
+        response.headers['Content-Type'] = content_type
+
+    response.headers['ETag'] = etag
+    response.headers['Last-Modified'] = http_date(last_modified)
+    response.headers['Cache-Control'] = f'public, max-age={settings.MEDIA_MAX_AGE}'
+    return response
+
+
+def make_offload_response(path, name):
+    response = HttpResponse()
+
+    if settings.MEDIA_SERVE_MODE == 'x-accel-redirect':
+        response.headers['X-Accel-Redirect'] = settings.MEDIA_ACCEL_REDIRECT_PREFIX + quote(name)
+    else:
+        response.headers['X-Sendfile'] = path
+
+    return response
+
+
+def make_file_response(request, path, size, etag, last_modified):
+    response = None
+    requested = request.META.get('HTTP_RANGE')
+
+    if requested and if_range_matches(request, etag, last_modified):
+        byte_range = parse_range(requested, size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response.headers['Content-Range'] = f'bytes */{size}'
+            return response
+
+        if byte_range is not None:
+            start, end = byte_range
+            response = FileResponse(RangeFile(open(path, 'rb'), start, end - start + 1), status=206)
+            response.headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response.headers['Content-Length'] = str(end - start + 1)
+
+    if response is None:
+        response = FileResponse(open(path, 'rb'))
+
+    response.headers['Accept-Ranges'] = 'bytes'
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404()
+
+    try:
+        stat = os.stat(full_path)
+    except OSError:
+        raise Http404()
+
+    if not stat_module.S_ISREG(stat.st_mode):
+        raise Http404()
+
+    etag = make_stat_etag(stat)
+    last_modified = int(stat.st_mtime)
+    content_type = mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+    if response is None:
+        if settings.MEDIA_SERVE_MODE == 'sendfile':
+            response = make_file_response(request, full_path, stat.st_size, etag, last_modified)
+        else:
+            # The front server reads the file and handles ranges itself
+            response = make_offload_response(full_path, path)
+
+    return set_media_headers(response, content_type, etag, last_modified)
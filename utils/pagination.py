@@ -1,3 +1,6 @@
+import base64
+import binascii
+import json
 import math
 from django.core.paginator import Paginator
 
@@ -33,12 +36,16 @@ def make_pagination_range(
         'last_page_out_of_range': stop_range < total_pages
     }
 
-def make_pagination(request, queryset, per_page, qty_pages=4):
+def make_pagination(request, queryset, per_page, qty_pages=4, count=None):
     try:
         current_page = int(request.GET.get('page', 1))
     except ValueError:
         current_page = 1
     paginator = Paginator(queryset, per_page)
+
+    if count is not None:
+        # Paginator.count is a cached_property; a known total skips the COUNT(*)
+        paginator.count = count
     page_obj = paginator.get_page(current_page)
 
     pagination_range = make_pagination_range(
@@ -47,4 +54,99 @@ def make_pagination(request, queryset, per_page, qty_pages=4):
         current_page
     )
 
-    return page_obj, pagination_range
\ No newline at end of file
+    return page_obj, pagination_range
+
+async def amake_pagination(request, queryset, per_page, qty_pages=4, count=None):
+    if count is None:
+        count = await queryset.acount()
+
+    page_obj, pagination_range = make_pagination(
+        request, queryset, per_page, qty_pages, count=count
+    )
+
+    # Page.object_list is a lazy slice; loading it here keeps the
+    # templates from touching the database inside the event loop.
+    page_obj.object_list = [obj async for obj in page_obj.object_list]
+
+    return page_obj, pagination_range
+
+def encode_cursor(position, reverse=False):
+    payload = json.dumps({'id': position, 'r': int(reverse)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    if not token:
+        return None, False
+
+    try:
+        padding = '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(token + padding))
+        return int(payload['id']), bool(payload.get('r', 0))
+    except (ValueError, TypeError, KeyError, binascii.Error):
+        return None, False
+
+
+class CursorPage:
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None, count=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def __repr__(self):
+        return f'<CursorPage of {len(self)}>'
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def make_cursor_pagination(request, queryset, per_page, with_count=False, count=None):
+    position, reverse = decode_cursor(request.GET.get('cursor', ''))
+
+    if position is None:
+        rows = list(queryset.order_by('-id')[:per_page + 1])
+        has_more_before, has_more_after = False, len(rows) > per_page
+        rows = rows[:per_page]
+    elif reverse:
+        rows = list(queryset.filter(id__gt=position).order_by('id')[:per_page + 1])
+        has_more_before, has_more_after = len(rows) > per_page, True
+        rows = rows[:per_page][::-1]
+    else:
+        rows = list(queryset.filter(id__lt=position).order_by('-id')[:per_page + 1])
+        has_more_before, has_more_after = True, len(rows) > per_page
+        rows = rows[:per_page]
+
+    next_cursor = encode_cursor(rows[-1].id) if rows and has_more_after else None
+    previous_cursor = encode_cursor(rows[0].id, reverse=True) if rows and has_more_before else None
+
+    page_obj = CursorPage(
+        rows,
+        next_cursor=next_cursor,
+        previous_cursor=previous_cursor,
+        count=(count if count is not None else queryset.count()) if with_count else None,
+    )
+
+    pagination_range = {
+        'cursor_mode': True,
+        'next_cursor': next_cursor,
+        'previous_cursor': previous_cursor,
+        'count': page_obj.count,
+    }
+
+    return page_obj, pagination_range
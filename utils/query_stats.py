@@ -0,0 +1,136 @@
+import json
+import logging
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started_at = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - started_at
+            self.count += 1
+            self.statements[(sql, repr(params))] += 1
+
+    @property
+    def duplicates(self):
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    @contextmanager
+    def capture(self):
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self))
+
+            yield self
+
+
+class QueryStatsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        if not settings.QUERY_STATS_ENABLED:
+            return self.get_response(request)
+
+        with QueryStats().capture() as stats:
+            response = self.get_response(request)
+
+        return self.report(request, response, stats)
+
+    async def __acall__(self, request):
+        if not settings.QUERY_STATS_ENABLED:
+            return await self.get_response(request)
+
+        # Connections are per thread and the async ORM runs its queries in
+        # the request's thread-sensitive executor, so the wrappers go there.
+        stats = QueryStats()
+        capture = stats.capture()
+        await sync_to_async(capture.__enter__)()
+
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(capture.__exit__)(None, None, None)
+
+        return self.report(request, response, stats)
+
+    def report(self, request, response, stats):
+        resolver_match = getattr(request, 'resolver_match', None)
+        view_name = resolver_match.view_name if resolver_match else ''
+        time_ms = round(stats.duration * 1000, 3)
+
+        logger.info(json.dumps({
+            'event': 'query_stats',
+            'view': view_name,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'queries': stats.count,
+            'sql_time_ms': time_ms,
+            'duplicates': stats.duplicates,
+            # hit or miss on views behind the anonymous page cache
+            'page_cache': response.get('X-Page-Cache'),
+        }))
+
+        # The log line is the record; the header is a debugging aid that
+        # only reaches INTERNAL_IPS when it is turned on.
+        if settings.QUERY_STATS_HEADER and request.META.get('REMOTE_ADDR') in settings.INTERNAL_IPS:
+            response['X-Query-Stats'] = (
+                f'count={stats.count}; time_ms={time_ms}; duplicates={stats.duplicates}'
+            )
+
+        return response
+
+
+def get_duplicate_queries(captured_queries):
+    statements = Counter(query['sql'] for query in captured_queries)
+    return {sql: count for sql, count in statements.items() if count > 1}
+
+
+class QueryBudgetMixin:
+    @contextmanager
+    def assertQueryBudget(self, max_queries, max_duplicates=0, using='default'):
+        with CaptureQueriesContext(connections[using]) as context:
+            yield context
+
+        queries = context.captured_queries
+        details = '\n'.join(
+            f'{i}. {query["sql"]}' for i, query in enumerate(queries, start=1)
+        )
+
+        self.assertLessEqual(
+            len(queries), max_queries,
+            f'{len(queries)} queries executed, budget is {max_queries}:\n{details}',
+        )
+
+        duplicates = get_duplicate_queries(queries)
+        self.assertLessEqual(
+            sum(count - 1 for count in duplicates.values()), max_duplicates,
+            f'Duplicate queries (possible N+1):\n{details}',
+        )
@@ -0,0 +1,21 @@
+def split_names(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+def parse_sparse_fields(params, available):
+    requested = split_names(params.get('fields'))
+    excluded = split_names(params.get('exclude'))
+
+    if not requested and not excluded:
+        return None
+
+    unknown = sorted(set(requested + excluded) - set(available))
+
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+
+    # The response keeps the serializer's field order, not the request's
+    return [
+        name for name in available
+        if (not requested or name in requested) and name not in excluded
+    ]
@@ -0,0 +1,11 @@
+from django.conf import settings
+
+
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite' or not settings.SQLITE_PRODUCTION:
+        return
+
+    # Runs on the raw connection so the PRAGMAs don't show up in query
+    # logs, query budgets or X-Query-Stats.
+    for name, value in settings.SQLITE_PRAGMAS.items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
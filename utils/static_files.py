@@ -0,0 +1,189 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import posixpath
+import threading
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.files.base import ContentFile
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from utils.compression import choose_encoding
+
+PRECOMPRESSED_EXTENSIONS = ('.css', '.js', '.svg', '.txt', '.html', '.json', '.map', '.xml')
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # collectstatic writes content-hashed copies plus a manifest; every
+    # text file also gets a .gz sibling so nothing is compressed per request.
+    def stored_name(self, name):
+        # Before the first collectstatic (tests, a fresh checkout) pages
+        # render with the plain names, which the finders can serve.
+        if not self.hashed_files:
+            return name
+
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+        if dry_run:
+            return
+
+        names = set(self.hashed_files) | set(self.hashed_files.values())
+
+        for name in sorted(names):
+            if name.endswith(PRECOMPRESSED_EXTENSIONS) and self.exists(name):
+                self.write_compressed(name)
+
+    def write_compressed(self, name):
+        with self.open(name) as file:
+            content = file.read()
+
+        compressed = gzip.compress(content, compresslevel=9, mtime=0)
+
+        if len(compressed) >= len(content):
+            return
+
+        gz_name = f'{name}.gz'
+
+        if self.exists(gz_name):
+            self.delete(gz_name)
+
+        self._save(gz_name, ContentFile(compressed))
+
+
+class StaticFile:
+    def __init__(self, path, immutable):
+        with open(path, 'rb') as file:
+            self.content = file.read()
+
+        self.gzip_content = None
+
+        if os.path.exists(f'{path}.gz'):
+            with open(f'{path}.gz', 'rb') as file:
+                self.gzip_content = file.read()
+
+        content_type, _ = mimetypes.guess_type(path)
+        self.content_type = content_type or 'application/octet-stream'
+        self.etag = quote_etag(hashlib.md5(self.content, usedforsecurity=False).hexdigest())
+        self.last_modified = int(os.stat(path).st_mtime)
+        self.immutable = immutable
+
+    @property
+    def cache_control(self):
+        if self.immutable:
+            return f'public, max-age={settings.STATIC_IMMUTABLE_MAX_AGE}, immutable'
+
+        return f'public, max-age={settings.STATIC_MAX_AGE}'
+
+
+class StaticIndex:
+    def __init__(self, root, hashed_names):
+        self.files = {}
+
+        if not root or not os.path.isdir(root):
+            return
+
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith('.gz') or filename == 'staticfiles.json':
+                    continue
+
+                path = os.path.join(directory, filename)
+                name = posixpath.join(*os.path.relpath(path, root).split(os.sep))
+                self.files[name] = StaticFile(path, name in hashed_names)
+
+    def get(self, name):
+        return self.files.get(name)
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_static_index():
+    global _index
+
+    if _index is None:
+        with _lock:
+            if _index is None:
+                hashed_names = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+                _index = StaticIndex(settings.STATIC_ROOT, hashed_names)
+
+    return _index
+
+
+@receiver(setting_changed)
+def clear_static_index(setting, **kwargs):
+    global _index
+
+    if setting in ('STATIC_ROOT', 'STATIC_URL', 'STORAGES'):
+        _index = None
+
+
+def serve_static_file(request, static_file):
+    response = get_conditional_response(
+        request, etag=static_file.etag, last_modified=static_file.last_modified
+    )
+
+    if response is None:
+        encoding = choose_encoding(request) if static_file.gzip_content else None
+
+        if encoding == 'gzip':
+            response = HttpResponse(static_file.gzip_content, content_type=static_file.content_type)
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(static_file.content, content_type=static_file.content_type)
+
+        response.headers['Last-Modified'] = http_date(static_file.last_modified)
+
+    response.headers['ETag'] = static_file.etag
+    response.headers['Cache-Control'] = static_file.cache_control
+
+    if static_file.gzip_content:
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+    return response
+
+
+class StaticFilesMiddleware:
+    # Serves STATIC_ROOT from memory: files are read once, on the first
+    # static request, and later hits never touch the filesystem.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        response = self.find_response(request)
+        return response if response is not None else self.get_response(request)
+
+    async def __acall__(self, request):
+        response = self.find_response(request)
+        return response if response is not None else await self.get_response(request)
+
+    def find_response(self, request):
+        if request.method not in ('GET', 'HEAD') or not settings.STATIC_URL:
+            return None
+
+        # STATIC_URL already carries the script prefix
+        if not request.path.startswith(settings.STATIC_URL):
+            return None
+
+        static_file = get_static_index().get(request.path[len(settings.STATIC_URL):])
+        return None if static_file is None else serve_static_file(request, static_file)
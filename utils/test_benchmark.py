@@ -0,0 +1,79 @@
+import asyncio
+from unittest import TestCase
+
+from utils.benchmark import (
+    call_asgi,
+    call_wsgi,
+    compare_to_baseline,
+    make_seed_rows,
+    percentile,
+    run_async_concurrently,
+    summarize,
+)
+
+
+class BenchmarkTest(TestCase):
+    def test_percentile_uses_nearest_rank(self):
+        values = list(range(1, 101))
+
+        self.assertEqual(percentile(values, 50), 50)
+        self.assertEqual(percentile(values, 95), 95)
+        self.assertEqual(percentile(values, 99), 99)
+        self.assertEqual(percentile([7], 99), 7)
+        self.assertIsNone(percentile([], 50))
+
+    def test_summarize_reports_milliseconds_and_throughput(self):
+        summary = summarize([0.010, 0.020, 0.030], errors=1, elapsed=2)
+
+        self.assertEqual(summary['requests'], 4)
+        self.assertEqual(summary['errors'], 1)
+        self.assertEqual(summary['rps'], 2)
+        self.assertEqual(summary['p50_ms'], 20)
+
+    def test_compare_to_baseline_returns_percent_change(self):
+        baseline = {'home': {'rps': 100, 'p95_ms': 10}}
+        results = {'home': {'rps': 150, 'p95_ms': 5}, 'new_route': {'rps': 1}}
+
+        self.assertEqual(
+            compare_to_baseline(results, baseline),
+            {'home': {'rps': 50.0, 'p95_ms': -50.0}},
+        )
+
+    def test_seed_rows_are_deterministic(self):
+        self.assertEqual(list(make_seed_rows(3)), list(make_seed_rows(3)))
+
+    def test_call_wsgi_returns_status_and_body(self):
+        def application(environ, start_response):
+            start_response('201 Created', [('Content-Type', 'text/plain')])
+            body = environ['wsgi.input'].read(int(environ['CONTENT_LENGTH']))
+            return [environ['REQUEST_METHOD'].encode(), environ['QUERY_STRING'].encode(), body]
+
+        self.assertEqual(
+            call_wsgi(application, 'POST', '/path/?a=1', b'body'),
+            (201, b'POSTa=1body'),
+        )
+
+    def test_call_asgi_returns_status_and_body(self):
+        async def application(scope, receive, send):
+            message = await receive()
+            await send({'type': 'http.response.start', 'status': 201, 'headers': []})
+            await send({
+                'type': 'http.response.body',
+                'body': scope['method'].encode() + scope['query_string'] + message['body'],
+            })
+
+        self.assertEqual(
+            asyncio.run(call_asgi(application, 'POST', '/path/?a=1', b'body')),
+            (201, b'POSTa=1body'),
+        )
+
+    def test_run_async_concurrently_counts_errors(self):
+        results = iter([True, False, True, True])
+
+        async def request_fn():
+            return next(results)
+
+        summary = asyncio.run(run_async_concurrently(request_fn, 4, 2))
+
+        self.assertEqual(summary['requests'], 4)
+        self.assertEqual(summary['errors'], 1)
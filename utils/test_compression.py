@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from django.test import RequestFactory
+
+from utils.compression import choose_encoding, parse_accept_encoding
+
+
+class AcceptEncodingTest(TestCase):
+    def choose(self, header):
+        return choose_encoding(RequestFactory().get('/', HTTP_ACCEPT_ENCODING=header))
+
+    def test_parses_weights(self):
+        self.assertEqual(
+            parse_accept_encoding('gzip;q=0.5, deflate, br;q=bad'),
+            {'gzip': 0.5, 'deflate': 1.0, 'br': 0.0},
+        )
+
+    def test_gzip_wins_ties(self):
+        self.assertEqual(self.choose('deflate, gzip'), 'gzip')
+
+    def test_weights_pick_the_encoding(self):
+        self.assertEqual(self.choose('gzip;q=0.2, deflate;q=0.8'), 'deflate')
+        self.assertEqual(self.choose('gzip;q=0, deflate'), 'deflate')
+
+    def test_wildcard_and_identity(self):
+        self.assertEqual(self.choose('*'), 'gzip')
+        self.assertEqual(self.choose('*;q=0.5, gzip;q=0'), 'deflate')
+        self.assertIsNone(self.choose('identity'))
+        self.assertIsNone(self.choose(''))
@@ -0,0 +1,128 @@
+import os
+import shutil
+import tempfile
+
+from django.test import SimpleTestCase, override_settings
+from django.utils.http import http_date
+
+from utils.media import RangeFile, parse_range
+
+CONTENT = bytes(range(256)) * 4
+
+
+class ParseRangeTest(SimpleTestCase):
+    def test_single_ranges(self):
+        self.assertEqual(parse_range('bytes=0-99', 1000), (0, 99))
+        self.assertEqual(parse_range('bytes=900-', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=-100', 1000), (900, 999))
+        self.assertEqual(parse_range('bytes=990-2000', 1000), (990, 999))
+
+    def test_ignored_ranges(self):
+        self.assertIsNone(parse_range('bytes=0-1,5-6', 1000))
+        self.assertIsNone(parse_range('items=0-1', 1000))
+        self.assertIsNone(parse_range('bytes=5-1', 1000))
+        self.assertIsNone(parse_range('bytes=a-b', 1000))
+
+    def test_unsatisfiable_ranges(self):
+        self.assertIs(parse_range('bytes=1000-', 1000), False)
+        self.assertIs(parse_range('bytes=-0', 1000), False)
+
+    def test_range_file_stops_at_the_end_of_the_range(self):
+        with tempfile.TemporaryFile() as file:
+            file.write(CONTENT)
+            range_file = RangeFile(file, 10, 5)
+
+            self.assertEqual(range_file.read(), CONTENT[10:15])
+            self.assertEqual(range_file.read(), b'')
+
+
+class ServeMediaTest(SimpleTestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        os.makedirs(os.path.join(self.media_root, 'recipes', 'covers'))
+
+        with open(os.path.join(self.media_root, 'recipes', 'covers', 'cover.jpg'), 'wb') as file:
+            file.write(CONTENT)
+
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.url = '/media/recipes/covers/cover.jpg'
+
+    def get(self, **headers):
+        response = self.client.get(self.url, **headers)
+        content = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, content
+
+    def test_serves_the_whole_file(self):
+        response, content = self.get()
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content, CONTENT)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(response['Content-Length'], str(len(CONTENT)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('max-age=', response['Cache-Control'])
+
+    def test_serves_a_byte_range(self):
+        response, content = self.get(HTTP_RANGE='bytes=100-199')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(content, CONTENT[100:200])
+        self.assertEqual(response['Content-Range'], f'bytes 100-199/{len(CONTENT)}')
+        self.assertEqual(response['Content-Length'], '100')
+
+    def test_unsatisfiable_range_returns_416(self):
+        response, _ = self.get(HTTP_RANGE='bytes=5000-')
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+    def test_stale_if_range_returns_the_whole_file(self):
+        response, content = self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content, CONTENT)
+
+    def test_matching_if_range_returns_the_range(self):
+        etag = self.get()[0]['ETag']
+        response, content = self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag)
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(content, CONTENT[:10])
+
+    def test_etag_and_last_modified_return_304(self):
+        response = self.get()[0]
+
+        self.assertEqual(self.get(HTTP_IF_NONE_MATCH=response['ETag'])[0].status_code, 304)
+        self.assertEqual(
+            self.get(HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])[0].status_code, 304
+        )
+
+    def test_if_range_accepts_the_last_modified_date(self):
+        mtime = int(os.stat(os.path.join(self.media_root, 'recipes', 'covers', 'cover.jpg')).st_mtime)
+        response, _ = self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=http_date(mtime))
+
+        self.assertEqual(response.status_code, 206)
+
+    @override_settings(MEDIA_SERVE_MODE='x-accel-redirect')
+    def test_x_accel_redirect_offloads_the_transfer(self):
+        response, content = self.get(HTTP_RANGE='bytes=0-9')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content, b'')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/recipes/covers/cover.jpg')
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+
+    @override_settings(MEDIA_SERVE_MODE='x-sendfile')
+    def test_x_sendfile_offloads_the_transfer(self):
+        response, _ = self.get()
+
+        self.assertTrue(response['X-Sendfile'].endswith(os.path.join('covers', 'cover.jpg')))
+
+    def test_missing_files_and_traversal_return_404(self):
+        self.assertEqual(self.client.get('/media/recipes/missing.jpg').status_code, 404)
+        self.assertEqual(self.client.get('/media/recipes/covers/').status_code, 404)
+        self.assertEqual(self.client.get('/media/../projeto/settings.py').status_code, 404)
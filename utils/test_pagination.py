@@ -1,5 +1,5 @@
 from unittest import TestCase
-from utils.pagination import make_pagination_range
+from utils.pagination import decode_cursor, encode_cursor, make_pagination_range
 
 class PaginationTest(TestCase):
     def test_make_pagination_range_returns_a_pagination_range(self):
@@ -85,3 +85,13 @@ class PaginationTest(TestCase):
         )['pagination']
 
         self.assertEqual([17,18,19,20], pagination)
+
+    def test_cursor_round_trips_position_and_direction(self):
+        token = encode_cursor(42, reverse=True)
+
+        self.assertEqual(decode_cursor(token), (42, True))
+        self.assertEqual(decode_cursor(encode_cursor(7)), (7, False))
+
+    def test_invalid_cursor_is_ignored(self):
+        self.assertEqual(decode_cursor('not-a-cursor'), (None, False))
+        self.assertEqual(decode_cursor(''), (None, False))
@@ -0,0 +1,31 @@
+from unittest import TestCase
+
+from utils.sparse_fields import parse_sparse_fields
+
+AVAILABLE = ['id', 'title', 'cover', 'tags']
+
+
+class SparseFieldsTest(TestCase):
+    def test_no_parameters_return_none(self):
+        self.assertIsNone(parse_sparse_fields({}, AVAILABLE))
+        self.assertIsNone(parse_sparse_fields({'fields': ' , '}, AVAILABLE))
+
+    def test_fields_keep_the_available_order(self):
+        self.assertEqual(
+            parse_sparse_fields({'fields': 'cover, id'}, AVAILABLE),
+            ['id', 'cover'],
+        )
+
+    def test_exclude_removes_fields(self):
+        self.assertEqual(
+            parse_sparse_fields({'exclude': 'tags'}, AVAILABLE),
+            ['id', 'title', 'cover'],
+        )
+        self.assertEqual(
+            parse_sparse_fields({'fields': 'id,tags', 'exclude': 'tags'}, AVAILABLE),
+            ['id'],
+        )
+
+    def test_unknown_fields_raise(self):
+        with self.assertRaisesRegex(ValueError, 'Unknown fields: nope'):
+            parse_sparse_fields({'fields': 'id,nope'}, AVAILABLE)
@@ -0,0 +1,43 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.db import connections
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+
+class SQLiteProductionTest(SimpleTestCase):
+    def make_connection(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+
+        wrapper = DatabaseWrapper(
+            {**connections['default'].settings_dict, 'NAME': os.path.join(directory, 'db.sqlite3')},
+            alias='sqlite_production_test',
+        )
+        self.addCleanup(wrapper.close)
+        wrapper.ensure_connection()
+        return wrapper
+
+    def get_pragma(self, wrapper, name):
+        return wrapper.connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+    @override_settings(SQLITE_PRODUCTION=True)
+    def test_production_profile_tunes_every_new_connection(self):
+        wrapper = self.make_connection()
+
+        self.assertEqual(self.get_pragma(wrapper, 'journal_mode'), 'wal')
+        self.assertEqual(self.get_pragma(wrapper, 'synchronous'), 1)
+        self.assertEqual(self.get_pragma(wrapper, 'temp_store'), 2)
+        self.assertEqual(self.get_pragma(wrapper, 'busy_timeout'), settings.SQLITE_PRAGMAS['busy_timeout'])
+        self.assertEqual(self.get_pragma(wrapper, 'cache_size'), settings.SQLITE_PRAGMAS['cache_size'])
+        self.assertEqual(self.get_pragma(wrapper, 'mmap_size'), settings.SQLITE_PRAGMAS['mmap_size'])
+
+    @override_settings(SQLITE_PRODUCTION=False)
+    def test_default_profile_keeps_sqlite_defaults(self):
+        wrapper = self.make_connection()
+
+        self.assertEqual(self.get_pragma(wrapper, 'journal_mode'), 'delete')
+        self.assertEqual(self.get_pragma(wrapper, 'synchronous'), 2)
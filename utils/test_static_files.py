@@ -0,0 +1,81 @@
+import gzip
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.templatetags.static import static
+from django.test import SimpleTestCase, override_settings
+
+from utils.static_files import get_static_index
+
+
+class StaticFilesTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.static_root = tempfile.mkdtemp()
+        cls.settings_override = override_settings(STATIC_ROOT=cls.static_root)
+        cls.settings_override.enable()
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.static_root, ignore_errors=True)
+        super().tearDownClass()
+
+    def get_url(self):
+        return static('global/css/styles.css')
+
+    def test_collectstatic_writes_hashed_and_gzipped_copies(self):
+        hashed_name = staticfiles_storage.stored_name('global/css/styles.css')
+        path = Path(self.static_root, hashed_name)
+
+        self.assertNotEqual(hashed_name, 'global/css/styles.css')
+        self.assertEqual(gzip.decompress(Path(f'{path}.gz').read_bytes()), path.read_bytes())
+
+    def test_hashed_names_are_immutable(self):
+        response = self.client.get(self.get_url())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_unhashed_names_get_a_short_max_age(self):
+        response = self.client.get('/static/global/css/styles.css')
+
+        self.assertEqual(response['Cache-Control'], 'public, max-age=60')
+
+    def test_gzip_clients_get_the_precompressed_body(self):
+        plain = self.client.get(self.get_url())
+        response = self.client.get(self.get_url(), HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_matching_etag_returns_304(self):
+        etag = self.client.get(self.get_url())['ETag']
+        response = self.client.get(self.get_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_files_are_read_once(self):
+        self.client.get(self.get_url())
+        index = get_static_index()
+        shutil.rmtree(Path(self.static_root, 'global'))
+        self.addCleanup(call_command, 'collectstatic', interactive=False, verbosity=0)
+
+        response = self.client.get(self.get_url())
+
+        self.assertIs(get_static_index(), index)
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_files_fall_through(self):
+        response = self.client.get('/static/global/css/missing.css')
+
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,48 @@
+from django.http import HttpRequest
+from django.test import SimpleTestCase, override_settings
+from django.urls import NoReverseMatch, reverse, set_script_prefix
+
+from utils import url_builders
+from utils.url_builders import FAST_URL_ROUTES, URLBuilder, build_url
+
+
+class URLBuildersTest(SimpleTestCase):
+    def tearDown(self):
+        set_script_prefix('/')
+
+    def test_builders_match_reverse(self):
+        values = {'recipes:tag': 'some-tag-x1Y2z'}
+
+        for viewname in FAST_URL_ROUTES:
+            value = values.get(viewname, 42)
+
+            with self.subTest(viewname=viewname):
+                self.assertEqual(build_url(viewname, value), reverse(viewname, args=(value,)))
+
+    def test_builders_follow_the_script_prefix(self):
+        set_script_prefix('/mounted/')
+
+        self.assertEqual(build_url('recipes:recipe', 7), '/mounted/recipes/7/')
+
+    def test_builders_are_looked_up_once_per_request(self):
+        request = HttpRequest()
+
+        self.assertEqual(build_url('recipes:recipe', 7, request), '/recipes/7/')
+        self.assertEqual(build_url('recipes:recipe', 8, request), '/recipes/8/')
+        self.assertEqual(list(request._url_builders), ['recipes:recipe'])
+
+    def test_other_routes_fall_back_to_reverse(self):
+        self.assertEqual(
+            build_url('authors:dashboard_recipe_edit', 3),
+            reverse('authors:dashboard_recipe_edit', args=(3,)),
+        )
+
+    def test_routes_without_one_argument_are_rejected(self):
+        with self.assertRaises(NoReverseMatch):
+            URLBuilder('recipes:home')
+
+    def test_builders_are_cleared_when_the_urlconf_changes(self):
+        build_url('recipes:recipe', 7)
+
+        with override_settings(ROOT_URLCONF='projeto.urls'):
+            self.assertEqual(url_builders._builders, {})
@@ -0,0 +1,76 @@
+import threading
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import get_script_prefix, get_urlconf, reverse
+
+# Digits match both the int and the slug converters
+URL_MARKER = '9081726354'
+
+FAST_URL_ROUTES = (
+    'recipes:recipe',
+    'recipes:category',
+    'recipes:tag',
+    'recipes:recipe_api_v2_tag',
+    'authors:profile',
+)
+
+_builders = {}
+_lock = threading.Lock()
+
+
+class URLBuilder:
+    # reverse() walks the resolver and quotes every argument on each call;
+    # for a route with a single int or slug argument the result is always
+    # prefix + value + suffix, so that split is computed once.
+    def __init__(self, viewname):
+        url = reverse(viewname, args=(URL_MARKER,))
+
+        if url.count(URL_MARKER) != 1:
+            raise ValueError(f'{viewname} cannot be built from a single argument.')
+
+        self.viewname = viewname
+        self.prefix, self.suffix = url.split(URL_MARKER)
+
+    def __call__(self, value):
+        return f'{self.prefix}{value}{self.suffix}'
+
+
+def get_url_builder(viewname):
+    # The script prefix and urlconf can change per request
+    key = (viewname, get_script_prefix(), get_urlconf())
+    builder = _builders.get(key)
+
+    if builder is None:
+        with _lock:
+            builder = _builders.setdefault(key, URLBuilder(viewname))
+
+    return builder
+
+
+def build_url(viewname, value, request=None):
+    if viewname not in FAST_URL_ROUTES:
+        return reverse(viewname, args=(value,))
+
+    if request is None:
+        return get_url_builder(viewname)(value)
+
+    # The prefix and urlconf live in asgiref Locals that cost more to read
+    # than the URL costs to build; neither changes during a request.
+    builders = request.__dict__.setdefault('_url_builders', {})
+    builder = builders.get(viewname)
+
+    if builder is None:
+        builder = builders[viewname] = get_url_builder(viewname)
+
+    return builder(value)
+
+
+def get_absolute_base(request):
+    return f'{request.scheme}://{request.get_host()}'
+
+
+@receiver(setting_changed)
+def clear_url_builders(setting, **kwargs):
+    if setting == 'ROOT_URLCONF':
+        _builders.clear()